@@ -16,6 +16,7 @@ from quasarr.api.statistics import setup_statistics
 from quasarr.providers import shared_state
 from quasarr.providers.html_templates import render_button, render_centered_html
 from quasarr.providers.web_server import Server
+from quasarr.search.prewarm import search_prewarmer
 from quasarr.storage.config import Config
 
 from quasarr.downloads.packages.package_snapshot import PackageSnapshotter
@@ -33,6 +34,7 @@ def get_api(shared_state_dict, shared_state_lock):
         on_status_change=snapshotter.update_ytdlp_job,
     ).start()
     app.config['ytdlp_worker'] = ytdlp_worker
+    search_prewarmer.start(shared_state)
     setup_arr_routes(app)
     setup_am_monitor(app, shared_state)
     setup_captcha_routes(app)
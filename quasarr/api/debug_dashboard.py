@@ -7,6 +7,16 @@ import json
 import quasarr.providers.html_images as images
 from quasarr.providers.html_templates import render_centered_html
 from quasarr.providers.log import get_log_entries, get_log_stats, set_debug_mode, is_debug_mode
+from quasarr.providers import host_redirects, http_client, metadata_cache, shared_state, title_normalization
+from quasarr.providers.http_cache import http_cache
+from quasarr.search import detail_store, negative_cache
+from quasarr.search.cache import result_cache
+from quasarr.search.health import source_health
+from quasarr.search.parse_pool import parse_pool
+from quasarr.search.politeness import politeness
+from quasarr.search.prewarm import search_prewarmer
+from quasarr.search.scheduler import search_scheduler
+from quasarr.search.singleflight import search_flight
 
 
 def setup_debug_routes(app):
@@ -40,6 +50,98 @@ def setup_debug_routes(app):
         response.content_type = 'application/json'
         return json.dumps(get_log_stats())
 
+    @app.get('/debug/api/search-cache')
+    def api_search_cache():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(result_cache.stats())
+
+    @app.get('/debug/api/search-flight')
+    def api_search_flight():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(search_flight.stats())
+
+    @app.get('/debug/api/search-scheduler')
+    def api_search_scheduler():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(search_scheduler.stats())
+
+    @app.get('/debug/api/search-prewarm')
+    def api_search_prewarm():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(search_prewarmer.stats())
+
+    @app.get('/debug/api/http-client')
+    def api_http_client():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(http_client.stats())
+
+    @app.get('/debug/api/http-cache')
+    def api_http_cache():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(http_cache.stats())
+
+    @app.get('/debug/api/parse-pool')
+    def api_parse_pool():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(parse_pool.stats())
+
+    @app.get('/debug/api/politeness')
+    def api_politeness():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(politeness.stats())
+
+    @app.get('/debug/api/source-health')
+    def api_source_health():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(source_health.stats())
+
+    @app.get('/debug/api/negative-cache')
+    def api_negative_cache():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(negative_cache.stats(shared_state))
+
+    @app.post('/debug/api/negative-cache/purge')
+    def api_negative_cache_purge():
+        from bottle import request, response
+        response.content_type = 'application/json'
+        body = request.json or {}
+        removed = negative_cache.purge(shared_state, source=body.get("source"), imdb_id=body.get("imdb_id"))
+        return json.dumps({"removed": removed})
+
+    @app.get('/debug/api/detail-store')
+    def api_detail_store():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(detail_store.stats())
+
+    @app.get('/debug/api/host-redirects')
+    def api_host_redirects():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(host_redirects.stats())
+
+    @app.get('/debug/api/tmdb-cache')
+    def api_tmdb_cache():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(metadata_cache.stats())
+
+    @app.get('/debug/api/title-normalization')
+    def api_title_normalization():
+        from bottle import response
+        response.content_type = 'application/json'
+        return json.dumps(title_normalization.stats())
+
     @app.get('/debug/api/debug-mode')
     def api_debug_mode_get():
         from bottle import response
@@ -17,11 +17,11 @@ import threading
 import time
 from urllib.parse import urljoin, urlparse, urlunparse
 
+from quasarr.providers import host_redirects, http_client
 from quasarr.providers.log import debug, log_event
 from quasarr.providers.players import is_player_enabled
 from quasarr.search.sources.am import (
     AM_BLOCKED_HOSTS,
-    _am_request,
     _candidates_for_index,
     _host_tag,
     _parse_episodes_js,
@@ -36,6 +36,14 @@ _REWRITE_CACHE_LOCK = threading.Lock()
 _REWRITE_CACHE_TTL = 15 * 60
 
 
+def _am_get(url, **kwargs):
+    # Un grab fait deux ou trois requêtes pendant que Sonarr attend : il ne
+    # passe ni par la file de politesse des recherches (``_am_request``), ni
+    # par le cache HTTP — les liens d'embed changent souvent, ``episodes.js``
+    # est relu à chaque fois. Seule la migration de domaine est suivie.
+    return http_client.get(host_redirects.resolve(hostname, url), **kwargs)
+
+
 def _parse_iframe_rewrite_rules(script):
     """Extrait les ``url.replace(/…/, '…')`` utilisés par le setter d'iframe."""
     iframe_marker = script.find("HTMLIFrameElement.prototype")
@@ -94,7 +102,7 @@ def _site_iframe_rewrite_rules(shared_state, source_url, headers):
 
     page_url = urlunparse(parsed._replace(fragment=""))
     try:
-        page_response = _am_request("GET", page_url, headers=headers, timeout=15)
+        page_response = _am_get(page_url, headers=headers, timeout=15)
         page_response.raise_for_status()
         # Le script qui déclare les réécritures d'iframe (ex. vidmoly.to ->
         # vidmoly.biz) s'est appelé successivement "script_videos" puis
@@ -108,7 +116,7 @@ def _site_iframe_rewrite_rules(shared_state, source_url, headers):
         if not script_match:
             return []
         script_url = urljoin(page_response.url, html.unescape(script_match.group(2)))
-        script_response = _am_request("GET", script_url, headers=headers, timeout=15)
+        script_response = _am_get(script_url, headers=headers, timeout=15)
         script_response.raise_for_status()
         rules = _parse_iframe_rewrite_rules(script_response.text)
     except Exception as exc:
@@ -195,7 +203,7 @@ def get_am_download_links(shared_state, url, mirror, title):
     episodes_url = f"https://{am}/catalogue/{slug}/{season_path}/episodes.js"
     headers = {"User-Agent": _user_agent(shared_state)}
     try:
-        response = _am_request("GET", episodes_url, headers=headers, timeout=15)
+        response = _am_get(episodes_url, headers=headers, timeout=15)
         response.raise_for_status()
     except Exception as exc:
         log_event("download_error", source="am-dl", level="ERROR",
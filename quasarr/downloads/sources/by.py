@@ -6,9 +6,9 @@ import concurrent.futures
 import re
 from urllib.parse import urlparse
 
-import requests
 from bs4 import BeautifulSoup
 
+from quasarr.providers import http_client
 from quasarr.providers.log import info, debug
 
 
@@ -22,7 +22,7 @@ def get_by_download_links(shared_state, url, mirror, title): # signature must al
     links = []
 
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = http_client.get(url, headers=headers, timeout=10)
         page_content = resp.text
         soup = BeautifulSoup(page_content, "html.parser")
         frames = [iframe.get("src") for iframe in soup.find_all("iframe") if iframe.get("src")]
@@ -36,7 +36,7 @@ def get_by_download_links(shared_state, url, mirror, title): # signature must al
 
         def fetch(url):
             try:
-                r = requests.get(url, headers=headers, timeout=10)
+                r = http_client.get(url, headers=headers, timeout=10)
                 return r.text, url
             except Exception:
                 return None, url
@@ -68,7 +68,7 @@ def get_by_download_links(shared_state, url, mirror, title): # signature must al
         def resolve_redirect(href_hostname):
             href, hostname = href_hostname
             try:
-                r = requests.get(href, headers=headers, timeout=10, allow_redirects=True)
+                r = http_client.get(href, headers=headers, timeout=10, allow_redirects=True)
                 return r.url
             except Exception as e:
                 debug(f"Error resolving link for {hostname}: {e}")
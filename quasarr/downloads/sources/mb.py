@@ -4,9 +4,9 @@
 
 import re
 
-import requests
 from bs4 import BeautifulSoup
 
+from quasarr.providers import http_client
 from quasarr.providers.log import info, debug
 
 
@@ -16,7 +16,7 @@ def get_mb_download_links(shared_state, url, mirror, title): # signature must al
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
         response.raise_for_status()
     except Exception as e:
         info(f"Failed to fetch page for {title or url}: {e}")
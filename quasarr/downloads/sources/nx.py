@@ -4,9 +4,9 @@
 
 import re
 
-import requests
 from bs4 import BeautifulSoup
 
+from quasarr.providers import http_client
 from quasarr.providers.log import info
 from quasarr.providers.sessions.nx import retrieve_and_validate_session
 
@@ -17,7 +17,7 @@ def get_filer_folder_links(shared_state, url):
             'User-Agent': shared_state.values["user_agent"],
             'Referer': url
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
         links = []
         if response:
             soup = BeautifulSoup(response.content, 'html.parser')
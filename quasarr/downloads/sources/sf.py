@@ -5,9 +5,9 @@
 import re
 from datetime import datetime
 
-import requests
 from bs4 import BeautifulSoup
 
+from quasarr.providers import http_client
 from quasarr.providers.log import info, debug
 from quasarr.search.sources.sf import parse_mirrors
 
@@ -56,7 +56,7 @@ def get_sf_download_links(shared_state, url, mirror, title): # signature must al
             'User-Agent': shared_state.values["user_agent"],
         }
 
-        series_page = requests.get(url, headers=headers, timeout=10).text
+        series_page = http_client.get(url, headers=headers, timeout=10).text
 
         soup = BeautifulSoup(series_page, "html.parser")
         # extract IMDb id if present
@@ -72,13 +72,13 @@ def get_sf_download_links(shared_state, url, mirror, title): # signature must al
         epoch = str(datetime.now().timestamp()).replace('.', '')[:-3]
         api_url = 'https://' + sf + '/api/v1/' + season_id + f'/season/{season}?lang=ALL&_=' + epoch
 
-        response = requests.get(api_url, headers=headers, timeout=10)
+        response = http_client.get(api_url, headers=headers, timeout=10)
         try:
             data = response.json()["html"]
         except ValueError:
             epoch = str(datetime.now().timestamp()).replace('.', '')[:-3]
             api_url = 'https://' + sf + '/api/v1/' + season_id + f'/season/ALL?lang=ALL&_=' + epoch
-            response = requests.get(api_url, headers=headers, timeout=10)
+            response = http_client.get(api_url, headers=headers, timeout=10)
             data = response.json()["html"]
 
         content = BeautifulSoup(data, "html.parser")
@@ -143,7 +143,7 @@ def get_sf_download_links(shared_state, url, mirror, title): # signature must al
 
 def resolve_sf_redirect(url, user_agent):
     try:
-        response = requests.get(url, allow_redirects=True, timeout=10,
+        response = http_client.get(url, allow_redirects=True, timeout=10,
                                 headers={'User-Agent': user_agent})
         if response.history:
             for resp in response.history:
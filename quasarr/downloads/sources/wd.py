@@ -5,9 +5,9 @@
 import re
 from urllib.parse import urljoin
 
-import requests
 from bs4 import BeautifulSoup
 
+from quasarr.providers import http_client
 from quasarr.providers.log import info, debug
 
 
@@ -16,7 +16,7 @@ def resolve_wd_redirect(url, user_agent):
     Follow redirects for a WD mirror URL and return the final destination.
     """
     try:
-        response = requests.get(
+        response = http_client.get(
             url,
             allow_redirects=True,
             timeout=10,
@@ -39,7 +39,7 @@ def get_wd_download_links(shared_state, url, mirror, title):  # signature must a
     headers = {"User-Agent": user_agent}
 
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = http_client.get(url, headers=headers, timeout=10)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, "html.parser")
 
@@ -150,13 +150,8 @@ def get_missing_movies():
     return missing
 
 
-def get_missing_series():
-    """Séries dont Sonarr attend des épisodes, hors blocklist.
-
-    Regroupé par série : une ligne par série avec le nombre d'épisodes
-    manquants, plutôt qu'une ligne par épisode (illisible au-delà de quelques
-    séries, et la recherche sur le site se fait de toute façon par titre).
-    """
+def _wanted_episodes():
+    """Épisodes manquants monitorés de Sonarr, hors blocklist."""
     payload = _get('Sonarr', 'wanted/missing', {
         'page': 1,
         'pageSize': PAGE_SIZE,
@@ -165,13 +160,18 @@ def get_missing_series():
     })
     records = payload.get('records', [])
     blocked = _blocklisted_ids('Sonarr', 'seriesId')
+    return [episode for episode in records if ('episode', episode.get('id')) not in blocked]
 
-    by_series = {}
-    for episode in records:
-        episode_id = episode.get('id')
-        if ('episode', episode_id) in blocked:
-            continue
 
+def get_missing_series():
+    """Séries dont Sonarr attend des épisodes, hors blocklist.
+
+    Regroupé par série : une ligne par série avec le nombre d'épisodes
+    manquants, plutôt qu'une ligne par épisode (illisible au-delà de quelques
+    séries, et la recherche sur le site se fait de toute façon par titre).
+    """
+    by_series = {}
+    for episode in _wanted_episodes():
         series = episode.get('series') or {}
         series_id = series.get('id') or episode.get('seriesId')
         if series_id is None:
@@ -193,6 +193,24 @@ def get_missing_series():
     return missing
 
 
+def get_missing_episodes():
+    """Épisodes voulus par Sonarr, un par ligne (pour le préchauffage des recherches)."""
+    missing = []
+    for episode in _wanted_episodes():
+        series = episode.get('series') or {}
+        season = episode.get('seasonNumber')
+        number = episode.get('episodeNumber')
+        if season is None or number is None:
+            continue
+        missing.append({
+            'arr_title': series.get('title') or '',
+            'imdb_id': series.get('imdbId') or '',
+            'season': season,
+            'episode': number,
+        })
+    return missing
+
+
 def enrich_with_search_titles(shared_state, items):
     """Ajoute le titre que Quasarr cherche réellement (TMDB localisé en FR).
 
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Migrations de domaine des sources, retenues et appliquées avant la requête.
+
+zt et anime-sama changent souvent de domaine. ``_update_hostname`` ne
+l'apprenait qu'après coup, sur l'URL finale d'une redirection : toute requête
+partie de l'ancien domaine (pages listing ou de détail préchargées en parallèle
+avant le retour de la première redirection, liens de détail mémorisés, hôte
+resté dans la configuration) payait un aller-retour de plus.
+
+Ce module tient, par source, une table ``ancien hôte -> nouvel hôte`` :
+
+* ``learn()`` l'enrichit à la première redirection observée, sous verrou ; il
+  ne renvoie vrai qu'une fois par migration, les redirections concurrentes
+  vers le même domaine ne refont ni le log ni la sauvegarde ;
+* ``resolve()`` / ``resolve_host()`` réécrivent une URL ou un hôte *avant*
+  l'envoi ; les chaînes (a -> b -> c) sont aplaties, un retour à un ancien
+  domaine efface l'entrée qui y menait ;
+* la table est persistée dans la table SQLite ``host_redirects`` (une ligne
+  JSON par source) et rechargée au redémarrage ; sans DB (tests, outils) elle
+  vit en mémoire seule.
+"""
+
+import json
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+from quasarr.providers import shared_state
+from quasarr.providers.log import debug
+
+TABLE = "host_redirects"
+
+_MAPS = None  # source -> {ancien hôte: nouvel hôte}
+_LOCK = threading.Lock()
+_STATS = {"rewritten": 0, "learned": 0}
+
+
+def _db():
+    if not shared_state.values.get("dbfile"):
+        return None
+    try:
+        return shared_state.get_db(TABLE)
+    except Exception:
+        return None
+
+
+def _maps():
+    """Tables de toutes les sources, chargées depuis la DB au premier accès."""
+    global _MAPS
+    if _MAPS is None:
+        _MAPS = {}
+        database = _db()
+        if database is not None:
+            try:
+                for source, raw in database.retrieve_all_titles() or []:
+                    mapping = json.loads(raw)
+                    if isinstance(mapping, dict):
+                        _MAPS[source] = {str(old).lower(): str(new).lower()
+                                         for old, new in mapping.items()}
+            except Exception as e:
+                debug(f"Could not load host redirects: {e}")
+    return _MAPS
+
+
+def resolve_host(source, host):
+    """Hôte à utiliser pour ``host`` (lui-même s'il n'a pas migré)."""
+    if not host:
+        return host
+    with _LOCK:
+        return _maps().get(source, {}).get(host.lower(), host)
+
+
+def resolve(source, url):
+    """``url`` réécrite vers le domaine actuel de la source."""
+    try:
+        parts = urlsplit(url)
+    except (TypeError, ValueError):
+        return url
+    host = resolve_host(source, parts.netloc)
+    if host == parts.netloc:
+        return url
+    with _LOCK:
+        _STATS["rewritten"] += 1
+    return urlunsplit(parts._replace(netloc=host))
+
+
+def learn(source, old_host, new_host):
+    """Enregistre la migration ``old_host -> new_host``.
+
+    Renvoie vrai si elle était inconnue : l'appelant journalise et met à jour
+    la configuration une seule fois, même si plusieurs requêtes concurrentes
+    ont suivi la même redirection.
+    """
+    old_host = (old_host or "").lower()
+    new_host = (new_host or "").lower()
+    if not old_host or not new_host or old_host == new_host:
+        return False
+    with _LOCK:
+        mapping = _maps().setdefault(source, {})
+        if mapping.get(old_host) == new_host:
+            return False
+        # Retour sur un ancien domaine : l'entrée qui y menait ferait boucler.
+        mapping.pop(new_host, None)
+        for old, new in list(mapping.items()):
+            if new == old_host:
+                mapping[old] = new_host
+        mapping[old_host] = new_host
+        _STATS["learned"] += 1
+        snapshot = json.dumps(mapping)
+        # Écriture sous verrou : deux migrations successives ne peuvent pas
+        # se doubler et laisser la plus ancienne en base.
+        database = _db()
+        if database is not None:
+            try:
+                database.update_store(source, snapshot)
+            except Exception as e:
+                debug(f"Could not persist host redirect {old_host} -> {new_host}: {e}")
+    return True
+
+
+def invalidate_cache():
+    """Oublie les tables en mémoire (la DB est relue au prochain accès)."""
+    global _MAPS
+    with _LOCK:
+        _MAPS = None
+        for name in _STATS:
+            _STATS[name] = 0
+
+
+def stats():
+    with _LOCK:
+        return dict(_STATS, redirects={source: dict(mapping)
+                                       for source, mapping in _maps().items()})
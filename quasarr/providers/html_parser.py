@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Analyse HTML des sources, sur le moteur le plus rapide disponible.
+
+Toutes les sources analysaient leurs pages avec ``BeautifulSoup(...,
+"html.parser")``, le moteur pur Python de la bibliothèque standard, de loin le
+plus lent. ``parse()`` choisit au premier appel le premier moteur installé de
+``PREFERRED_BACKENDS`` : lxml (extension C, ``pip install lxml``) s'il est
+présent, sinon ``html.parser``. L'API BeautifulSoup renvoyée reste la même.
+
+``tests/bench_html_parser.py`` mesure le temps d'analyse par page des
+fixtures zt pour chaque moteur disponible et vérifie que l'extraction zt donne
+le même résultat qu'avec ``html.parser``.
+"""
+
+import threading
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from quasarr.providers.log import debug
+
+FALLBACK_BACKEND = "html.parser"
+PREFERRED_BACKENDS = ("lxml", FALLBACK_BACKEND)
+
+_backend = None
+_lock = threading.Lock()
+
+
+def is_available(backend):
+    try:
+        BeautifulSoup("", backend)
+    except FeatureNotFound:
+        return False
+    return True
+
+
+def available_backends():
+    return [backend for backend in PREFERRED_BACKENDS if is_available(backend)]
+
+
+def backend():
+    """Moteur utilisé par ``parse()`` (détecté une fois par processus)."""
+    global _backend
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _backend = next(
+                    (name for name in PREFERRED_BACKENDS if is_available(name)),
+                    FALLBACK_BACKEND,
+                )
+                debug(f"HTML parser backend: {_backend}")
+    return _backend
+
+
+def set_backend(name):
+    """Impose un moteur (``None`` : nouvelle détection au prochain appel)."""
+    global _backend
+    if name is not None and not is_available(name):
+        raise FeatureNotFound(f"HTML parser backend '{name}' is not installed")
+    with _lock:
+        _backend = name
+
+
+def parse(markup, backend_name=None):
+    """``BeautifulSoup(markup)`` sur le moteur choisi."""
+    return BeautifulSoup(markup, backend_name or backend())
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Cache HTTP sur disque, avec revalidation conditionnelle.
+
+Une page de détail ZT ne change presque plus une fois publiée ; elle était
+pourtant re-téléchargée et ré-analysée à chaque recherche et à chaque
+interrogation du flux RSS, soit ~50 pages complètes par flux. Les réponses
+sont donc gardées sous ``<dossier de config>/http_cache`` :
+
+* tant qu'une entrée a moins de ``max-age`` (règle par motif d'URL,
+  ``MAX_AGE_RULES``), elle est servie sans réseau ;
+* au-delà, elle est revalidée avec ``If-None-Match`` / ``If-Modified-Since`` :
+  un 304 coûte quelques octets au lieu de la page entière ;
+* une réponse sans ETag ni Last-Modified n'est gardée que si sa règle lui
+  donne une durée de vie ;
+* la taille totale est bornée (``MAX_CACHE_BYTES``), les entrées les moins
+  récemment utilisées partent en premier.
+
+Sans dossier de config (tests, outils) le cache est inactif : tout passe au
+réseau.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from quasarr.providers import shared_state
+from quasarr.providers.log import debug
+
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+# (motif d'URL, durée de vie en secondes) ; la première règle qui correspond
+# s'applique. 0 = toujours revalider.
+MAX_AGE_RULES = [
+    # ZT : page de série ou de manga (?p=series&id=...). Elle s'enrichit à
+    # chaque épisode : ``detail_store`` la relit après SERIES_TTL_SECONDS, la
+    # copie disque doit alors être revalidée, pas resservie.
+    (re.compile(r"[?&]p=(?:series?|mangas?)&id=\d+"), 0),
+    # ZT : page de détail (?p=film&id=12345-titre)
+    (re.compile(r"[?&]p=[^&]+&id=\d+"), 6 * 60 * 60),
+    # anime-sama : liste des lecteurs d'un dossier, page catalogue
+    (re.compile(r"/episodes\.js"), 30 * 60),
+    (re.compile(r"/catalogue/[^?]+/$"), 60 * 60),
+]
+DEFAULT_MAX_AGE_SECONDS = 0
+
+# En-têtes de réponse conservés avec le corps.
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def max_age_for(url):
+    for pattern, seconds in MAX_AGE_RULES:
+        if pattern.search(url):
+            return seconds
+    return DEFAULT_MAX_AGE_SECONDS
+
+
+def _default_directory():
+    dbfile = shared_state.values.get("dbfile")
+    if not dbfile:
+        return None
+    return os.path.join(os.path.dirname(dbfile), "http_cache")
+
+
+def _response_from(meta, body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.url = meta["final_url"]
+    response.headers = CaseInsensitiveDict(meta.get("headers") or {})
+    response.encoding = meta.get("encoding")
+    response.from_cache = True
+    return response
+
+
+class HttpCache:
+    """Réponses GET par URL, sur disque, avec index LRU en mémoire."""
+
+    def __init__(self, directory=None, max_bytes=MAX_CACHE_BYTES):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._index = None  # clé -> taille, du moins au plus récemment utilisé
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+    # -- API -----------------------------------------------------------------
+
+    def get(self, url, fetch, **kwargs):
+        """GET de ``url`` via ``fetch(url, **kwargs)``, à travers le cache."""
+        directory = self._ensure_directory()
+        if directory is None:
+            return fetch(url, **kwargs)
+
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        max_age = max_age_for(url)
+        entry = self._load(key)
+        if entry is not None:
+            meta, body = entry
+            if time.time() - meta["stored_at"] < max_age:
+                self._count("hits")
+                return _response_from(meta, body)
+
+        request_headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            validators = entry[0].get("headers") or {}
+            if validators.get("ETag"):
+                request_headers["If-None-Match"] = validators["ETag"]
+            if validators.get("Last-Modified"):
+                request_headers["If-Modified-Since"] = validators["Last-Modified"]
+
+        response = fetch(url, headers=request_headers, **kwargs)
+        status = getattr(response, "status_code", None)
+        if status == 304 and entry is not None:
+            meta, body = entry
+            meta["stored_at"] = time.time()
+            self._write(key, meta, body)
+            self._count("revalidated")
+            return _response_from(meta, body)
+
+        self._count("misses")
+        if status == 200:
+            self._store(key, url, response, max_age)
+        return response
+
+    def clear(self):
+        directory = self._ensure_directory()
+        with self._lock:
+            if directory is not None:
+                for name in os.listdir(directory):
+                    try:
+                        os.remove(os.path.join(directory, name))
+                    except OSError:
+                        pass
+            self._index = OrderedDict()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._index or ())
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["revalidated"] + stats["misses"]
+        stats["hit_rate"] = (
+            round((stats["hits"] + stats["revalidated"]) / lookups * 100, 1) if lookups else 0
+        )
+        stats["enabled"] = self._directory is not None
+        return stats
+
+    # -- interne -------------------------------------------------------------
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _ensure_directory(self):
+        if self._directory is None:
+            self._directory = _default_directory()
+            if self._directory is None:
+                return None
+        with self._lock:
+            if self._index is None:
+                try:
+                    os.makedirs(self._directory, exist_ok=True)
+                    self._index = self._scan()
+                except OSError as e:
+                    debug(f"HTTP cache disabled: {e}")
+                    self._directory = None
+                    return None
+        return self._directory
+
+    def _scan(self):
+        """Reconstruit l'index depuis le disque, du plus ancien au plus récent accès."""
+        entries = []
+        for name in os.listdir(self._directory):
+            if not name.endswith(".body"):
+                continue
+            path = os.path.join(self._directory, name)
+            try:
+                entries.append((os.path.getmtime(path), name[:-5], os.path.getsize(path)))
+            except OSError:
+                continue
+        index = OrderedDict()
+        self._bytes = 0
+        for _mtime, key, size in sorted(entries):
+            index[key] = size
+            self._bytes += size
+        return index
+
+    def _paths(self, key):
+        base = os.path.join(self._directory, key)
+        return f"{base}.json", f"{base}.body"
+
+    def _load(self, key):
+        meta_path, body_path = self._paths(key)
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+            os.utime(body_path)
+        except (OSError, ValueError):
+            self._forget(key)
+            return None
+        return meta, body
+
+    def _store(self, key, url, response, max_age):
+        headers = {name: response.headers.get(name) for name in _KEPT_HEADERS
+                   if response.headers.get(name)}
+        cache_control = (response.headers.get("Cache-Control") or "").lower()
+        if "no-store" in cache_control or getattr(response, "truncated", False):
+            return  # page lue en partie (http_client.get_until) : pas un corps complet
+        if not max_age and not (headers.get("ETag") or headers.get("Last-Modified")):
+            return  # ni durée de vie ni moyen de revalider : inutile
+        meta = {
+            "url": url,
+            "final_url": response.url,
+            "headers": headers,
+            "encoding": response.encoding,
+            "stored_at": time.time(),
+        }
+        self._write(key, meta, response.content)
+        self._count("stored")
+
+    def _write(self, key, meta, body):
+        meta_path, body_path = self._paths(key)
+        try:
+            for path, data, mode in ((body_path, body, "wb"),
+                                     (meta_path, json.dumps(meta).encode("utf-8"), "wb")):
+                tmp = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp, mode) as f:
+                    f.write(data)
+                os.replace(tmp, path)
+        except OSError as e:
+            debug(f"HTTP cache could not store {meta.get('url')}: {e}")
+            return
+        with self._lock:
+            self._bytes += len(body) - self._index.pop(key, 0)
+            self._index[key] = len(body)
+            evicted = []
+            while self._bytes > self._max_bytes and len(self._index) > 1:
+                old_key, size = self._index.popitem(last=False)
+                self._bytes -= size
+                evicted.append(old_key)
+            self._stats["evicted"] += len(evicted)
+        for old_key in evicted:
+            self._remove_files(old_key)
+
+    def _forget(self, key):
+        with self._lock:
+            self._bytes -= self._index.pop(key, 0)
+        self._remove_files(key)
+
+    def _remove_files(self, key):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+http_cache = HttpCache()
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Client HTTP partagé par les sources de recherche et de téléchargement.
+
+Chaque source appelait ``requests.get(...)`` nu : une session jetable par
+appel, donc une poignée de main TCP + TLS complète par page, sans keep-alive.
+Sur zt, où une recherche charge des dizaines de pages de détail, c'était une
+bonne part de la latence de chaque page.
+
+Ce module garde une ``requests.Session`` par hôte, avec son pool de connexions
+(``POOL_MAXSIZE``) :
+
+* les connexions sont réutilisées d'une requête à l'autre ;
+* les sessions n'acceptent aucun cookie : un appel reste sans état, comme
+  ``requests.get``. Les sources qui ont besoin d'une session authentifiée
+  (al, dd, nx, captcha…) gardent la leur ;
+* un timeout par défaut (``DEFAULT_TIMEOUT``) s'applique à tout appel qui n'en
+  précise pas ;
+* les sessions annoncent tous les encodages de transfert décodables
+  (``ACCEPT_ENCODING``) : gzip et deflate toujours, brotli si le module
+  ``brotli`` est installé (``pip install brotli``) ;
+* ``get_until()`` (ou ``get(..., stop=...)``) lit le corps par morceaux décompressés au fil de l'eau et
+  s'arrête dès que l'appelant a ce qu'il lui faut : la fin de la page n'est
+  jamais téléchargée ;
+* ``stats()`` compte, par hôte, les requêtes, les connexions réellement
+  ouvertes et les octets reçus, compressés et décodés (tableau de bord de
+  debug).
+"""
+
+import threading
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+DEFAULT_TIMEOUT = 10
+
+# Connexions gardées ouvertes par hôte. Au-delà, une requête concurrente ouvre
+# quand même sa connexion, mais elle est fermée après usage. Doit couvrir la
+# concurrence de la source la plus parallèle : zt précharge ses pages de
+# détail jusqu'à la concurrence de l'hostname "zt" dans
+# ``quasarr.search.politeness``.
+POOL_MAXSIZE = 16
+
+# Borne du nombre de sessions (une par hôte) : la moins récemment utilisée est
+# fermée au-delà.
+MAX_HOSTS = 64
+
+# Encodages que urllib3 sait décompresser ici : "gzip,deflate", plus "br" avec
+# le module brotli et "zstd" avec zstandard. Annoncer un encodage sans son
+# décodeur rendrait des corps illisibles.
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+# Taille des morceaux (décompressés) lus par ``get_until()``.
+CHUNK_SIZE = 16 * 1024
+
+# Quand ``get_until()`` a ce qu'il lui faut mais qu'il reste moins que ça à
+# recevoir (d'après Content-Length), la lecture va quand même jusqu'au bout :
+# la connexion retourne au pool au lieu d'être fermée, ce qui épargne une
+# nouvelle poignée de main TLS pour quelques kilo-octets.
+DRAIN_BELOW_BYTES = 32 * 1024
+
+
+class _NoCookies(DefaultCookiePolicy):
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+class _HostSession:
+    __slots__ = ("session", "requests", "errors", "bytes_received", "bytes_decoded", "early_stops")
+
+    def __init__(self, session):
+        self.session = session
+        self.requests = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.early_stops = 0
+
+
+def _host(url):
+    return (urlparse(url).netloc or "").lower()
+
+
+def _bytes_received(response):
+    """Octets lus sur le réseau pour ``response`` (avant décompression)."""
+    try:
+        return response.raw.tell()
+    except (AttributeError, OSError):
+        return 0
+
+
+def _remaining(response):
+    """Octets encore à recevoir d'après Content-Length (None : inconnu)."""
+    try:
+        return int(response.headers["Content-Length"]) - _bytes_received(response)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class HttpClient:
+    """Sessions ``requests`` par hôte, thread-safe."""
+
+    def __init__(self, pool_maxsize=POOL_MAXSIZE, max_hosts=MAX_HOSTS):
+        self._pool_maxsize = pool_maxsize
+        self._max_hosts = max_hosts
+        self._hosts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def session_for(self, url):
+        host = _host(url)
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None:
+                entry = self._hosts[host] = _HostSession(self._new_session())
+                while len(self._hosts) > self._max_hosts:
+                    _old_host, old = self._hosts.popitem(last=False)
+                    old.session.close()
+            self._hosts.move_to_end(host)
+            entry.requests += 1
+        return entry
+
+    def _new_session(self):
+        session = requests.Session()
+        session.cookies.set_policy(_NoCookies())
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(self, method, url, **kwargs):
+        entry, response = self._send(method, url, **kwargs)
+        if not kwargs.get("stream") and response is not None:
+            self._record(entry, _bytes_received(response), len(response.content))
+        return response
+
+    def _send(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        entry = self.session_for(url)
+        try:
+            return entry, entry.session.request(method, url, **kwargs)
+        except Exception:
+            with self._lock:
+                entry.errors += 1
+            raise
+
+    def get(self, url, stop=None, **kwargs):
+        """GET ; avec ``stop``, lecture interrompue comme ``get_until()``."""
+        if stop is not None:
+            return self.get_until(url, stop, **kwargs)
+        return self.request("GET", url, **kwargs)
+
+    def get_until(self, url, stop, **kwargs):
+        """GET dont la lecture s'arrête dès que ``stop(body, start)`` est vrai.
+
+        Le corps est lu par morceaux de ``CHUNK_SIZE`` octets, décompressés au
+        fil de l'eau ; après chaque morceau, ``stop`` reçoit le corps lu jusque
+        là (``bytearray``) et la position du début de ce morceau. Une réponse
+        coupée porte ``truncated = True`` et sa connexion est fermée : elle ne
+        doit pas être mise en cache comme une page complète.
+        """
+        kwargs["stream"] = True
+        entry, response = self._send("GET", url, **kwargs)
+        body = bytearray()
+        truncated = False
+        complete = False
+        try:
+            chunks = response.iter_content(CHUNK_SIZE)
+            for chunk in chunks:
+                start = len(body)
+                body += chunk
+                if stop(body, start):
+                    remaining = _remaining(response)
+                    if remaining is not None and remaining <= DRAIN_BELOW_BYTES:
+                        for chunk in chunks:
+                            body += chunk
+                    else:
+                        truncated = True
+                    break
+            complete = not truncated
+            received = _bytes_received(response)
+        finally:
+            # Corps lu en entier : la connexion retourne au pool ; sinon
+            # ``close()`` la ferme, le reste de la page n'est jamais lu.
+            response._content_consumed = complete
+            response.close()
+        response._content = bytes(body)
+        response._content_consumed = True
+        response.truncated = truncated
+        self._record(entry, received, len(body), early_stop=truncated)
+        return response
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def _record(self, entry, received, decoded, early_stop=False):
+        with self._lock:
+            entry.bytes_received += received
+            entry.bytes_decoded += decoded
+            entry.early_stops += early_stop
+
+    def close(self):
+        with self._lock:
+            for entry in self._hosts.values():
+                entry.session.close()
+            self._hosts.clear()
+
+    def stats(self):
+        with self._lock:
+            hosts = list(self._hosts.items())
+        report = {}
+        for host, entry in hosts:
+            connections = 0
+            adapter = entry.session.get_adapter("https://")
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    connections += getattr(pool, "num_connections", 0)
+            report[host] = {
+                "requests": entry.requests,
+                "errors": entry.errors,
+                "bytes_received": entry.bytes_received,
+                "bytes_decoded": entry.bytes_decoded,
+                "early_stops": entry.early_stops,
+                "connections_opened": connections,
+                "reuse_rate": (
+                    round((1 - connections / entry.requests) * 100, 1)
+                    if entry.requests and connections <= entry.requests else 0
+                ),
+            }
+        return report
+
+
+http_client = HttpClient()
+
+
+def request(method, url, **kwargs):
+    return http_client.request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return http_client.get(url, **kwargs)
+
+
+def get_until(url, stop, **kwargs):
+    return http_client.get_until(url, stop, **kwargs)
+
+
+def post(url, **kwargs):
+    return http_client.post(url, **kwargs)
+
+
+def stats():
+    return http_client.stats()
@@ -9,6 +9,7 @@ from urllib.parse import quote
 
 import requests
 
+from quasarr.providers import metadata_cache
 from quasarr.providers.log import info, debug
 
 # ---------------------------------------------------------------------------
@@ -60,18 +61,23 @@ def _tmdb_token():
     return os.getenv("TMDB_API_KEY", "")
 
 
-# Cache process-local des résolutions TMDB /find (les métadonnées sont stables).
-# Évite de refaire le même /find pour fr, en, romaji, is_anime, get_type... lors
-# d'une même recherche. On ne met en cache que les succès (pas les échecs réseau).
-_FIND_CACHE = {}
+# Les réponses TMDB sont gardées dans ``metadata_cache`` (SQLite, partagé avec le
+# processus JDownloader) : un même /find sert fr, en, romaji, is_anime, get_type...
+# d'une recherche à l'autre, y compris après un redémarrage. /find n'y met que
+# les succès (pas les échecs réseau). Les saisons d'une série en cours changent
+# plus vite que le reste ; un échec gardé l'est brièvement, pour ne pas le
+# retenter à chaque carte sans pour autant le figer une semaine.
+SEASONS_TTL_SECONDS = 24 * 60 * 60
+FAILURE_TTL_SECONDS = 60 * 60
 
 
 def _tmdb_find(imdb_id, language='fr-FR'):
     """Call TMDB /find/{imdb_id} and return (result_dict, media_type) or (None, None)."""
-    cache_key = (imdb_id, language)
-    cached = _FIND_CACHE.get(cache_key)
+    cache_key = f"{imdb_id}|{language}"
+    cached = metadata_cache.get("find", cache_key)
     if cached is not None:
-        return cached
+        result, media_type = cached
+        return result, media_type
 
     token = _tmdb_token()
     if not token:
@@ -100,12 +106,12 @@ def _tmdb_find(imdb_id, language='fr-FR'):
     if tv:
         debug(f"TMDB: tv result for {imdb_id}: {tv[0]}", source="tmdb")
         result = (tv[0], 'tv')
-        _FIND_CACHE[cache_key] = result
+        metadata_cache.put("find", cache_key, list(result))
         return result
     if movies:
         debug(f"TMDB: movie result for {imdb_id}: {movies[0]}", source="tmdb")
         result = (movies[0], 'movie')
-        _FIND_CACHE[cache_key] = result
+        metadata_cache.put("find", cache_key, list(result))
         return result
 
     info(f"TMDB: no results found for {imdb_id}", source="tmdb")
@@ -155,6 +161,36 @@ def get_romaji_title(shared_state, imdb_id):
     pour un slug anime-sama. Le romaji (ex. "Shingeki no Kyojin") se trouve dans
     les titres alternatifs. Retourne None si introuvable.
     """
+    for item in _alternative_titles(imdb_id):
+        if 'romaji' in (item.get('type') or '').lower():
+            title = item.get('title')
+            if title:
+                debug(f"TMDB romaji for {imdb_id}: {title!r}", source="tmdb")
+                return title
+    return None
+
+
+def _alternative_titles(imdb_id):
+    """Titres alternatifs TMDB (``iso_3166_1``, ``title``, ``type``), [] si indisponibles.
+
+    Une seule requête sert le romaji d'anime-sama et les variantes françaises
+    de zt. zt les consulte pour chaque carte analysée : un échec est donc gardé
+    lui aussi, ``FAILURE_TTL_SECONDS`` seulement.
+    """
+    cached = metadata_cache.get("alternative_titles", imdb_id)
+    if cached is not None:
+        return cached
+
+    items = _fetch_alternative_titles(imdb_id)
+    if items is None:
+        metadata_cache.put("alternative_titles", imdb_id, [], ttl=FAILURE_TTL_SECONDS)
+        return []
+    debug(f"TMDB alternative titles for {imdb_id}: {len(items)} entries", source="tmdb")
+    metadata_cache.put("alternative_titles", imdb_id, items)
+    return items
+
+
+def _fetch_alternative_titles(imdb_id):
     result, media_type = _tmdb_find(imdb_id)
     if not result:
         return None
@@ -175,17 +211,9 @@ def get_romaji_title(shared_state, imdb_id):
         return None
 
     # /tv utilise la clé "results", /movie la clé "titles"
-    items = r.json().get('results') or r.json().get('titles') or []
-    for item in items:
-        if 'romaji' in (item.get('type') or '').lower():
-            title = item.get('title')
-            if title:
-                debug(f"TMDB romaji for {imdb_id}: {title!r}", source="tmdb")
-                return title
-    return None
-
-
-_IDENTITY_CACHE = {}
+    data = r.json()
+    items = data.get('results') or data.get('titles') or []
+    return [{key: item.get(key) for key in ('iso_3166_1', 'title', 'type')} for item in items]
 
 
 def get_reference_identity(shared_state, imdb_id):
@@ -198,12 +226,15 @@ def get_reference_identity(shared_state, imdb_id):
 
     Renvoie {'year': str, 'director': str, 'runtime': int|None}.
     """
-    if imdb_id in _IDENTITY_CACHE:
-        return _IDENTITY_CACHE[imdb_id]
+    cached = metadata_cache.get("identity", imdb_id)
+    if cached is not None:
+        return cached
 
     identity = {"year": "", "director": "", "runtime": None}
     result, media_type = _tmdb_find(imdb_id)
     token = _tmdb_token()
+    # Une série n'a pas d'identité de film : réponse vide, mais définitive.
+    complete = bool(result) and media_type == 'tv'
     if result and token and media_type != 'tv':
         url = f"https://api.themoviedb.org/3/movie/{result.get('id')}"
         try:
@@ -216,10 +247,12 @@ def get_reference_identity(shared_state, imdb_id):
                 directors = [c.get("name") for c in (data.get("credits") or {}).get("crew", [])
                              if c.get("job") == "Director" and c.get("name")]
                 identity["director"] = directors[0] if directors else ""
+                complete = True
         except Exception as e:
             debug(f"TMDB identity failed for {imdb_id}: {e}", source="tmdb")
 
-    _IDENTITY_CACHE[imdb_id] = identity
+    metadata_cache.put("identity", imdb_id, identity,
+                       ttl=metadata_cache.TTL_SECONDS if complete else FAILURE_TTL_SECONDS)
     return identity
 
 
@@ -239,43 +272,8 @@ def get_french_alternative_titles(shared_state, imdb_id, limit=3):
 
     Les interroger coûte une requête paginée par titre : la liste est bornée.
     """
-    if imdb_id in _FRENCH_ALT_CACHE:
-        return _FRENCH_ALT_CACHE[imdb_id]
-
-    titles = _fetch_french_alternative_titles(imdb_id, limit)
-    _FRENCH_ALT_CACHE[imdb_id] = titles
-    return titles
-
-
-# Les titres alternatifs sont stables : une requête par film et par process
-# suffit. Sans ce cache, l'analyse de chaque carte du site en déclencherait une.
-_FRENCH_ALT_CACHE = {}
-
-
-def _fetch_french_alternative_titles(imdb_id, limit):
-    result, media_type = _tmdb_find(imdb_id)
-    if not result:
-        return []
-    tmdb_id = result.get('id')
-    token = _tmdb_token()
-    if not tmdb_id or not token:
-        return []
-
-    kind = 'tv' if media_type == 'tv' else 'movie'
-    url = f'https://api.themoviedb.org/3/{kind}/{tmdb_id}/alternative_titles'
-    headers = {'Authorization': f'Bearer {token}'}
-    try:
-        r = requests.get(url, headers=headers, timeout=10)
-    except Exception as e:
-        debug(f"TMDB alternative_titles failed for {imdb_id}: {e}", source="tmdb")
-        return []
-    if r.status_code != 200:
-        return []
-
-    # /tv utilise la clé "results", /movie la clé "titles"
-    items = r.json().get('results') or r.json().get('titles') or []
     titles = []
-    for item in items:
+    for item in _alternative_titles(imdb_id):
         if item.get('iso_3166_1') not in _FRENCH_REGIONS:
             continue
         title = (item.get('title') or '').strip()
@@ -283,9 +281,6 @@ def _fetch_french_alternative_titles(imdb_id, limit):
             titles.append(title)
         if len(titles) >= limit:
             break
-
-    if titles:
-        debug(f"TMDB french alternative titles for {imdb_id}: {titles!r}", source="tmdb")
     return titles
 
 
@@ -374,10 +369,10 @@ def get_season_episode_counts(shared_state, imdb_id):
     if not tmdb_id or not token:
         return {}
 
-    cache_key = ('seasons', tmdb_id)
-    cached = _FIND_CACHE.get(cache_key)
+    cached = metadata_cache.get("seasons", tmdb_id)
     if cached is not None:
-        return cached
+        # JSON : les numéros de saison reviennent en chaînes
+        return {int(num): cnt for num, cnt in cached.items()}
 
     url = f'https://api.themoviedb.org/3/tv/{tmdb_id}'
     headers = {'Authorization': f'Bearer {token}'}
@@ -395,7 +390,7 @@ def get_season_episode_counts(shared_state, imdb_id):
         cnt = season.get('episode_count')
         if isinstance(num, int) and isinstance(cnt, int) and num >= 1:  # ignore les specials (saison 0)
             counts[num] = cnt
-    _FIND_CACHE[cache_key] = counts
+    metadata_cache.put("seasons", tmdb_id, counts, ttl=SEASONS_TTL_SECONDS)
     debug(f"TMDB season counts for {imdb_id}: {counts}", source="tmdb")
     return counts
 
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Réponses TMDB mises en cache, persistées et partagées entre processus.
+
+``imdb_metadata`` gardait ses réponses TMDB (/find, /tv, identité, titres
+alternatifs) dans des dicts du process : sans borne, perdus au redémarrage et
+propres à chaque processus — le processus JDownloader refaisait les requêtes
+que la recherche venait de faire. Chaque recherche Radarr/Sonarr commençait
+donc par attendre TMDB (``is_anime`` décide du routage avant tout le reste),
+même pour un film cherché la veille.
+
+Les réponses sont ici gardées dans la table SQLite ``tmdb_metadata`` du
+fichier /config/Quasarr.db, commun aux deux processus :
+
+* chaque entrée porte sa date d'expiration : ``TTL_SECONDS`` (une semaine)
+  par défaut, moins pour ce qui change plus vite (saisons d'une série en
+  cours, échecs réseau) — l'appelant choisit ;
+* chaque entrée porte ``SCHEMA_VERSION`` : une entrée d'un autre format est
+  ignorée puis effacée au premier nettoyage ;
+* un cache mémoire LRU borné (``MAX_MEMORY_ENTRIES``) évite de relire la DB
+  pour les titres vus récemment ; sans DB (tests, outils) il fonctionne seul.
+
+Seul ce cache mémoire est sous verrou : la DB est lue et écrite hors verrou,
+sur une connexion par thread, et le ménage des entrées périmées tourne une
+fois en arrière-plan. Une DB verrouillée par l'autre processus ne retient que
+la recherche qui l'attend.
+
+Les valeurs sont stockées en JSON : l'appelant reconstruit tuples et clés
+entières.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from quasarr.providers import shared_state
+from quasarr.providers.log import debug
+
+TABLE = "tmdb_metadata"
+
+SCHEMA_VERSION = 1
+TTL_SECONDS = 7 * 24 * 60 * 60
+MAX_MEMORY_ENTRIES = 1024
+
+_MEMORY = OrderedDict()
+_LOCK = threading.RLock()
+_STATS = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stored": 0}
+
+_LOCAL = threading.local()  # connexion du thread : (génération, fichier DB, DB)
+_GENERATION = 0             # incrémentée par invalidate_cache
+_PRUNER = None              # thread de ménage, lancé au premier accès à la DB
+
+
+def _key(kind, key):
+    return f"{kind}|{key}"
+
+
+def _db():
+    """Connexion du thread courant à la table, ouverte au premier appel."""
+    dbfile = shared_state.values.get("dbfile")
+    if not dbfile:
+        return None
+    cached = getattr(_LOCAL, "db", None)
+    if cached is not None and cached[:2] == (_GENERATION, dbfile):
+        return cached[2]
+    try:
+        database = shared_state.get_db(TABLE)
+    except Exception:
+        return None
+    _LOCAL.db = (_GENERATION, dbfile, database)
+    _start_prune()
+    return database
+
+
+def _start_prune():
+    global _PRUNER
+    with _LOCK:
+        if _PRUNER is not None:
+            return
+        _PRUNER = threading.Thread(target=_prune, name="tmdb-metadata-prune", daemon=True)
+    _PRUNER.start()
+
+
+def _remember(key, entry):
+    _MEMORY[key] = entry
+    _MEMORY.move_to_end(key)
+    while len(_MEMORY) > MAX_MEMORY_ENTRIES:
+        _MEMORY.popitem(last=False)
+
+
+def _valid(entry, now):
+    return (
+        isinstance(entry, dict)
+        and entry.get("version") == SCHEMA_VERSION
+        and entry.get("expires", 0) > now
+    )
+
+
+def _prune():
+    """Efface les entrées expirées ou d'un autre schéma (une fois par processus)."""
+    now = time.time()
+    removed = 0
+    try:
+        database = shared_state.get_db(TABLE)
+        for key, raw in database.retrieve_all_titles() or []:
+            try:
+                entry = json.loads(raw)
+            except Exception:
+                entry = None
+            if not _valid(entry, now):
+                database.delete(key)
+                removed += 1
+    except Exception as e:
+        debug(f"Could not prune TMDB metadata cache: {e}", source="tmdb")
+        return
+    if removed:
+        debug(f"Pruned {removed} stale TMDB metadata entries", source="tmdb")
+
+
+def get(kind, key):
+    """Réponse enregistrée pour ``(kind, key)``, ou ``None`` (absente ou expirée)."""
+    cache_key = _key(kind, key)
+    now = time.time()
+    with _LOCK:
+        entry = _MEMORY.get(cache_key)
+    counter = "memory_hits"
+    if entry is None:
+        counter = "db_hits"
+        database = _db()
+        if database is not None:
+            try:
+                raw = database.retrieve(cache_key)
+                entry = json.loads(raw) if raw else None
+            except Exception:
+                entry = None
+    with _LOCK:
+        if counter == "db_hits" and _valid(_MEMORY.get(cache_key), now):
+            entry, counter = _MEMORY[cache_key], "memory_hits"  # enregistrée pendant la lecture
+        if not _valid(entry, now):
+            _MEMORY.pop(cache_key, None)
+            _STATS["misses"] += 1
+            return None
+        _remember(cache_key, entry)
+        _STATS[counter] += 1
+        return entry["data"]
+
+
+def put(kind, key, data, ttl=TTL_SECONDS):
+    """Enregistre ``data`` (sérialisable en JSON) pour ``ttl`` secondes."""
+    cache_key = _key(kind, key)
+    entry = {"version": SCHEMA_VERSION, "expires": time.time() + ttl, "data": data}
+    with _LOCK:
+        _remember(cache_key, entry)
+        _STATS["stored"] += 1
+    database = _db()
+    if database is None:
+        return
+    try:
+        database.update_store(cache_key, json.dumps(entry))
+    except Exception as e:
+        debug(f"Could not persist TMDB metadata for {cache_key}: {e}", source="tmdb")
+
+
+def invalidate_cache():
+    """Vide le cache mémoire (la DB est relue, et rouverte, au prochain accès)."""
+    global _GENERATION, _PRUNER
+    with _LOCK:
+        _MEMORY.clear()
+        _GENERATION += 1
+        _PRUNER = None
+        for name in _STATS:
+            _STATS[name] = 0
+
+
+def stats():
+    with _LOCK:
+        report = dict(_STATS, memory_entries=len(_MEMORY))
+    hits = report["memory_hits"] + report["db_hits"]
+    lookups = hits + report["misses"]
+    report["hit_rate"] = round(hits / lookups * 100, 1) if lookups else 0
+    return report
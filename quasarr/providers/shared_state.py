@@ -2,6 +2,7 @@
 # Quasarr
 # Project by https://github.com/rix1337
 
+import functools
 import json
 import os
 import re
@@ -13,6 +14,7 @@ from urllib import parse
 
 import quasarr
 from quasarr.providers.log import info, debug
+from quasarr.providers import title_normalization
 from quasarr.providers.myjd_api import Myjdapi, TokenExpiredException, RequestTimeoutException, MYJDException, Jddevice
 from quasarr.storage.config import Config
 from quasarr.storage.sqlite_database import DataBase
@@ -517,110 +519,9 @@ def sanitize_title(title: str) -> str:
     return title
 
 
-_ROMAN_NUMERAL_MAP = {
-    'i': '1',
-    'ii': '2',
-    'iii': '3',
-    'iv': '4',
-    'v': '5',
-    'vi': '6',
-    'vii': '7',
-    'viii': '8',
-    'ix': '9',
-    'x': '10',
-    'xi': '11',
-    'xii': '12',
-    'xiii': '13',
-    'xiv': '14',
-    'xv': '15',
-    'xvi': '16',
-    'xvii': '17',
-    'xviii': '18',
-    'xix': '19',
-    'xx': '20',
-}
-
-
-# Lettres latines sans décomposition canonique en NFD : il faut les transcrire
-# à la main, sinon elles disparaissent au filtre ASCII de sanitize_string() et
-# ne sont pas reconnues comme latines par has_non_latin_letters().
-_LATIN_NON_DECOMPOSING = {
-    'œ': 'oe',
-    'æ': 'ae',
-    'ø': 'o',
-    'ß': 'ss',
-    'đ': 'd',
-    'ð': 'd',
-    'ł': 'l',
-    'þ': 'th',
-}
-
-
 def sanitize_string(s):
-    s = s.lower()
-
-    # Strip diacritics to ensure accented characters normalize to their ASCII
-    # equivalents before we start removing punctuation. This keeps titles like
-    # "L'Élève" and "L'Elève" aligned during matching.
-    s = unicodedata.normalize("NFD", s)
-    s = ''.join(ch for ch in s if unicodedata.category(ch) != 'Mn')
-
-    # Remove dots / pluses
-    s = s.replace('.', ' ')
-    s = s.replace('+', ' ')
-    s = s.replace('_', ' ')
-    s = s.replace('-', ' ')
-    s = s.replace('·', ' ')
-
-    # Umlauts
-    s = re.sub(r'ä', 'ae', s)
-    s = re.sub(r'ö', 'oe', s)
-    s = re.sub(r'ü', 'ue', s)
-    s = re.sub(r'ß', 'ss', s)
-
-    # Lettres latines que NFD ne décompose pas : sans transcription explicite
-    # elles tombaient dans le filtre ASCII qui les *supprimait* ("cœur" ->
-    # "cur", qui ne correspond plus au "coeur" écrit par le site).
-    for source, replacement in _LATIN_NON_DECOMPOSING.items():
-        s = s.replace(source, replacement)
-
-    # Remove special characters
-    s = re.sub(r'[^a-zA-Z0-9\s]', '', s)
-
-    # Remove season and episode patterns
-    s = re.sub(r'\bs\d{1,3}(e\d{1,3})?\b', '', s)
-
-    # Remove German and English articles
-    articles = r'\b(?:der|die|das|ein|eine|einer|eines|einem|einen|the|a|an|and|et)\b'
-    s = re.sub(articles, '', s, re.IGNORECASE)
-
-    # Replace obsolete titles
-    s = s.replace('navy cis', 'ncis')
-
-    # Normalise standalone Roman numerals to digits for robust matching
-    tokens = s.split()
-    tokens = [_ROMAN_NUMERAL_MAP.get(token, token) for token in tokens]
-
-    cleaned_tokens = []
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
-
-        if token in {"vol", "volume"}:
-            next_token = tokens[i + 1] if i + 1 < len(tokens) else ""
-            if next_token.isdigit():
-                i += 1
-                continue
-
-        cleaned_tokens.append(token)
-        i += 1
-
-    tokens = cleaned_tokens
-
-    # Remove extra whitespace
-    s = ' '.join(tokens)
-
-    return s
+    """Titre normalisé pour la comparaison (cf. ``title_normalization.sanitize``)."""
+    return title_normalization.sanitize(s)
 
 
 def has_non_latin_letters(text):
@@ -639,7 +540,7 @@ def has_non_latin_letters(text):
     toute recherche contenant un œ était écartée à tort.
     """
     lowered = (text or "").lower()
-    for source, replacement in _LATIN_NON_DECOMPOSING.items():
+    for source, replacement in title_normalization.LATIN_NON_DECOMPOSING.items():
         lowered = lowered.replace(source, replacement)
 
     normalized = unicodedata.normalize("NFD", lowered)
@@ -733,8 +634,10 @@ def search_string_in_sanitized_title(search_string, title):
 
 
 def _search_string_in_sanitized_title(search_string, title):
-    sanitized_search_string = sanitize_string(search_string)
-    sanitized_title = sanitize_string(title)
+    # Normalisations et motif mémorisés : la même requête est confrontée à
+    # chaque carte d'une page listing.
+    sanitized_search_string = title_normalization.sanitize(search_string)
+    sanitized_title = title_normalization.sanitize(title)
 
     # Garde-fou : une recherche qui se réduit à du vide (ex. titre original en
     # japonais "アグレッシブ烈子" → "" car les non-ASCII sont retirés) ne doit RIEN
@@ -745,7 +648,7 @@ def _search_string_in_sanitized_title(search_string, title):
         return False
 
     # Use word boundaries to ensure full word/phrase match
-    if re.search(rf'\b{re.escape(sanitized_search_string)}\b', sanitized_title):
+    if title_normalization.phrase_pattern(sanitized_search_string).search(sanitized_title):
         debug(f"Matched search string: {search_string} with title: {sanitized_title}")
         debug(f"Matched search string: {sanitized_search_string} with title: {title}")
         return True
@@ -755,8 +658,8 @@ def _search_string_in_sanitized_title(search_string, title):
     # sequel numbering like "2" or "II". This helps when Zone-Téléchargement
     # lists a localized title with extra wording but only the original title is
     # present in release names.
-    search_tokens = sanitized_search_string.split()
-    title_tokens = sanitized_title.split()
+    search_tokens = title_normalization.tokens(search_string)
+    title_tokens = title_normalization.tokens(title)
 
     # Choix délibéré : un préfixe d'un seul mot (le nom de la franchise, ex.
     # "Barbie" pour "Barbie : Rock et Royales") est accepté. Il fait remonter
@@ -771,7 +674,7 @@ def _search_string_in_sanitized_title(search_string, title):
 
             numeric_like = {
                 token for token in extra_tokens
-                if token.isdigit() or token in _ROMAN_NUMERAL_MAP
+                if token.isdigit() or token in title_normalization.ROMAN_NUMERAL_MAP
             }
 
             if not numeric_like:
@@ -789,7 +692,7 @@ def _search_string_in_sanitized_title(search_string, title):
         extra_tokens = [t for t in search_tokens if t not in title_tokens]
         numeric_like = {
             token for token in extra_tokens
-            if token.isdigit() or token in _ROMAN_NUMERAL_MAP
+            if token.isdigit() or token in title_normalization.ROMAN_NUMERAL_MAP
         }
         if not numeric_like:
             debug(
@@ -808,28 +711,30 @@ def is_imdb_id(search_string):
         return None
 
 
-def match_in_title(title: str, season: int = None, episode: int = None) -> bool:
-    title = normalize_localized_season_episode_tags(title)
+_SEASON_EPISODE_TAG = re.compile(
+    r"(?i)(?<![A-Za-z0-9])s(\d+)(?:-(\d+))?"  # season or season‑range
+    r"(?:[\s.\-_]*e(\d+)(?:-(?:[eE]?)(\d+))?)?"  # episode or episode‑range
+    r"(?=[^A-Za-z0-9]|$)"
+)
+
 
+def _as_number(value):
     # ensure season/episode are ints (or None)
-    if isinstance(season, str):
-        try:
-            season = int(season)
-        except ValueError:
-            season = None
-    if isinstance(episode, str):
+    if isinstance(value, str):
         try:
-            episode = int(episode)
+            return int(value)
         except ValueError:
-            episode = None
+            return None
+    return value
 
-    pattern = re.compile(
-        r"(?i)(?<![A-Za-z0-9])s(\d+)(?:-(\d+))?"  # season or season‑range
-        r"(?:[\s.\-_]*e(\d+)(?:-(?:[eE]?)(\d+))?)?"  # episode or episode‑range
-        r"(?=[^A-Za-z0-9]|$)"
-    )
 
-    matches = pattern.findall(title)
+def match_in_title(title: str, season: int = None, episode: int = None) -> bool:
+    title = normalize_localized_season_episode_tags(title)
+    return _match_in_normalized_title(title, _as_number(season), _as_number(episode))
+
+
+def _match_in_normalized_title(title, season, episode):
+    matches = _SEASON_EPISODE_TAG.findall(title)
     if not matches:
         return False
 
@@ -859,6 +764,153 @@ def match_in_title(title: str, season: int = None, episode: int = None) -> bool:
     return False
 
 
+def title_index(titles):
+    """``TitleIndex`` de couples ``(clé, titre)``, graphie sans numéro d'ordre
+    du site comprise (cf. ``search_string_in_sanitized_title``)."""
+    documents = []
+    for key, title in titles:
+        documents.append((key, title))
+        without_ordinal = strip_site_film_ordinal(title)
+        if without_ordinal:
+            documents.append((key, without_ordinal))
+    return title_normalization.TitleIndex(documents)
+
+
+# Index des dernières pages validées, partagé par les validateurs des
+# différentes variantes d'une requête (un index est en lecture seule).
+PAGE_INDEX_CACHE_SIZE = 32
+
+
+@functools.lru_cache(maxsize=PAGE_INDEX_CACHE_SIZE)
+def _page_index(titles):
+    return title_index((title, normalize_localized_season_episode_tags(title)) for title in titles)
+
+
+class ReleaseValidator:
+    """``is_valid_release`` préparé une fois pour une recherche.
+
+    Requérant, requête, saison et épisode sont analysés à la construction ;
+    ``validate`` ne traite plus que le titre et mémorise son verdict (zt
+    valide chaque carte deux fois : préchargement puis boucle principale).
+    Verdicts et raisons sont ceux de ``is_valid_release``.
+    """
+
+    def __init__(self, request_from, search_string, season=None, episode=None):
+        self.request_from = request_from
+        self.search_string = search_string
+        self.season = season
+        self.episode = episode
+        self._verdicts = {}
+        self._season_only = None
+        self._setup_error = None
+        self._season_number = _as_number(season)
+        self._episode_number = _as_number(episode)
+        try:
+            rf = request_from.lower()
+            self._is_movie_search = 'radarr' in rf
+            self._is_tv_search = 'sonarr' in rf
+            self._is_docs_search = 'lazylibrarian' in rf
+            self._match_search_string = (
+                not self._is_docs_search and not is_imdb_id(search_string)
+            )
+        except Exception as e:
+            self._setup_error = e
+
+    def validate(self, title):
+        """``(True, None)`` ou ``(False, raison)`` pour ce titre."""
+        verdict = self._verdicts.get(title)
+        if verdict is None:
+            verdict = self._verdicts[title] = self._validate(title)
+        return verdict
+
+    def validate_all(self, titles):
+        """Verdicts de ``titles``, dans l'ordre.
+
+        Les titres d'une page sont indexés une fois (``title_index``), l'index
+        sert ensuite à chaque variante de la requête : les titres qui ne
+        peuvent pas lui correspondre sont écartés sans comparaison détaillée.
+        """
+        titles = list(titles)
+        unique = tuple(dict.fromkeys(titles))
+        pending = [title for title in unique if title not in self._verdicts]
+        if len(pending) > 1 and self._setup_error is None and self._match_search_string:
+            candidates = _page_index(unique).candidates(self.search_string)
+            for title in pending:
+                if title not in candidates:
+                    normalized = normalize_localized_season_episode_tags(title)
+                    reason = f"title {normalized!r} doesn't match search string {self.search_string!r}"
+                    debug(f"Skipping: {reason}")
+                    self._verdicts[title] = (False, reason)
+        return [self.validate(title) for title in titles]
+
+    def season_only(self):
+        """Même recherche sans l'épisode (titre valide au niveau saison)."""
+        if self._season_only is None:
+            self._season_only = ReleaseValidator(self.request_from, self.search_string, self.season, None)
+        return self._season_only
+
+    def _validate(self, title):
+        title = normalize_localized_season_episode_tags(title)
+        season, episode = self.season, self.episode
+
+        try:
+            if self._setup_error is not None:
+                raise self._setup_error
+
+            if self._match_search_string:
+                if not search_string_in_sanitized_title(self.search_string, title):
+                    reason = f"title {title!r} doesn't match search string {self.search_string!r}"
+                    debug(f"Skipping: {reason}")
+                    return False, reason
+
+            if self._is_movie_search:
+                if not MOVIE_REGEX.match(title):
+                    reason = f"title {title!r} contains S/E tags — looks like a TV show, not a movie"
+                    debug(f"Skipping: {reason}")
+                    return False, reason
+                return True, None
+
+            if self._is_tv_search:
+                if not SEASON_EP_REGEX.search(title):
+                    reason = f"title {title!r} has no S/E tag — looks like a movie, not a TV show"
+                    debug(f"Skipping: {reason}")
+                    return False, reason
+                if season is not None or episode is not None:
+                    if not _match_in_normalized_title(title, self._season_number, self._episode_number):
+                        reason = f"title {title!r} doesn't match S{season}E{episode}"
+                        debug(f"Skipping: {reason}")
+                        return False, reason
+                return True, None
+
+            if self._is_docs_search:
+                if SEASON_EP_REGEX.search(title):
+                    reason = f"title {title!r} contains S/E tags — not a document"
+                    debug(f"Skipping: {reason}")
+                    return False, reason
+                return True, None
+
+            reason = f"unknown requester {self.request_from!r}"
+            debug(f"Skipping {title!r}: {reason}")
+            return False, reason
+
+        except Exception as e:
+            tb = traceback.format_exc()
+            reason = f"exception: {e!r}"
+            debug(f"Exception in is_valid_release: {e!r}\n{tb}"
+                  f"is_valid_release called with "
+                  f"title={title!r}, request_from={self.request_from!r}, "
+                  f"search_string={self.search_string!r}, season={season!r}, episode={episode!r}")
+            return False, reason
+
+
+def release_validator(request_from: str,
+                      search_string: str,
+                      season: int = None,
+                      episode: int = None):
+    """Validateur de releases pour une recherche (cf. ``ReleaseValidator``)."""
+    return ReleaseValidator(request_from, search_string, season, episode)
+
+
 def is_valid_release(title: str,
                      request_from: str,
                      search_string: str,
@@ -867,59 +919,11 @@ def is_valid_release(title: str,
     """
     Return (True, None) if the given release title is valid for the given
     search parameters, or (False, reason_string) explaining why it was rejected.
-    """
-    title = normalize_localized_season_episode_tags(title)
 
-    try:
-        rf = request_from.lower()
-        is_movie_search = 'radarr' in rf
-        is_tv_search = 'sonarr' in rf
-        is_docs_search = 'lazylibrarian' in rf
-
-        if not is_docs_search and not is_imdb_id(search_string):
-            if not search_string_in_sanitized_title(search_string, title):
-                reason = f"title {title!r} doesn't match search string {search_string!r}"
-                debug(f"Skipping: {reason}")
-                return False, reason
-
-        if is_movie_search:
-            if not MOVIE_REGEX.match(title):
-                reason = f"title {title!r} contains S/E tags — looks like a TV show, not a movie"
-                debug(f"Skipping: {reason}")
-                return False, reason
-            return True, None
-
-        if is_tv_search:
-            if not SEASON_EP_REGEX.search(title):
-                reason = f"title {title!r} has no S/E tag — looks like a movie, not a TV show"
-                debug(f"Skipping: {reason}")
-                return False, reason
-            if season is not None or episode is not None:
-                if not match_in_title(title, season, episode):
-                    reason = f"title {title!r} doesn't match S{season}E{episode}"
-                    debug(f"Skipping: {reason}")
-                    return False, reason
-            return True, None
-
-        if is_docs_search:
-            if SEASON_EP_REGEX.search(title):
-                reason = f"title {title!r} contains S/E tags — not a document"
-                debug(f"Skipping: {reason}")
-                return False, reason
-            return True, None
-
-        reason = f"unknown requester {request_from!r}"
-        debug(f"Skipping {title!r}: {reason}")
-        return False, reason
-
-    except Exception as e:
-        tb = traceback.format_exc()
-        reason = f"exception: {e!r}"
-        debug(f"Exception in is_valid_release: {e!r}\n{tb}"
-              f"is_valid_release called with "
-              f"title={title!r}, request_from={request_from!r}, "
-              f"search_string={search_string!r}, season={season!r}, episode={episode!r}")
-        return False, reason
+    Sources that validate many titles for one search should build a
+    ``release_validator`` once instead.
+    """
+    return ReleaseValidator(request_from, search_string, season, episode).validate(title)
 
 
 def normalize_magazine_title(title: str) -> str:
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Normalisation des titres pour la comparaison recherche / release.
+
+``shared_state.sanitize_string`` est appelé à chaque comparaison de titre :
+une recherche zt confronte des centaines de cartes à quelques variantes de la
+requête, et la même variante était re-normalisée pour chaque carte (NFD, une
+dizaine de substitutions regex, passe des chiffres romains, articles).
+
+Ici les motifs sont compilés une fois, les remplacements caractère par
+caractère tiennent dans une seule table ``str.translate``, et les résultats
+sont mémorisés dans des caches LRU bornés (``SANITIZE_CACHE_SIZE``) : chaîne
+normalisée, liste de mots, motif « phrase entière » d'une requête. Toutes les
+fonctions sont pures, le cache ne change aucun résultat.
+
+``TitleIndex`` est un index inversé mot -> titres, construit une fois pour une
+page de cartes : il écarte d'un coup les titres qu'aucun critère de
+comparaison ne peut accepter, avant l'examen détaillé des autres.
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+SANITIZE_CACHE_SIZE = 4096
+
+ROMAN_NUMERAL_MAP = {
+    'i': '1',
+    'ii': '2',
+    'iii': '3',
+    'iv': '4',
+    'v': '5',
+    'vi': '6',
+    'vii': '7',
+    'viii': '8',
+    'ix': '9',
+    'x': '10',
+    'xi': '11',
+    'xii': '12',
+    'xiii': '13',
+    'xiv': '14',
+    'xv': '15',
+    'xvi': '16',
+    'xvii': '17',
+    'xviii': '18',
+    'xix': '19',
+    'xx': '20',
+}
+
+# Lettres latines sans décomposition canonique en NFD : il faut les transcrire
+# à la main, sinon elles disparaissent au filtre ASCII de sanitize() et ne
+# sont pas reconnues comme latines par shared_state.has_non_latin_letters().
+LATIN_NON_DECOMPOSING = {
+    'œ': 'oe',
+    'æ': 'ae',
+    'ø': 'o',
+    'ß': 'ss',
+    'đ': 'd',
+    'ð': 'd',
+    'ł': 'l',
+    'þ': 'th',
+}
+
+# Séparateurs ramenés à une espace, puis lettres à transcrire. Les trémas
+# (ä, ö, ü) n'y sont pas : NFD les a déjà réduits à leur voyelle.
+_TRANSLATION = str.maketrans({
+    '.': ' ',
+    '+': ' ',
+    '_': ' ',
+    '-': ' ',
+    '·': ' ',
+    **LATIN_NON_DECOMPOSING,
+})
+
+_SPECIAL_CHARACTERS = re.compile(r'[^a-zA-Z0-9\s]')
+_SEASON_EPISODE = re.compile(r'\bs\d{1,3}(e\d{1,3})?\b')
+_ARTICLES = re.compile(r'\b(?:der|die|das|ein|eine|einer|eines|einem|einen|the|a|an|and|et)\b')
+# Historiquement ``re.sub(articles, '', s, re.IGNORECASE)`` : le drapeau
+# tombait dans le paramètre ``count``, seuls les deux premiers articles sont
+# donc retirés. Conservé tel quel, les comparaisons en dépendent.
+_ARTICLES_REMOVED = 2
+_VOLUME_WORDS = frozenset({"vol", "volume"})
+
+
+def _strip_diacritics(s):
+    if s.isascii():
+        return s
+    s = unicodedata.normalize("NFD", s)
+    return ''.join(ch for ch in s if unicodedata.category(ch) != 'Mn')
+
+
+@lru_cache(maxsize=SANITIZE_CACHE_SIZE)
+def sanitize(s):
+    """Titre réduit à des mots ASCII en minuscules, comparables entre eux."""
+    # Sans les accents, "L'Élève" et "L'Elève" se rejoignent avant le retrait
+    # de la ponctuation.
+    s = _strip_diacritics(s.lower()).translate(_TRANSLATION)
+    s = _SPECIAL_CHARACTERS.sub('', s)
+    s = _SEASON_EPISODE.sub('', s)
+    s = _ARTICLES.sub('', s, count=_ARTICLES_REMOVED)
+    s = s.replace('navy cis', 'ncis')
+
+    # Chiffres romains isolés -> chiffres ; "vol"/"volume" devant un numéro
+    # disparaît.
+    tokens = [ROMAN_NUMERAL_MAP.get(token, token) for token in s.split()]
+    cleaned_tokens = []
+    for i, token in enumerate(tokens):
+        if token in _VOLUME_WORDS and i + 1 < len(tokens) and tokens[i + 1].isdigit():
+            continue
+        cleaned_tokens.append(token)
+    return ' '.join(cleaned_tokens)
+
+
+@lru_cache(maxsize=SANITIZE_CACHE_SIZE)
+def tokens(s):
+    """Mots de ``sanitize(s)`` (tuple : partagé par le cache, donc immuable)."""
+    return tuple(sanitize(s).split())
+
+
+@lru_cache(maxsize=SANITIZE_CACHE_SIZE)
+def phrase_pattern(sanitized):
+    """Motif qui trouve ``sanitized`` comme suite de mots entiers."""
+    return re.compile(rf'\b{re.escape(sanitized)}\b')
+
+
+class TitleIndex:
+    """Index inversé des mots de titres, pour trouver les candidats d'une requête.
+
+    ``documents`` : couples ``(clé, texte)`` ; une même clé peut porter
+    plusieurs graphies d'un titre. ``candidates(query)`` renvoie les clés dont
+    au moins une graphie, réduite à ses mots, contient tous les mots de la
+    requête ou n'a que des mots de la requête. Toute comparaison « phrase
+    entière », « préfixe » ou « mots dans l'ordre » qui réussit remplit l'une
+    de ces deux conditions : un titre hors candidats ne peut pas correspondre.
+    """
+
+    def __init__(self, documents):
+        self._keys = []
+        self._sizes = []
+        self._postings = defaultdict(set)
+        for key, text in documents:
+            words = set(tokens(text))
+            if not words:
+                continue  # titre vide après normalisation : ne correspond à rien
+            document = len(self._keys)
+            self._keys.append(key)
+            self._sizes.append(len(words))
+            for word in words:
+                self._postings[word].add(document)
+
+    def candidates(self, query):
+        words = set(tokens(query))
+        if not words:
+            return set()
+        postings = [self._postings.get(word, set()) for word in words]
+        # La requête entière dans le titre : intersection, plus courte liste d'abord.
+        postings.sort(key=len)
+        found = set(postings[0]).intersection(*postings[1:])
+        # Le titre entier dans la requête : tous ses mots touchés.
+        hits = Counter()
+        for posting in postings:
+            hits.update(posting)
+        found.update(document for document, count in hits.items()
+                     if count == self._sizes[document])
+        return {self._keys[document] for document in found}
+
+
+def clear_caches():
+    for cached in (sanitize, tokens, phrase_pattern):
+        cached.cache_clear()
+
+
+def stats():
+    report = {}
+    for cached in (sanitize, tokens, phrase_pattern):
+        info = cached.cache_info()
+        lookups = info.hits + info.misses
+        report[cached.__name__] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "entries": info.currsize,
+            "hit_rate": round(info.hits / lookups * 100, 1) if lookups else 0,
+        }
+    return report
@@ -4,11 +4,18 @@
 
 import time
 import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures import FIRST_COMPLETED, wait
 
 from quasarr.providers.imdb_metadata import is_anime
 from quasarr.providers.log import info, debug, warning, error
+from quasarr.search.cache import cache_key, requester_kind, result_cache
+from quasarr.search.cancellation import SUPERSEDED, CancelToken
+from quasarr.search import negative_cache
+from quasarr.search.outcome import is_failure
+from quasarr.search.health import source_health
+from quasarr.search.priority import classify
+from quasarr.search.scheduler import PRIORITY_BACKGROUND, search_scheduler
+from quasarr.search.singleflight import search_flight
 from quasarr.search.sources.al import al_feed, al_search
 from quasarr.search.sources.am import am_feed, am_search
 from quasarr.search.sources.by import by_feed, by_search
@@ -28,12 +35,61 @@ from quasarr.search.sources.zt import zt_feed, zt_search
 # On rend donc toujours la main avant, quitte à renvoyer un résultat partiel.
 SEARCH_BUDGET_SECONDS = 75
 
+# Délai avant de lancer zt en parallèle d'anime-sama pour un anime, si ce
+# dernier n'a encore rien rendu. Réglable dans la section [Search] de la config.
+ANIME_ZT_SPECULATIVE_DELAY_SECONDS = 10
 
-def get_search_results(shared_state, request_from, imdb_id="", search_phrase="", mirror=None, season="", episode=""):
-    results = []
 
+def anime_zt_delay_seconds(shared_state):
+    """Délai (s) avant le zt spéculatif d'un anime ; None pour le désactiver.
+
+    Vide / invalide -> défaut ``ANIME_ZT_SPECULATIVE_DELAY_SECONDS``. Une valeur
+    négative désactive la spéculation : zt n'est lancé qu'une fois anime-sama
+    revenu bredouille.
+    """
+    raw = shared_state.values["config"]("Search").get("anime_zt_delay_seconds")
+    try:
+        delay = float(str(raw).replace(",", ".").strip())
+    except (TypeError, ValueError):
+        return ANIME_ZT_SPECULATIVE_DELAY_SECONDS
+    if delay < 0:
+        return None
+    return delay
+
+
+def get_search_results(shared_state, request_from, imdb_id="", search_phrase="", mirror=None, season="", episode="",
+                       priority=None):
     if imdb_id and not imdb_id.startswith('tt'):
         imdb_id = f'tt{imdb_id}'
+    if priority is None:
+        priority = classify(request_from, imdb_id, search_phrase)
+
+    # Les rafales de Sonarr contiennent des recherches identiques : elles se
+    # greffent sur celle déjà en vol au lieu de relancer toutes les sources.
+    # Une recherche interactive qui rejoint un préchauffage le fait passer à sa
+    # priorité, pour ne pas attendre derrière les flux RSS.
+    key = (
+        imdb_id,
+        search_phrase or "",
+        str(season or ""),
+        str(episode or ""),
+        requester_kind(request_from),
+        (mirror or "").lower(),
+    )
+    group = search_scheduler.new_group()
+    return search_flight.do(
+        key,
+        lambda: _run_search(
+            shared_state, request_from, imdb_id, search_phrase, mirror, season, episode, priority, group,
+        ),
+        context=group,
+        on_join=lambda in_flight: search_scheduler.raise_priority(in_flight, priority),
+    )
+
+
+def _run_search(shared_state, request_from, imdb_id, search_phrase, mirror, season, episode, priority,
+                group):
+    results = []
 
     docs_search = "lazylibrarian" in request_from.lower()
 
@@ -57,45 +113,45 @@ def get_search_results(shared_state, request_from, imdb_id="", search_phrase="",
 
     # Radarr/Sonarr use imdb_id for searches
     imdb_map = [
-        (al, al_search),
-        (am, am_search),
-        (by, by_search),
-        (dd, dd_search),
-        (dt, dt_search),
-        (dw, dw_search),
-        (fx, fx_search),
-        (mb, mb_search),
-        (nx, nx_search),
-        (sf, sf_search),
-        (sl, sl_search),
-        (wd, wd_search),
-        (zt, zt_search),
+        ("al", al, al_search),
+        ("am", am, am_search),
+        ("by", by, by_search),
+        ("dd", dd, dd_search),
+        ("dt", dt, dt_search),
+        ("dw", dw, dw_search),
+        ("fx", fx, fx_search),
+        ("mb", mb, mb_search),
+        ("nx", nx, nx_search),
+        ("sf", sf, sf_search),
+        ("sl", sl, sl_search),
+        ("wd", wd, wd_search),
+        ("zt", zt, zt_search),
     ]
 
     # LazyLibrarian uses search_phrase for searches
     phrase_map = [
-        (by, by_search),
-        (dt, dt_search),
-        (nx, nx_search),
-        (sl, sl_search),
-        (wd, wd_search),
+        ("by", by, by_search),
+        ("dt", dt, dt_search),
+        ("nx", nx, nx_search),
+        ("sl", sl, sl_search),
+        ("wd", wd, wd_search),
     ]
 
     # Feed searches omit imdb_id and search_phrase
     feed_map = [
-        (al, al_feed),
-        (am, am_feed),
-        (by, by_feed),
-        (dd, dd_feed),
-        (dt, dt_feed),
-        (dw, dw_feed),
-        (fx, fx_feed),
-        (mb, mb_feed),
-        (nx, nx_feed),
-        (sf, sf_feed),
-        (sl, sl_feed),
-        (wd, wd_feed),
-        (zt, zt_feed),
+        ("al", al, al_feed),
+        ("am", am, am_feed),
+        ("by", by, by_feed),
+        ("dd", dd, dd_feed),
+        ("dt", dt, dt_feed),
+        ("dw", dw, dw_feed),
+        ("fx", fx, fx_feed),
+        ("mb", mb, mb_feed),
+        ("nx", nx, nx_feed),
+        ("sf", sf, sf_feed),
+        ("sl", sl, sl_feed),
+        ("wd", wd, wd_feed),
+        ("zt", zt, zt_feed),
     ]
 
     # anime-sama (am) ne sert que pour les animes ; pour un anime on le préfère à
@@ -109,23 +165,23 @@ def get_search_results(shared_state, request_from, imdb_id="", search_phrase="",
             (shared_state, start_time, request_from, imdb_id),
             {'mirror': mirror, 'season': season, 'episode': episode}
         )
-        for flag, func in imdb_map:
+        for name, flag, func in imdb_map:
             if not flag:
                 continue
             if func is am_search and not anime:
                 continue  # anime-sama : animes uniquement
             if func is zt_search and anime:
                 continue  # anime : zt seulement en secours (géré après le run)
-            functions.append(lambda f=func, a=args, kw=kwargs: f(*a, **kw))
+            functions.append((name, _source_call(func, args, kwargs)))
 
     elif search_phrase and docs_search:  # only LazyLibrarian is allowed to use search_phrase
         args, kwargs = (
             (shared_state, start_time, request_from, search_phrase),
             {'mirror': mirror, 'season': season, 'episode': episode}
         )
-        for flag, func in phrase_map:
+        for name, flag, func in phrase_map:
             if flag:
-                functions.append(lambda f=func, a=args, kw=kwargs: f(*a, **kw))
+                functions.append((name, _source_call(func, args, kwargs)))
 
     elif search_phrase:
         debug(
@@ -136,9 +192,9 @@ def get_search_results(shared_state, request_from, imdb_id="", search_phrase="",
             (shared_state, start_time, request_from),
             {'mirror': mirror}
         )
-        for flag, func in feed_map:
+        for name, flag, func in feed_map:
             if flag:
-                functions.append(lambda f=func, a=args, kw=kwargs: f(*a, **kw))
+                functions.append((name, _source_call(func, args, kwargs)))
 
     if imdb_id:
         stype = f'IMDb-ID "{imdb_id}"'
@@ -147,80 +203,250 @@ def get_search_results(shared_state, request_from, imdb_id="", search_phrase="",
     else:
         stype = "feed search"
 
+    # Seules les recherches par IMDb-ID passent par le cache : un flux RSS doit
+    # refléter le site à l'instant, et LazyLibrarian cherche par phrase libre.
+    key = cache_key(imdb_id, season, episode, request_from, mirror) if imdb_id else None
+    generation = result_cache.generation
+    if key:
+        pending = []
+        for name, func in functions:
+            hit = result_cache.lookup(key, name)
+            if hit is None:
+                pending.append((name, func))
+                continue
+            releases, fresh = hit
+            results.extend(releases)
+            if not fresh:
+                _refresh_in_background(key, name, func, generation)
+            debug(f"Serving {len(releases)} {'cached' if fresh else 'stale'} releases from {name} "
+                  f"for {stype}", source="search")
+        functions = pending
+
+    # Une source dont le disjoncteur est ouvert est sautée au lieu de consommer
+    # le budget ; les plus lentes partent en premier pour en avoir le plus.
+    allowed = []
+    for name, func in functions:
+        if key and negative_cache.is_known_miss(shared_state, name, imdb_id, season):
+            debug(f"Skipping {name} for {stype}: no releases there on recent searches", source="search")
+            continue
+        if not source_health.allow(name):
+            debug(f"Skipping {name} for {stype}: circuit open after repeated failures", source="search")
+            continue
+        allowed.append((name, _timed(name, func)))
+    rank = {name: i for i, name in enumerate(source_health.by_slowest_first([n for n, _ in allowed]))}
+    functions = sorted(allowed, key=lambda item: rank[item[0]])
+
     debug(f'Starting {len(functions)} search functions for {stype}... This may take some time.')
 
     def remaining_budget():
         return max(SEARCH_BUDGET_SECONDS - (time.time() - start_time), 0)
 
-    executor = ThreadPoolExecutor()
-    try:
-        futures = [executor.submit(func) for func in functions]
-        remaining = remaining_budget()
-        try:
-            for future in as_completed(futures, timeout=remaining):
-                try:
-                    result = future.result()
-                    results.extend(result)
-                except Exception as e:
-                    tb = traceback.extract_tb(e.__traceback__)
-                    location = f"{tb[-1].filename}:{tb[-1].lineno}" if tb else "unknown location"
-                    error(f"An error occurred at {location}: {e}", source="search")
-        except FuturesTimeoutError:
-            # Budget épuisé : on répond avec ce qui est déjà arrivé plutôt que
-            # de laisser le client *arr expirer et désactiver l'indexeur.
-            unfinished = sum(1 for f in futures if not f.done())
-            warning(
-                f"Search budget of {SEARCH_BUDGET_SECONDS}s exhausted for {stype} - "
-                f"returning {len(results)} releases with {unfinished} source(s) still running",
-                source="search",
-            )
-    finally:
-        try:
-            executor.shutdown(wait=False, cancel_futures=True)
-        except TypeError:  # cancel_futures : Python < 3.9
-            executor.shutdown(wait=False)
-
-    # Secours zt : si c'est un anime et qu'anime-sama n'a renvoyé aucun résultat,
-    # on retombe sur zt (qui n'a pas été lancé dans le run parallèle ci-dessus).
-    # Ce secours doit rester soumis au même budget : lancé en synchrone il
-    # échappait au garde-fou, et une recherche zt de 143 s a ainsi dépassé le
-    # timeout de 100 s de Radarr, qui a désactivé l'indexeur.
+    # Partagé par toutes les sources de cette recherche : annulé quand le budget
+    # est épuisé, pour qu'elles cessent de paginer pour une réponse déjà partie.
+    cancel = CancelToken()
+    # ``group`` : groupe de l'ordonnanceur global. Les recherches concurrentes
+    # sont servies à tour de rôle, et les sous-tâches de zt héritent du groupe.
+
+    futures = []
+    names = {}
+    tokens = {}
+    am_future = None
+    for name, func in functions:
+        future = search_scheduler.submit(name, func, cancel, group=group, priority=priority)
+        if key:
+            future.add_done_callback(_remember(key, name, generation, cancel))
+        if name == "am":
+            am_future = future
+        names[future] = name
+        tokens[future] = cancel
+        futures.append(future)
+
+    # Secours zt pour un anime : anime-sama est préféré, zt ne sert que s'il
+    # revient bredouille. Attendre sa réponse pour lancer zt additionnait les
+    # deux latences ; zt part donc aussi, par spéculation, si anime-sama n'a
+    # rien rendu au bout de ``anime_zt_delay_seconds``, et il est annulé (ou ses
+    # releases écartées) dès qu'anime-sama trouve quelque chose.
+    # Ce secours reste soumis au même budget : lancé en synchrone il échappait
+    # au garde-fou, et une recherche zt de 143 s a ainsi dépassé le timeout de
+    # 100 s de Radarr, qui a désactivé l'indexeur.
+    zt_hit = None
+    zt_pending = False
     if imdb_id and anime and zt:
-        am_found = any(r.get("details", {}).get("hostname") == "am" for r in results)
-        if not am_found:
-            remaining = remaining_budget()
-            if not remaining:
-                warning(
-                    f"Search budget of {SEARCH_BUDGET_SECONDS}s already exhausted for {stype} - "
-                    f"skipping zt fallback",
-                    source="search",
-                )
+        zt_hit = result_cache.lookup(key, "zt")
+        zt_pending = zt_hit is None and not negative_cache.is_known_miss(shared_state, "zt", imdb_id, season)
+    zt_delay = anime_zt_delay_seconds(shared_state) if zt_pending else None
+    zt_start_at = time.time() + zt_delay if zt_delay is not None else None
+    zt_cancel = CancelToken()
+    zt_future = None
+    zt_releases = []
+
+    def am_found():
+        return any(r.get("details", {}).get("hostname") == "am" for r in results)
+
+    waiting = set(futures)
+    timed_out = False
+    while True:
+        if zt_pending:
+            am_settled = am_future is None or am_future.done()
+            if am_found():
+                zt_pending = False
+            elif am_settled or (zt_start_at is not None and time.time() >= zt_start_at):
+                zt_pending = False
+                if not source_health.allow("zt"):
+                    debug(f"Skipping zt fallback for {stype}: circuit open after repeated failures",
+                          source="search")
+                else:
+                    if am_settled:
+                        debug("anime-sama returned no results — falling back to zt", source="search")
+                    else:
+                        debug(f"anime-sama still searching after {zt_delay}s — starting zt speculatively",
+                              source="search")
+                    zt_future = search_scheduler.submit("zt", _timed("zt", _zt_fallback_call(
+                        shared_state, start_time, request_from, imdb_id, mirror, season, episode,
+                    )), zt_cancel, group=group, priority=priority)
+                    zt_future.add_done_callback(_remember(key, "zt", generation, zt_cancel))
+                    names[zt_future] = "zt"
+                    tokens[zt_future] = zt_cancel
+                    waiting.add(zt_future)
+
+        if zt_future in waiting and am_found():
+            debug(f"anime-sama found releases — dropping speculative zt for {stype}", source="search")
+            zt_cancel.cancel(SUPERSEDED)
+            waiting.discard(zt_future)
+
+        if not waiting and not zt_pending:
+            break
+
+        remaining = remaining_budget()
+        if not remaining:
+            timed_out = True
+            break
+        if zt_pending and zt_start_at is not None:
+            remaining = min(remaining, max(zt_start_at - time.time(), 0))
+
+        done, waiting = wait(waiting, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as e:
+                tb = traceback.extract_tb(e.__traceback__)
+                location = f"{tb[-1].filename}:{tb[-1].lineno}" if tb else "unknown location"
+                error(f"An error occurred at {location}: {e}", source="search")
+                continue
+            if key and not mirror and not is_failure(result) and not tokens[future].cancelled:
+                # Un filtre de mirror peut vider la liste sans que le titre
+                # manque sur le site : seules les recherches sans filtre comptent.
+                # Une source en échec ou interrompue n'a rien établi non plus.
+                negative_cache.record(shared_state, names[future], imdb_id, season, episode, result)
+            if future is zt_future:
+                zt_releases = result  # retenues tant qu'anime-sama peut encore répondre
             else:
-                debug("anime-sama returned no results — falling back to zt", source="search")
-                fallback_executor = ThreadPoolExecutor(max_workers=1)
-                try:
-                    future = fallback_executor.submit(
-                        zt_search,
-                        shared_state, start_time, request_from, imdb_id,
-                        mirror=mirror, season=season, episode=episode,
-                    )
-                    try:
-                        results.extend(future.result(timeout=remaining))
-                    except FuturesTimeoutError:
-                        warning(
-                            f"Search budget of {SEARCH_BUDGET_SECONDS}s exhausted during zt "
-                            f"fallback for {stype} - returning {len(results)} releases",
-                            source="search",
-                        )
-                    except Exception as e:
-                        error(f"zt fallback failed: {e}", source="search")
-                finally:
-                    try:
-                        fallback_executor.shutdown(wait=False, cancel_futures=True)
-                    except TypeError:  # cancel_futures : Python < 3.9
-                        fallback_executor.shutdown(wait=False)
+                results.extend(result)
+
+    if timed_out:
+        # Budget épuisé : on répond avec ce qui est déjà arrivé plutôt que
+        # de laisser le client *arr expirer et désactiver l'indexeur.
+        cancel.cancel()
+        zt_cancel.cancel()
+        search_scheduler.cancel_group(group)
+        warning(
+            f"Search budget of {SEARCH_BUDGET_SECONDS}s exhausted for {stype} - "
+            f"returning {len(results) + len(zt_releases)} releases with {len(waiting)} source(s) still running",
+            source="search",
+        )
+
+    if zt_releases and not am_found():
+        results.extend(zt_releases)
+
+    if zt_hit is not None and not am_found():
+        releases, fresh = zt_hit
+        results.extend(releases)
+        if not fresh:
+            _refresh_in_background(key, "zt", _zt_fallback_call(
+                shared_state, start_time, request_from, imdb_id, mirror, season, episode,
+            ), generation)
+        debug(f"Serving {len(releases)} {'cached' if fresh else 'stale'} zt fallback releases "
+              f"for {stype}", source="search")
 
     elapsed_time = time.time() - start_time
     info(f"Providing {len(results)} releases to {request_from} for {stype}. Time taken: {elapsed_time:.2f} seconds")
 
     return results
+
+
+def _source_call(func, args, kwargs):
+    """Appel différé d'une source ; le jeton d'annulation est fourni au lancement."""
+    return lambda cancel: func(*args, cancel=cancel, **kwargs)
+
+
+def _timed(name, call):
+    """Mesure chaque appel d'une source pour ``source_health``.
+
+    Une source qui finit hors budget (annulée ou non) compte comme un échec, au
+    même titre qu'une exception ou qu'une erreur qu'elle a attrapée elle-même
+    (``outcome.failed``).
+    """
+
+    def run(cancel):
+        started = time.time()
+        ok = False
+        try:
+            result = call(cancel)
+            # rendue trop tard (hors budget) ou en échec
+            ok = not cancel.cancelled and not is_failure(result)
+            return result
+        finally:
+            if cancel.reason != SUPERSEDED:  # écartée, pas en échec
+                source_health.record(name, time.time() - started, ok)
+
+    return run
+
+
+def _zt_fallback_call(shared_state, start_time, request_from, imdb_id, mirror, season, episode):
+    # zt_search est relu dans le module à l'appel : les tests le remplacent.
+    return lambda cancel: zt_search(
+        shared_state, start_time, request_from, imdb_id,
+        mirror=mirror, season=season, episode=episode, cancel=cancel,
+    )
+
+
+def _remember(key, name, generation, cancel):
+    """Callback de future : range la réponse d'une source dans le cache.
+
+    Une source en échec, ou qui finit après l'annulation de sa recherche
+    (budget épuisé), rend une liste partielle : elle n'est pas gardée.
+    """
+
+    def callback(future):
+        if future.cancelled() or future.exception() is not None or cancel.cancelled:
+            return
+        result = future.result()
+        if not is_failure(result):
+            result_cache.store(key, name, result, generation)
+
+    return callback
+
+
+def _refresh_in_background(key, name, func, generation):
+    """Relance une source périmée sans faire attendre le client *arr."""
+    if not result_cache.begin_refresh(key, name):
+        return  # déjà en cours pour cette entrée
+
+    def refresh():
+        try:
+            # Personne n'attend ce rafraîchissement, mais il reste borné par le
+            # même budget qu'une recherche ordinaire.
+            cancel = CancelToken(timeout=SEARCH_BUDGET_SECONDS)
+            result = func(cancel)
+            if is_failure(result) or cancel.cancelled:
+                debug(f"Background refresh of {name} failed: {getattr(result, 'error', 'budget exhausted')}",
+                      source="search")
+                return
+            result_cache.store(key, name, result, generation)
+            debug(f"Refreshed cached releases from {name}", source="search")
+        except Exception as e:
+            debug(f"Background refresh of {name} failed: {e}", source="search")
+        finally:
+            result_cache.end_refresh(key, name)
+
+    search_scheduler.submit(name, refresh, priority=PRIORITY_BACKGROUND)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Cache des résultats de recherche, partagé entre requêtes.
+
+Radarr et Sonarr rejouent sans cesse les mêmes recherches : recherche
+interactive, nouvel essai après un échec de l'indexeur, recherche automatique à
+chaque rafraîchissement. Chaque appel repartait sur tous les sites et pouvait
+consommer tout le budget de 75 s. On garde donc, par source, la dernière liste
+de releases obtenue pour une même demande.
+
+Une entrée a une durée de vie propre à chaque source. Passé ce délai elle est
+dite périmée : on la sert quand même, immédiatement, et la source est relancée
+en arrière-plan pour la prochaine fois (stale-while-revalidate). Au-delà de
+``MAX_STALE_SECONDS`` elle n'est plus servie du tout.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# Durée de fraîcheur par source, en secondes. anime-sama ne publie un épisode
+# qu'une fois et ses episodes.js bougent peu ; les sites de téléchargement
+# ajoutent des releases en continu.
+DEFAULT_TTL_SECONDS = 15 * 60
+SOURCE_TTL_SECONDS = {
+    "am": 60 * 60,
+    "zt": 30 * 60,
+}
+
+# Une entrée périmée depuis plus longtemps n'est plus servie : mieux vaut payer
+# une recherche complète que renvoyer une liste vieille de plusieurs heures.
+MAX_STALE_SECONDS = 6 * 60 * 60
+
+# Borne mémoire : une entrée par (demande, source).
+MAX_ENTRIES = 2000
+
+# Les sources regardent la présence de ces mots dans le User-Agent ; deux
+# versions différentes de Radarr obtiennent donc exactement les mêmes releases.
+_REQUESTER_KINDS = ("radarr", "sonarr", "lazylibrarian", "postman")
+
+
+def requester_kind(request_from):
+    """Famille du client *arr, seule partie du User-Agent qui compte."""
+    lowered = (request_from or "").lower()
+    for kind in _REQUESTER_KINDS:
+        if kind in lowered:
+            return kind
+    return lowered
+
+
+def cache_key(imdb_id, season, episode, request_from, mirror):
+    """Clé d'une demande : (imdb_id, saison, épisode, client, mirror)."""
+    return (
+        imdb_id or "",
+        str(season or ""),
+        str(episode or ""),
+        requester_kind(request_from),
+        (mirror or "").lower(),
+    )
+
+
+class SearchResultCache:
+    """Releases par (demande, source), avec fraîcheur propre à chaque source.
+
+    Thread-safe : lu et écrit depuis les threads de requête Bottle comme depuis
+    les sources qui finissent après le budget.
+    """
+
+    def __init__(self, ttl_seconds=None, max_stale_seconds=MAX_STALE_SECONDS,
+                 max_entries=MAX_ENTRIES):
+        self._ttl_seconds = dict(SOURCE_TTL_SECONDS if ttl_seconds is None else ttl_seconds)
+        self._max_stale_seconds = max_stale_seconds
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "refreshes": 0,
+            "evictions": 0,
+        }
+
+    @property
+    def generation(self):
+        """Change à chaque ``clear()`` : écarte les écritures d'avant la purge."""
+        return self._generation
+
+    def ttl_for(self, source):
+        return self._ttl_seconds.get(source, DEFAULT_TTL_SECONDS)
+
+    def lookup(self, key, source):
+        """Renvoie ``(releases, fresh)`` ou None si rien d'exploitable."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get((key, source))
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            stored_at, releases = entry
+            age = now - stored_at
+            ttl = self.ttl_for(source)
+            if age > ttl + self._max_stale_seconds:
+                del self._entries[(key, source)]
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end((key, source))
+            fresh = age <= ttl
+            self._stats["hits" if fresh else "stale_hits"] += 1
+            return list(releases), fresh
+
+    def store(self, key, source, releases, generation=None):
+        """Mémorise la réponse d'une source (ignorée si le cache a été purgé)."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._entries[(key, source)] = (time.time(), list(releases or []))
+            self._entries.move_to_end((key, source))
+            self._stats["stores"] += 1
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+            return True
+
+    def begin_refresh(self, key, source):
+        """Réserve le rafraîchissement d'une entrée ; False s'il est déjà en cours."""
+        with self._lock:
+            if (key, source) in self._refreshing:
+                return False
+            self._refreshing.add((key, source))
+            self._stats["refreshes"] += 1
+            return True
+
+    def end_refresh(self, key, source):
+        with self._lock:
+            self._refreshing.discard((key, source))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._refreshing.clear()
+            self._generation += 1
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["refreshing"] = len(self._refreshing)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            (stats["hits"] + stats["stale_hits"]) / lookups * 100 if lookups else 0
+        )
+        return stats
+
+
+result_cache = SearchResultCache()
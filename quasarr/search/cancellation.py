@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Annulation coopérative des sources de recherche.
+
+Quand ``SEARCH_BUDGET_SECONDS`` est épuisé, ``get_search_results`` répond au
+client *arr avec ce qu'il a. Les sources encore en cours, elles, continuaient :
+zt paginait et préchargeait des pages de détail pour une réponse que plus
+personne ne lirait, en occupant les créneaux de connexion de la requête
+suivante. Chaque source reçoit donc un ``CancelToken`` (argument ``cancel``)
+qu'elle consulte avant chaque requête HTTP et à chaque tour de pagination.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+# Pas d'attente maximal d'un appel bloqué sur une ressource partagée : borne le
+# délai entre l'annulation et l'abandon effectif.
+POLL_INTERVAL_SECONDS = 0.25
+
+
+# Motif d'annulation d'une source devenue inutile (et non en échec) : le zt
+# spéculatif d'un anime quand anime-sama a trouvé des releases.
+SUPERSEDED = "superseded"
+
+
+class SearchCancelled(Exception):
+    """Levée par une source dont la recherche a été abandonnée."""
+
+
+class CancelToken:
+    """Drapeau d'annulation partagé entre une recherche et ses sources.
+
+    ``timeout`` fixe en plus une échéance au-delà de laquelle le jeton se
+    considère annulé de lui-même (rafraîchissements en arrière-plan).
+    """
+
+    def __init__(self, timeout=None):
+        self._event = threading.Event()
+        self._deadline = time.time() + timeout if timeout is not None else None
+        self.reason = None
+
+    def cancel(self, reason=None):
+        if not self._event.is_set():
+            self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        if self._event.is_set():
+            return True
+        if self._deadline is not None and time.time() >= self._deadline:
+            self._event.set()
+            return True
+        return False
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise SearchCancelled()
+
+    def wait(self, timeout):
+        """Dort ``timeout`` secondes ; renvoie True si annulé entre-temps."""
+        if self._deadline is not None:
+            timeout = min(timeout, max(self._deadline - time.time(), 0))
+        self._event.wait(timeout)
+        return self.cancelled
+
+
+def raise_if_cancelled(cancel):
+    """``cancel.raise_if_cancelled()`` tolérant l'absence de jeton."""
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+
+
+def acquire(lock, cancel):
+    """Prend ``lock`` (verrou ou sémaphore) sans rester sourd à l'annulation."""
+    if cancel is None:
+        lock.acquire()
+        return
+    while not lock.acquire(timeout=POLL_INTERVAL_SECONDS):
+        cancel.raise_if_cancelled()
+    if cancel.cancelled:
+        lock.release()
+        raise SearchCancelled()
+
+
+# Jeton de la recherche en cours sur ce thread, pour les sources dont les
+# helpers ne reçoivent pas le jeton en argument (anime-sama).
+_local = threading.local()
+
+
+@contextmanager
+def bound(cancel):
+    """Rend ``cancel`` visible via ``current()`` le temps du bloc."""
+    previous = getattr(_local, "cancel", None)
+    _local.cancel = cancel
+    try:
+        yield cancel
+    finally:
+        _local.cancel = previous
+
+
+def current():
+    return getattr(_local, "cancel", None)
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Métadonnées extraites des pages de détail, persistées entre recherches.
+
+Sur zt, chaque recherche et chaque flux RSS ouvre des dizaines de pages de
+détail et les ré-analyse entièrement avec BeautifulSoup (année, taille,
+qualité, liens, identité), alors qu'une page publiée ne change presque plus.
+Le résultat de l'analyse est donc gardé, par URL de détail, dans la table
+SQLite ``detail_metadata`` (persistée dans /config) :
+
+* une entrée expire après ``TTL_SECONDS`` ; une page de série, qui s'enrichit
+  à chaque nouvel épisode, après ``SERIES_TTL_SECONDS`` seulement ;
+* chaque entrée porte ``SCHEMA_VERSION`` : si le format de l'analyse change,
+  les anciennes entrées sont simplement ignorées puis effacées ;
+* un cache mémoire borné (``MAX_MEMORY_ENTRIES``) évite de relire la DB pour
+  les pages vues récemment ; sans DB (tests) il fonctionne en mémoire seule.
+
+Le verrou ne protège que ce cache mémoire : les lectures et écritures SQLite
+se font hors verrou, sur une connexion ouverte une fois par thread, et le
+ménage des entrées périmées tourne une fois, en arrière-plan. Une DB occupée
+ne ralentit ainsi que la recherche qui l'attend, pas toutes les autres.
+
+Le contenu de l'entrée (JSON) est fourni par la source : ce module ne connaît
+ni le tuple de zt ni son format.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from quasarr.providers.log import debug
+
+TABLE = "detail_metadata"
+
+SCHEMA_VERSION = 1
+TTL_SECONDS = 7 * 24 * 60 * 60
+SERIES_TTL_SECONDS = 2 * 60 * 60
+MAX_MEMORY_ENTRIES = 2048
+
+_MEMORY = OrderedDict()
+_LOCK = threading.RLock()
+_STATS = {"hits": 0, "misses": 0, "stored": 0}
+
+_LOCAL = threading.local()  # connexion du thread : (génération, shared_state, DB)
+_GENERATION = 0             # incrémentée par invalidate_cache
+_PRUNER = None              # thread de ménage, lancé au premier accès à la DB
+
+
+def _key(source, url):
+    return f"{source}|{url}"
+
+
+def _db(shared_state):
+    """Connexion du thread courant à la table, ouverte au premier appel."""
+    cached = getattr(_LOCAL, "db", None)
+    if cached is not None and cached[0] == _GENERATION and cached[1] is shared_state:
+        return cached[2]
+    try:
+        database = shared_state.get_db(TABLE)
+    except Exception:
+        return None
+    _LOCAL.db = (_GENERATION, shared_state, database)
+    _start_prune(shared_state)
+    return database
+
+
+def _start_prune(shared_state):
+    global _PRUNER
+    with _LOCK:
+        if _PRUNER is not None:
+            return
+        _PRUNER = threading.Thread(target=_prune, args=(shared_state,),
+                                   name="detail-store-prune", daemon=True)
+    _PRUNER.start()
+
+
+def _remember(key, entry):
+    _MEMORY[key] = entry
+    _MEMORY.move_to_end(key)
+    while len(_MEMORY) > MAX_MEMORY_ENTRIES:
+        _MEMORY.popitem(last=False)
+
+
+def _valid(entry, now):
+    return (
+        isinstance(entry, dict)
+        and entry.get("version") == SCHEMA_VERSION
+        and entry.get("expires", 0) > now
+    )
+
+
+def _prune(shared_state):
+    """Efface les entrées expirées ou d'un autre schéma (une fois par processus)."""
+    now = time.time()
+    removed = 0
+    try:
+        database = shared_state.get_db(TABLE)
+        for key, raw in database.retrieve_all_titles() or []:
+            try:
+                entry = json.loads(raw)
+            except Exception:
+                entry = None
+            if not _valid(entry, now):
+                database.delete(key)
+                removed += 1
+    except Exception as e:
+        debug(f"Could not prune detail metadata store: {e}", source="search")
+        return
+    if removed:
+        debug(f"Pruned {removed} stale detail metadata entries", source="search")
+
+
+def get(shared_state, source, url):
+    """Données enregistrées pour cette page de détail, ou ``None``."""
+    key = _key(source, url)
+    now = time.time()
+    with _LOCK:
+        entry = _MEMORY.get(key)
+    if entry is None:
+        database = _db(shared_state)
+        if database is not None:
+            try:
+                raw = database.retrieve(key)
+                entry = json.loads(raw) if raw else None
+            except Exception:
+                entry = None
+    with _LOCK:
+        if _valid(_MEMORY.get(key), now):
+            entry = _MEMORY[key]  # enregistrée pendant la lecture
+        if not _valid(entry, now):
+            _MEMORY.pop(key, None)
+            _STATS["misses"] += 1
+            return None
+        _remember(key, entry)
+        _STATS["hits"] += 1
+        return entry["data"]
+
+
+def put(shared_state, source, url, data, series=False):
+    """Enregistre ``data`` (sérialisable en JSON) pour cette page de détail."""
+    key = _key(source, url)
+    ttl = SERIES_TTL_SECONDS if series else TTL_SECONDS
+    entry = {"version": SCHEMA_VERSION, "expires": time.time() + ttl, "data": data}
+    with _LOCK:
+        _remember(key, entry)
+        _STATS["stored"] += 1
+    database = _db(shared_state)
+    if database is None:
+        return
+    try:
+        database.update_store(key, json.dumps(entry))
+    except Exception as e:
+        debug(f"Could not persist detail metadata for {url}: {e}", source="search")
+
+
+def invalidate_cache():
+    """Vide le cache mémoire (la DB est relue, et rouverte, au prochain accès)."""
+    global _GENERATION, _PRUNER
+    with _LOCK:
+        _MEMORY.clear()
+        _GENERATION += 1
+        _PRUNER = None
+        for name in _STATS:
+            _STATS[name] = 0
+
+
+def stats():
+    with _LOCK:
+        report = dict(_STATS, memory_entries=len(_MEMORY))
+    lookups = report["hits"] + report["misses"]
+    report["hit_rate"] = round(report["hits"] / lookups * 100, 1) if lookups else 0
+    return report
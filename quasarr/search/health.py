@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Santé des sources de recherche : latences, erreurs et disjoncteur.
+
+Un site instable tirait chaque recherche jusqu'au plafond du budget : il ne
+répondait pas, ou en erreur, et on le réinterrogeait pourtant à chaque fois.
+On garde donc pour chaque source une fenêtre glissante de ses derniers appels
+(durée, succès) :
+
+* p50 / p95 et taux d'erreur, visibles dans le tableau de bord de debug ;
+* les sources les plus lentes sont lancées en premier, pour qu'elles
+  disposent du plus de budget ;
+* après ``FAILURE_THRESHOLD`` échecs consécutifs (erreur ou budget dépassé),
+  le disjoncteur s'ouvre et la source est sautée pendant ``COOL_DOWN_SECONDS``.
+  Passé ce délai, un seul appel d'essai est autorisé : s'il réussit la source
+  est rétablie, sinon la pause recommence, deux fois plus longue.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+from quasarr.providers.log import info
+
+WINDOW_SIZE = 50
+FAILURE_THRESHOLD = 3
+COOL_DOWN_SECONDS = 5 * 60
+MAX_COOL_DOWN_SECONDS = 60 * 60
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    # Rang le plus proche : p95 sur 10 appels = le plus lent.
+    index = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+class _SourceState:
+    __slots__ = ("samples", "consecutive_failures", "open_until", "cool_down", "probing",
+                 "short_circuited")
+
+    def __init__(self):
+        self.samples = deque(maxlen=WINDOW_SIZE)
+        self.consecutive_failures = 0
+        self.open_until = 0
+        self.cool_down = COOL_DOWN_SECONDS
+        self.probing = False
+        self.short_circuited = 0
+
+
+class SourceHealth:
+    """Statistiques glissantes et disjoncteur par source (thread-safe)."""
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, cool_down_seconds=COOL_DOWN_SECONDS,
+                 max_cool_down_seconds=MAX_COOL_DOWN_SECONDS):
+        self._failure_threshold = failure_threshold
+        self._cool_down_seconds = cool_down_seconds
+        self._max_cool_down_seconds = max_cool_down_seconds
+        self._sources = {}
+        self._lock = threading.Lock()
+
+    def _state(self, source):
+        state = self._sources.get(source)
+        if state is None:
+            state = self._sources[source] = _SourceState()
+            state.cool_down = self._cool_down_seconds
+        return state
+
+    def allow(self, source):
+        """False tant que le disjoncteur de ``source`` est ouvert."""
+        now = time.time()
+        with self._lock:
+            state = self._state(source)
+            if not state.open_until:
+                return True
+            if now < state.open_until:
+                state.short_circuited += 1
+                return False
+            # Demi-ouvert : un seul appel d'essai. Le disjoncteur reste fermé aux
+            # autres jusqu'à son verdict (ou une nouvelle pause s'il n'en rend pas).
+            state.probing = True
+            state.open_until = now + state.cool_down
+            return True
+
+    def record(self, source, seconds, ok):
+        """Enregistre un appel terminé (``ok=False`` : erreur ou hors budget)."""
+        with self._lock:
+            state = self._state(source)
+            state.samples.append((seconds, ok))
+            if ok:
+                state.consecutive_failures = 0
+                state.open_until = 0
+                state.probing = False
+                state.cool_down = self._cool_down_seconds
+                return
+
+            state.consecutive_failures += 1
+            if state.probing:
+                # L'essai a échoué : nouvelle pause, plus longue.
+                state.cool_down = min(state.cool_down * 2, self._max_cool_down_seconds)
+            elif state.consecutive_failures < self._failure_threshold:
+                return
+            state.probing = False
+            state.open_until = time.time() + state.cool_down
+            cool_down = state.cool_down
+
+        info(f"Circuit open for {source} after repeated failures - "
+             f"skipping it for {cool_down}s", source="search")
+
+    def latency(self, source, fraction):
+        with self._lock:
+            state = self._sources.get(source)
+            values = sorted(s for s, _ in state.samples) if state else []
+        return _percentile(values, fraction)
+
+    def by_slowest_first(self, names):
+        """Trie ``names`` par p95 décroissant ; les sources sans mesure d'abord."""
+        def key(name):
+            p95 = self.latency(name, 0.95)
+            return -(float("inf") if p95 is None else p95)
+
+        return sorted(names, key=key)
+
+    def clear(self):
+        with self._lock:
+            self._sources.clear()
+
+    def stats(self):
+        now = time.time()
+        report = {}
+        with self._lock:
+            for source, state in self._sources.items():
+                latencies = sorted(s for s, _ in state.samples)
+                errors = sum(1 for _, ok in state.samples if not ok)
+                p50 = _percentile(latencies, 0.5)
+                p95 = _percentile(latencies, 0.95)
+                report[source] = {
+                    "calls": len(state.samples),
+                    "p50_seconds": round(p50, 2) if p50 is not None else None,
+                    "p95_seconds": round(p95, 2) if p95 is not None else None,
+                    "error_rate": errors / len(state.samples) * 100 if state.samples else 0,
+                    "consecutive_failures": state.consecutive_failures,
+                    "circuit_open": now < state.open_until,
+                    "open_for_seconds": max(int(state.open_until - now), 0),
+                    "short_circuited": state.short_circuited,
+                }
+        return report
+
+
+source_health = SourceHealth()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Cache négatif : « la source X n'a rien pour tel IMDb-ID / telle saison ».
+
+Une bonne partie des listes « wanted » de Radarr/Sonarr n'existe tout
+simplement pas sur un site donné. Chaque recherche repayait pourtant le
+parcours complet (sur zt : jusqu'à 9 pages × chaque variante de titre ×
+chaque catégorie). On mémorise donc, dans la table SQLite ``search_misses``
+(persistée dans /config), les recherches restées sans résultat, et la source
+est sautée jusqu'à expiration.
+
+La durée double à chaque nouvel échec consécutif (``BASE_TTL_SECONDS``,
+puis ×2, plafonnée à ``MAX_TTL_SECONDS``) : un titre absent depuis des semaines
+n'est plus recherché qu'une fois par semaine, un titre récent est retenté vite.
+Le moindre résultat efface l'entrée.
+
+Seules les recherches sans épisode alimentent le cache (film, ou saison
+entière) : un épisode introuvable ne dit rien du reste de la saison. En
+revanche une saison absente l'est aussi pour chacun de ses épisodes.
+
+Un cache mémoire évite de relire la DB à chaque recherche ; sans DB (tests)
+il fonctionne en mémoire seule.
+"""
+
+import json
+import threading
+import time
+
+from quasarr.providers.log import debug
+
+TABLE = "search_misses"
+
+BASE_TTL_SECONDS = 6 * 60 * 60
+MAX_TTL_SECONDS = 7 * 24 * 60 * 60
+
+_CACHE = None
+_LOCK = threading.RLock()
+
+
+def _key(source, imdb_id, season):
+    return f"{source}|{imdb_id}|{season or ''}"
+
+
+def _db(shared_state):
+    try:
+        return shared_state.get_db(TABLE)
+    except Exception:
+        return None
+
+
+def _load(shared_state):
+    global _CACHE
+    if _CACHE is None:
+        cache = {}
+        database = _db(shared_state)
+        rows = (database.retrieve_all_titles() if database else None) or []
+        for key, raw in rows:
+            try:
+                cache[key] = json.loads(raw)
+            except Exception:
+                continue
+        _CACHE = cache
+    return _CACHE
+
+
+def _persist(shared_state, key, entry):
+    database = _db(shared_state)
+    if database is None:
+        return
+    try:
+        if entry is None:
+            database.delete(key)
+        else:
+            database.update_store(key, json.dumps(entry))
+    except Exception as e:
+        debug(f"Could not persist negative search cache entry {key}: {e}", source="search")
+
+
+def ttl_for(misses):
+    return min(BASE_TTL_SECONDS * 2 ** max(misses - 1, 0), MAX_TTL_SECONDS)
+
+
+def is_known_miss(shared_state, source, imdb_id, season):
+    """Vrai si ``source`` n'a rien renvoyé récemment pour ce titre / cette saison."""
+    if not imdb_id:
+        return False
+    now = time.time()
+    with _LOCK:
+        cache = _load(shared_state)
+        entry = cache.get(_key(source, imdb_id, season))
+        if entry is None and season:
+            # Une série absente du site l'est pour toutes ses saisons.
+            entry = cache.get(_key(source, imdb_id, ""))
+        return bool(entry) and entry.get("expires", 0) > now
+
+
+def record(shared_state, source, imdb_id, season, episode, releases):
+    """Met à jour le cache après une recherche terminée normalement."""
+    if not imdb_id:
+        return
+    key = _key(source, imdb_id, season)
+    with _LOCK:
+        cache = _load(shared_state)
+        if releases:
+            if cache.pop(key, None) is not None:
+                _persist(shared_state, key, None)
+            return
+        if episode:
+            return
+        entry = cache.get(key) or {"misses": 0}
+        entry["misses"] += 1
+        entry["expires"] = time.time() + ttl_for(entry["misses"])
+        cache[key] = entry
+        _persist(shared_state, key, entry)
+    debug(f"{source} has nothing for {imdb_id} season '{season or '-'}' - skipping it for "
+          f"{ttl_for(entry['misses']) // 3600}h", source="search")
+
+
+def purge(shared_state, source=None, imdb_id=None):
+    """Efface les entrées (toutes, ou celles d'une source / d'un IMDb-ID)."""
+    removed = 0
+    with _LOCK:
+        cache = _load(shared_state)
+        for key in list(cache):
+            entry_source, entry_imdb, _season = key.split("|", 2)
+            if source and entry_source != source:
+                continue
+            if imdb_id and entry_imdb != imdb_id:
+                continue
+            del cache[key]
+            _persist(shared_state, key, None)
+            removed += 1
+    return removed
+
+
+def invalidate_cache():
+    global _CACHE
+    with _LOCK:
+        _CACHE = None
+
+
+def stats(shared_state):
+    now = time.time()
+    with _LOCK:
+        cache = _load(shared_state)
+        active = [key for key, entry in cache.items() if entry.get("expires", 0) > now]
+    by_source = {}
+    for key in active:
+        source = key.split("|", 1)[0]
+        by_source[source] = by_source.get(source, 0) + 1
+    return {"entries": len(cache), "active": len(active), "active_by_source": by_source}
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Issue d'un appel de source : recherche aboutie, ou échec.
+
+Les sources attrapent elles-mêmes leurs erreurs réseau et HTTP, les
+journalisent et rendent ce qu'elles ont déjà trouvé — souvent une liste vide.
+Pour ``get_search_results``, cette liste vide ressemblait à « rien sur ce
+site » : un timeout était mémorisé comme absence du titre (cache négatif), mis
+en cache comme réponse, et la source restait saine aux yeux du disjoncteur.
+
+Une source qui a échoué rend donc ``failed(releases, erreur)`` : une liste
+ordinaire (les releases déjà trouvées restent servies au client *arr), que
+``is_failure`` distingue d'une recherche menée à terme.
+"""
+
+
+class SourceFailed(list):
+    """Releases (éventuellement partielles) d'une source en échec."""
+
+    def __init__(self, releases=(), error=None):
+        super().__init__(releases)
+        self.error = error
+
+
+def failed(releases, error):
+    """Marque ``releases`` comme résultat d'une source en échec sur ``error``."""
+    return SourceFailed(releases, error)
+
+
+def is_failure(result):
+    return isinstance(result, SourceFailed)
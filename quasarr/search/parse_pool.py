@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Étape d'analyse HTML dans un pool de processus (optionnelle).
+
+Les recherches tournent sur des threads (``quasarr.search.scheduler``) et leur
+temps CPU est dominé par BeautifulSoup : sous le GIL, les analyses de pages
+listing et de détail s'exécutent l'une après l'autre, quel que soit le nombre
+de cœurs. Avec la clé ``parse_processes`` de la section [Search], ces
+analyses partent dans des processus séparés : le HTML y entre, un
+enregistrement compact (champs extraits) en sort.
+
+* vide ou ``0`` : désactivé, l'analyse reste sur le thread appelant ;
+* ``auto`` : un processus par cœur, moins un ;
+* un entier : ce nombre de processus.
+
+Les fonctions confiées au pool doivent être définies au niveau module et ne
+recevoir que des arguments sérialisables (pas de ``shared_state``). Si le pool
+casse (processus tué, import impossible), l'analyse repasse sur le thread
+appelant sans que la recherche échoue.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from quasarr.providers.log import debug, info
+
+# Modules importés une fois par le serveur de processus, avant de créer les
+# workers : un worker n'a plus à réimporter quasarr à chaque démarrage.
+PRELOAD_MODULES = ["quasarr.search.sources.zt"]
+
+
+def parse_processes(raw):
+    """Valeur de ``parse_processes`` -> nombre de processus (0 : désactivé)."""
+    raw = str(raw or "").strip().lower()
+    if raw == "auto":
+        return max((os.cpu_count() or 1) - 1, 1)
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        return 0
+
+
+def _configured_processes():
+    try:
+        from quasarr.storage.config import Config
+        return parse_processes(Config('Search').get('parse_processes'))
+    except Exception:
+        return 0  # pas de configuration (tests, outils) : désactivé
+
+
+def _context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        # Pas de fork direct : le processus principal a des threads en cours,
+        # un fork pourrait hériter d'un verrou tenu.
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(PRELOAD_MODULES)
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+class ParsePool:
+    """Exécute des fonctions d'analyse dans des processus, ou sur place."""
+
+    def __init__(self, processes=None):
+        self._processes = processes
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats = {"remote": 0, "inline": 0, "failures": 0}
+
+    @property
+    def processes(self):
+        if self._processes is None:
+            self._processes = _configured_processes()
+        return self._processes
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None and self.processes > 0:
+                self._executor = ProcessPoolExecutor(max_workers=self.processes,
+                                                     mp_context=_context())
+                info(f"HTML parsing offloaded to {self.processes} processes")
+            return self._executor
+
+    def run(self, func, *args):
+        """``func(*args)`` dans un processus du pool s'il est actif, sinon sur place."""
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                result = executor.submit(func, *args).result()
+            except BrokenProcessPool as e:
+                debug(f"HTML parse pool unavailable, parsing in-process: {e}")
+                self._count("failures")
+                self.shutdown(processes=0)
+            else:
+                self._count("remote")
+                return result
+        self._count("inline")
+        return func(*args)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def shutdown(self, processes=None):
+        """Arrête les processus ; ``processes`` remplace la configuration."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._processes = processes
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, processes=self._processes or 0,
+                        active=self._executor is not None)
+
+
+parse_pool = ParsePool()
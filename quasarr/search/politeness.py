@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Politesse envers les sites : débit, rafale et concurrence par hostname.
+
+anime-sama payait un sommeil aléatoire de 0,8 à 5 s avant *chaque* requête,
+worker bloqué compris, même quand rien n'avait été demandé depuis des minutes ;
+zt se contentait d'un ``Semaphore(8)``, sans notion de débit. Chaque hostname
+(au sens de la section [Hostnames] : "am", "zt"…) a désormais :
+
+* un seau à jetons : ``rate`` requêtes par seconde en régime établi, jusqu'à
+  ``burst`` d'affilée après une période calme. Une requête dans le budget part
+  immédiatement, les autres attendent juste le temps qu'un jeton revienne ;
+* un plafond de requêtes simultanées (``concurrency``).
+
+Les valeurs par défaut sont dans ``HOST_LIMITS`` ; la clé ``host_rate_limits``
+de la section [Search] les remplace, au format
+``am=0.5/3/2, zt=8/16/8`` (débit/rafale/concurrence).
+
+Les attentes sont interrompues par le jeton d'annulation de la recherche.
+"""
+
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from quasarr.providers.log import debug
+from quasarr.search.cancellation import SearchCancelled, acquire, raise_if_cancelled
+
+HostLimit = namedtuple("HostLimit", ("rate", "burst", "concurrency"))
+
+DEFAULT_LIMIT = HostLimit(rate=4.0, burst=8, concurrency=4)
+HOST_LIMITS = {
+    # anime-sama bloque les rafales : ~1 requête toutes les 2 s, 3 d'avance.
+    "am": HostLimit(rate=0.5, burst=3, concurrency=2),
+    # zt précharge des dizaines de pages de détail par recherche.
+    "zt": HostLimit(rate=8.0, burst=16, concurrency=8),
+}
+
+
+def parse_limits(raw):
+    """``"am=0.5/3/2, zt=8/16/8"`` -> ``{"am": HostLimit(0.5, 3, 2), ...}``.
+
+    Les entrées illisibles sont ignorées.
+    """
+    limits = {}
+    for item in (raw or "").replace(";", ",").split(","):
+        name, _, values = item.partition("=")
+        parts = values.split("/")
+        if not name.strip() or len(parts) != 3:
+            continue
+        try:
+            limit = HostLimit(float(parts[0]), int(parts[1]), int(parts[2]))
+        except ValueError:
+            continue
+        if limit.rate > 0 and limit.burst >= 1 and limit.concurrency >= 1:
+            limits[name.strip().lower()] = limit
+    return limits
+
+
+def _configured_limits():
+    try:
+        from quasarr.storage.config import Config
+        return parse_limits(Config('Search').get('host_rate_limits'))
+    except Exception:
+        return {}  # pas de configuration (tests, outils) : valeurs par défaut
+
+
+class _Bucket:
+    def __init__(self, limit):
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(limit.concurrency)
+        self.in_flight = 0
+        self.requests = 0
+        self.delayed = 0
+        self.waited_seconds = 0.0
+
+    def take(self):
+        """Prend un jeton ; renvoie 0 ou le délai avant le prochain."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.limit.burst, self.tokens + (now - self.updated) * self.limit.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.limit.rate
+
+
+class PolitenessScheduler:
+    """Seaux à jetons et plafonds de concurrence par hostname (thread-safe)."""
+
+    def __init__(self, limits=None, default=DEFAULT_LIMIT):
+        self._limits = limits
+        self._default = default
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def limit_for(self, host):
+        if self._limits is None:
+            self._limits = dict(HOST_LIMITS, **_configured_limits())
+        return self._limits.get(host, self._default)
+
+    def _bucket(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = _Bucket(self.limit_for(host))
+            return bucket
+
+    @contextmanager
+    def slot(self, host, cancel=None):
+        """Réserve un créneau de requête vers ``host`` pour la durée du bloc."""
+        raise_if_cancelled(cancel)
+        bucket = self._bucket(host)
+        acquire(bucket.slots, cancel)
+        started = time.monotonic()
+        try:
+            delay = bucket.take()
+            while delay:
+                if cancel is None:
+                    time.sleep(delay)
+                elif cancel.wait(delay):
+                    raise SearchCancelled()
+                delay = bucket.take()
+            waited = time.monotonic() - started
+            with bucket.lock:
+                bucket.requests += 1
+                bucket.in_flight += 1
+                if waited > 0.01:
+                    bucket.delayed += 1
+                    bucket.waited_seconds += waited
+            if waited > 1:
+                debug(f"{host.upper()} request delayed {waited:.2f}s by its rate limit")
+            try:
+                yield
+            finally:
+                with bucket.lock:
+                    bucket.in_flight -= 1
+        finally:
+            bucket.slots.release()
+
+    def reset(self):
+        """Oublie seaux et configuration (relue au prochain appel)."""
+        with self._lock:
+            self._buckets.clear()
+            self._limits = None
+
+    def stats(self):
+        with self._lock:
+            buckets = list(self._buckets.items())
+        report = {}
+        for host, bucket in buckets:
+            with bucket.lock:
+                report[host] = {
+                    "rate_per_second": bucket.limit.rate,
+                    "burst": bucket.limit.burst,
+                    "concurrency": bucket.limit.concurrency,
+                    "in_flight": bucket.in_flight,
+                    "tokens": round(bucket.tokens, 2),
+                    "requests": bucket.requests,
+                    "delayed": bucket.delayed,
+                    "avg_delay_seconds": (
+                        round(bucket.waited_seconds / bucket.delayed, 2) if bucket.delayed else 0
+                    ),
+                }
+        return report
+
+
+politeness = PolitenessScheduler()
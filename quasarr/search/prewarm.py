@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Préchauffage des recherches pour les listes « wanted » de Radarr/Sonarr.
+
+Une recherche à froid peut consommer tout le budget de 75 s, et Radarr/Sonarr
+coupent à 100 s. Or on sait à l'avance ce qu'ils vont chercher : leurs titres
+manquants. Pendant les périodes creuses, un thread de fond parcourt donc ces
+listes (``arr_client.get_missing_movies`` / ``get_missing_episodes``) et lance
+les mêmes recherches que les clients *arr. Les résultats arrivent dans le cache
+de recherche (et le cache négatif), les métadonnées TMDB dans le leur : la
+requête indexeur qui suit devient un simple hit.
+
+Le préchauffage ne passe jamais devant un vrai client :
+
+* il n'attaque une recherche qu'après ``IDLE_SECONDS`` sans aucune recherche en
+  vol ni tâche sur l'ordonnanceur ;
+* chaque site n'est sollicité qu'une fois par intervalle
+  (``SITE_INTERVAL_SECONDS``, réglable dans la section [Search]) : une
+  recherche touche chaque site au plus une fois, on attend donc l'intervalle
+  du site le plus ménagé entre deux recherches.
+"""
+
+import threading
+import time
+
+from quasarr.providers import arr_client
+from quasarr.providers.imdb_metadata import get_localized_title
+from quasarr.providers.log import info, debug
+from quasarr.search import get_search_results
+from quasarr.search.scheduler import PRIORITY_BACKGROUND, search_scheduler
+from quasarr.search.singleflight import search_flight
+
+# Attente après le démarrage, le temps que Radarr/Sonarr fassent leur propre
+# synchronisation.
+STARTUP_DELAY_SECONDS = 5 * 60
+
+# Un parcours complet au plus par heure.
+CYCLE_SECONDS = 60 * 60
+
+# Plafond par parcours : au-delà, le reste attend le parcours suivant.
+MAX_ITEMS_PER_CYCLE = 500
+
+IDLE_SECONDS = 10
+IDLE_POLL_SECONDS = 1
+
+# Intervalle minimal entre deux recherches de préchauffage pour un site.
+DEFAULT_SITE_INTERVAL_SECONDS = 20
+SITE_INTERVAL_SECONDS = {
+    "zt": 60,
+}
+
+# Les sources ne regardent que la famille du client dans le User-Agent.
+RADARR_REQUESTER = "Radarr (Quasarr prewarm)"
+SONARR_REQUESTER = "Sonarr (Quasarr prewarm)"
+
+
+def site_interval_seconds(shared_state):
+    """Pause (s) entre deux recherches de préchauffage ; None pour le désactiver.
+
+    Vide / invalide -> intervalle du site configuré le plus ménagé. Une valeur
+    négative désactive le préchauffage.
+    """
+    raw = shared_state.values["config"]("Search").get("prewarm_site_interval_seconds")
+    try:
+        interval = float(str(raw).replace(",", ".").strip())
+    except (TypeError, ValueError):
+        hostnames = shared_state.values["config"]("Hostnames")
+        configured = [site for site in SITE_INTERVAL_SECONDS if hostnames.get(site)]
+        return max([DEFAULT_SITE_INTERVAL_SECONDS] + [SITE_INTERVAL_SECONDS[s] for s in configured])
+    if interval < 0:
+        return None
+    return interval
+
+
+def wanted_searches():
+    """Recherches (requester, imdb_id, saison, épisode) que les *arr vont lancer."""
+    searches = []
+    if arr_client.is_configured('Radarr'):
+        try:
+            for movie in arr_client.get_missing_movies():
+                if movie.get('imdb_id'):
+                    searches.append((RADARR_REQUESTER, movie['imdb_id'], "", ""))
+        except arr_client.ArrError as e:
+            debug(f"Prewarm could not read Radarr wanted list: {e}", source="search")
+    if arr_client.is_configured('Sonarr'):
+        try:
+            for episode in arr_client.get_missing_episodes():
+                if episode.get('imdb_id'):
+                    searches.append((SONARR_REQUESTER, episode['imdb_id'],
+                                     str(episode['season']), str(episode['episode'])))
+        except arr_client.ArrError as e:
+            debug(f"Prewarm could not read Sonarr wanted list: {e}", source="search")
+    return searches[:MAX_ITEMS_PER_CYCLE]
+
+
+def is_idle():
+    """Aucune recherche en vol et ordonnanceur au repos."""
+    if search_flight.in_flight():
+        return False
+    stats = search_scheduler.stats()
+    return not stats["busy"] and not stats["queue_depth"]
+
+
+class SearchPrewarmer:
+    """Thread de fond qui préchauffe le cache de recherche."""
+
+    def __init__(self):
+        self.shared_state = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "cycles": 0,
+            "searches": 0,
+            "errors": 0,
+            "pending": 0,
+            "current": None,
+            "last_cycle_started": None,
+            "last_cycle_seconds": None,
+        }
+
+    def start(self, shared_state):
+        if self._thread and self._thread.is_alive():
+            return self
+        self.shared_state = shared_state
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="QuasarrSearchPrewarm", daemon=True)
+        self._thread.start()
+        info("[Prewarm] started")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["running"] = bool(self._thread and self._thread.is_alive())
+        return stats
+
+    def _loop(self):
+        if self._stop.wait(STARTUP_DELAY_SECONDS):
+            return
+        while not self._stop.is_set():
+            started = time.time()
+            interval = site_interval_seconds(self.shared_state)
+            if interval is not None:
+                try:
+                    self.run_cycle(interval)
+                except Exception as e:
+                    debug(f"Prewarm cycle failed: {e}", source="search")
+            self._stop.wait(max(CYCLE_SECONDS - (time.time() - started), 0))
+
+    def run_cycle(self, interval):
+        """Un parcours des listes « wanted » ; rend la main si on l'arrête."""
+        searches = wanted_searches()
+        started = time.time()
+        with self._lock:
+            self._stats["cycles"] += 1
+            self._stats["last_cycle_started"] = int(started)
+            self._stats["pending"] = len(searches)
+        if searches:
+            debug(f"Prewarming {len(searches)} wanted searches", source="search")
+
+        for index, (request_from, imdb_id, season, episode) in enumerate(searches):
+            if not self._wait_idle():
+                return
+            with self._lock:
+                self._stats["current"] = f"{imdb_id} {season}/{episode}".strip(" /")
+                self._stats["pending"] = len(searches) - index - 1
+            try:
+                get_localized_title(self.shared_state, imdb_id, 'fr', True)
+                get_search_results(self.shared_state, request_from, imdb_id=imdb_id,
+                                   season=season, episode=episode, priority=PRIORITY_BACKGROUND)
+                with self._lock:
+                    self._stats["searches"] += 1
+            except Exception as e:
+                debug(f"Prewarm search for {imdb_id} failed: {e}", source="search")
+                with self._lock:
+                    self._stats["errors"] += 1
+            if self._stop.wait(interval):
+                return
+
+        with self._lock:
+            self._stats["current"] = None
+            self._stats["last_cycle_seconds"] = round(time.time() - started, 1)
+
+    def _wait_idle(self):
+        """Attend ``IDLE_SECONDS`` de calme ; False si on l'arrête entre-temps."""
+        quiet_since = None
+        while not self._stop.is_set():
+            if is_idle():
+                quiet_since = quiet_since or time.time()
+                if time.time() - quiet_since >= IDLE_SECONDS:
+                    return True
+            else:
+                quiet_since = None
+            self._stop.wait(IDLE_POLL_SECONDS)
+        return False
+
+
+search_prewarmer = SearchPrewarmer()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Priorité d'une requête de recherche entrante.
+
+Les flux RSS de Radarr/Sonarr, leurs recherches automatiques et la recherche
+interactive d'un humain se disputaient à égalité les workers et les créneaux
+de connexion des sites. On classe donc chaque requête, d'après sa forme et son
+User-Agent :
+
+* flux (ni IMDb-ID ni phrase) : ``PRIORITY_FEED`` ;
+* client autre que Radarr/Sonarr (LazyLibrarian, Postman, navigateur) : un
+  humain ou une application à la demande attend, ``PRIORITY_INTERACTIVE`` ;
+* Radarr/Sonarr : rien dans la requête ne distingue une recherche interactive
+  d'une recherche automatique. Les recherches automatiques arrivent en
+  rafales (« rechercher les manquants », saison épisode par épisode) alors
+  qu'un humain clique une recherche à la fois : au-delà de ``BURST_THRESHOLD``
+  recherches du même client en ``BURST_WINDOW_SECONDS``, la requête est jugée
+  automatique, sinon interactive.
+
+Le préchauffage et les rafraîchissements en arrière-plan passent
+explicitement ``PRIORITY_BACKGROUND``.
+"""
+
+import threading
+import time
+from collections import deque
+
+from quasarr.search.cache import requester_kind
+from quasarr.search.scheduler import (
+    PRIORITY_AUTOMATIC,
+    PRIORITY_FEED,
+    PRIORITY_INTERACTIVE,
+)
+
+BURST_WINDOW_SECONDS = 60
+BURST_THRESHOLD = 3
+
+_ARR_KINDS = ("radarr", "sonarr")
+
+_recent = {}
+_lock = threading.Lock()
+
+
+def _burst(kind, now):
+    """Enregistre une recherche de ``kind`` ; vrai si elle fait partie d'une rafale."""
+    with _lock:
+        history = _recent.setdefault(kind, deque())
+        while history and now - history[0] > BURST_WINDOW_SECONDS:
+            history.popleft()
+        history.append(now)
+        return len(history) > BURST_THRESHOLD
+
+
+def classify(request_from, imdb_id="", search_phrase=""):
+    """Priorité de l'ordonnanceur pour une requête indexeur."""
+    if not imdb_id and not search_phrase:
+        return PRIORITY_FEED
+    kind = requester_kind(request_from)
+    if kind not in _ARR_KINDS:
+        return PRIORITY_INTERACTIVE
+    if _burst(kind, time.time()):
+        return PRIORITY_AUTOMATIC
+    return PRIORITY_INTERACTIVE
+
+
+def reset():
+    with _lock:
+        _recent.clear()
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Pool de workers unique pour toutes les recherches.
+
+Chaque recherche montait son propre ``ThreadPoolExecutor`` sans borne, et zt y
+imbriquait ses pools de flux puis de préchargement des pages de détail. Sous
+une rafale Sonarr + Radarr le nombre de threads explosait. Toutes les tâches de
+recherche passent désormais par un ordonnanceur unique :
+
+* nombre de workers fixe (``SEARCH_WORKERS``) ;
+* quota de tâches simultanées par source (``SOURCE_QUOTAS``), pour qu'une
+  source lente ne monopolise pas les workers ;
+* priorité : une recherche interactive passe devant une recherche
+  automatique, elle-même devant un flux RSS ou un préchauffage ; à priorité
+  égale, chaque recherche est un groupe et les groupes sont servis à tour de
+  rôle ;
+* ``RESERVED_WORKERS`` workers restent hors de portée des tâches de fond (flux,
+  préchauffage, rafraîchissements) : une recherche interactive trouve toujours
+  un worker libre, même en plein crawl RSS.
+* une recherche de fond à laquelle se greffe une recherche plus urgente
+  (single-flight) est remontée à la priorité de celle-ci (``raise_priority``).
+
+Une tâche qui attend ses sous-tâches (``map``, ``join``) exécute elle-même
+celles qui ne sont pas encore parties : un parent ne bloque jamais un worker en
+attendant un enfant resté en file, quel que soit le nombre de workers ou le
+quota.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, wait
+
+from quasarr.providers.log import debug
+
+SEARCH_WORKERS = 24
+
+# Priorités, de la plus urgente à la moins urgente (voir quasarr.search.priority).
+PRIORITY_INTERACTIVE, PRIORITY_AUTOMATIC, PRIORITY_FEED, PRIORITY_BACKGROUND = range(4)
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_AUTOMATIC: "automatic",
+    PRIORITY_FEED: "feed",
+    PRIORITY_BACKGROUND: "background",
+}
+
+# Workers que les tâches de priorité ``PRIORITY_FEED`` ou moindre ne peuvent
+# pas occuper.
+RESERVED_WORKERS = 4
+
+# Tâches simultanées par source sur les workers. zt y compte ses flux de
+# recherche (titre × catégorie) et le préchargement des pages de détail ; les
+# requêtes HTTP restent en plus plafonnées par ``quasarr.search.politeness``.
+DEFAULT_SOURCE_QUOTA = 4
+SOURCE_QUOTAS = {
+    "zt": 16,
+}
+
+# Groupes remontés par ``raise_priority`` dont on garde la trace. Les
+# identifiants ne reviennent jamais : une entrée oubliée ne coûte que sa place.
+MAX_RAISED_GROUPS = 256
+
+_QUEUED, _RUNNING, _DONE = range(3)
+
+
+class _TaskFuture(Future):
+    """Future d'une tâche de l'ordonnanceur : ``join`` retrouve sa tâche."""
+
+    def __init__(self, task):
+        super().__init__()
+        self.task = task
+
+
+class _Task:
+    __slots__ = ("source", "func", "args", "group", "priority", "future", "state", "queued_at")
+
+    def __init__(self, source, func, args, group, priority):
+        self.source = source
+        self.func = func
+        self.args = args
+        self.group = group
+        self.priority = priority
+        self.future = _TaskFuture(self)
+        self.state = _QUEUED
+        self.queued_at = time.time()
+
+
+class SearchScheduler:
+    """Workers fixes, quotas par source, priorités, tourniquet entre groupes."""
+
+    def __init__(self, workers=SEARCH_WORKERS, quotas=None, default_quota=DEFAULT_SOURCE_QUOTA,
+                 reserved_workers=RESERVED_WORKERS):
+        self._workers = workers
+        # Toujours au moins un worker pour les tâches de fond.
+        self._background_workers = max(workers - reserved_workers, 1)
+        self._quotas = dict(SOURCE_QUOTAS if quotas is None else quotas)
+        self._default_quota = default_quota
+        self._cond = threading.Condition()
+        self._groups = OrderedDict()
+        self._running = {}
+        self._busy = 0
+        self._threads = []
+        self._group_ids = itertools.count(1)
+        self._raised = OrderedDict()  # groupe -> priorité plancher
+        self._local = threading.local()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "inline": 0,
+            "cancelled": 0,
+            "max_queue_depth": 0,
+            "total_wait_seconds": 0.0,
+        }
+
+    # -- API -----------------------------------------------------------------
+
+    def new_group(self):
+        """Identifiant d'une recherche, pour l'équité et l'annulation en bloc."""
+        return next(self._group_ids)
+
+    def current_group(self):
+        """Groupe de la tâche en cours sur ce thread (None hors ordonnanceur)."""
+        return getattr(self._local, "group", None)
+
+    def current_priority(self):
+        """Priorité de la tâche en cours sur ce thread (automatique hors ordonnanceur)."""
+        return getattr(self._local, "priority", PRIORITY_AUTOMATIC)
+
+    def quota_for(self, source):
+        return self._quotas.get(source, self._default_quota)
+
+    def submit(self, source, func, *args, group=None, priority=None):
+        """Met ``func(*args)`` en file ; renvoie un ``concurrent.futures.Future``.
+
+        Sans ``priority``, la tâche hérite de celle de la tâche appelante.
+        """
+        if group is None:
+            group = self.current_group() or self.new_group()
+        if priority is None:
+            priority = self.current_priority()
+        with self._cond:
+            task = _Task(source, func, args, group, min(priority, self._raised.get(group, priority)))
+            self._ensure_workers()
+            self._groups.setdefault(group, deque()).append(task)
+            self._stats["submitted"] += 1
+            depth = self._queue_depth()
+            if depth > self._stats["max_queue_depth"]:
+                self._stats["max_queue_depth"] = depth
+            self._cond.notify()
+        return task.future
+
+    def map(self, source, func, items):
+        """Équivalent de ``list(pool.map(func, items))`` sur l'ordonnanceur.
+
+        L'ordre des résultats est celui de ``items``. L'appelant exécute
+        lui-même les éléments que les workers n'ont pas encore pris.
+        """
+        group = self.current_group() or self.new_group()
+        priority = self.current_priority()
+        items = list(items)
+        if not items:
+            return []
+
+        with self._cond:
+            priority = min(priority, self._raised.get(group, priority))
+            tasks = [_Task(source, func, (item,), group, priority) for item in items]
+            self._ensure_workers()
+            queue = self._groups.setdefault(group, deque())
+            queue.extend(tasks)
+            self._stats["submitted"] += len(tasks)
+            depth = self._queue_depth()
+            if depth > self._stats["max_queue_depth"]:
+                self._stats["max_queue_depth"] = depth
+            self._cond.notify_all()
+
+        for task in tasks:
+            if self._claim(task):
+                self._execute(task, inline=True)
+        wait([task.future for task in tasks])
+        return [task.future.result() for task in tasks]
+
+    def join(self, future):
+        """Résultat d'un ``submit`` ; l'exécute sur place s'il n'est pas encore parti.
+
+        Comme ``map`` : une tâche qui attend l'une de ses sous-tâches ne bloque
+        pas son worker tant que celle-ci dort en file.
+        """
+        task = getattr(future, "task", None)
+        if task is not None and self._claim(task):
+            self._execute(task, inline=True)
+        return future.result()
+
+    def raise_priority(self, group, priority):
+        """Remonte le groupe à ``priority`` : ses tâches en file et ses tâches à venir.
+
+        Les tâches déjà en cours gardent leur priorité, mais les sous-tâches
+        qu'elles soumettent ensuite (dans le même groupe) prennent la nouvelle.
+        """
+        raised = 0
+        with self._cond:
+            if priority >= self._raised.get(group, PRIORITY_BACKGROUND + 1):
+                return 0
+            self._raised[group] = priority
+            self._raised.move_to_end(group)
+            while len(self._raised) > MAX_RAISED_GROUPS:
+                self._raised.popitem(last=False)
+            for task in self._groups.get(group, ()):
+                if task.priority > priority:
+                    task.priority = priority
+                    raised += 1
+            self._cond.notify_all()
+        debug(f"Raised search group {group} to {PRIORITY_NAMES.get(priority, priority)} priority "
+              f"({raised} queued tasks)", source="search")
+        return raised
+
+    def cancel_group(self, group):
+        """Annule les tâches du groupe encore en file (celles en cours continuent)."""
+        cancelled = 0
+        with self._cond:
+            queue = self._groups.pop(group, None) or ()
+            for task in queue:
+                if task.future.cancel():
+                    task.state = _DONE
+                    cancelled += 1
+            self._stats["cancelled"] += cancelled
+        if cancelled:
+            debug(f"Dropped {cancelled} queued search tasks", source="search")
+        return cancelled
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            queued_by_source = {}
+            queued_by_priority = {}
+            for queue in self._groups.values():
+                for task in queue:
+                    queued_by_source[task.source] = queued_by_source.get(task.source, 0) + 1
+                    name = PRIORITY_NAMES.get(task.priority, str(task.priority))
+                    queued_by_priority[name] = queued_by_priority.get(name, 0) + 1
+            stats.update({
+                "workers": self._workers,
+                "busy": self._busy,
+                "queue_depth": self._queue_depth(),
+                "groups": len(self._groups),
+                "queued_by_source": queued_by_source,
+                "queued_by_priority": queued_by_priority,
+                "running_by_source": {k: v for k, v in self._running.items() if v},
+            })
+        started = stats["completed"] - stats["inline"]
+        stats["utilization"] = stats["busy"] / self._workers * 100 if self._workers else 0
+        stats["avg_wait_seconds"] = (
+            round(stats.pop("total_wait_seconds") / started, 3) if started > 0 else 0
+        )
+        return stats
+
+    # -- interne -------------------------------------------------------------
+
+    def _ensure_workers(self):
+        while len(self._threads) < self._workers:
+            thread = threading.Thread(
+                target=self._worker,
+                name=f"search-worker-{len(self._threads) + 1}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _queue_depth(self):
+        return sum(len(queue) for queue in self._groups.values())
+
+    def _eligible(self, task):
+        if self._running.get(task.source, 0) >= self.quota_for(task.source):
+            return False
+        return task.priority < PRIORITY_FEED or self._busy < self._background_workers
+
+    def _next_task_locked(self):
+        # La tâche éligible (source sous son quota, worker disponible pour sa
+        # priorité) la plus prioritaire part. À priorité égale, tourniquet : le
+        # premier groupe dans l'ordre est servi, puis passe en fin de file.
+        best = None
+        for group, queue in self._groups.items():
+            for task in queue:
+                if self._eligible(task):
+                    if best is None or task.priority < best.priority:
+                        best = task
+                    break
+            if best is not None and best.priority == PRIORITY_INTERACTIVE:
+                break
+        if best is None:
+            return None
+        queue = self._groups[best.group]
+        queue.remove(best)
+        if queue:
+            self._groups.move_to_end(best.group)
+        else:
+            del self._groups[best.group]
+        return best
+
+    def _claim(self, task):
+        """Retire ``task`` de la file pour l'exécuter sur le thread appelant."""
+        with self._cond:
+            if task.state != _QUEUED:
+                return False
+            queue = self._groups.get(task.group)
+            if queue is not None:
+                queue.remove(task)
+                if not queue:
+                    del self._groups[task.group]
+            task.state = _RUNNING
+            return True
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                task = self._next_task_locked()
+                while task is None:
+                    self._cond.wait()
+                    task = self._next_task_locked()
+                task.state = _RUNNING
+                self._running[task.source] = self._running.get(task.source, 0) + 1
+                self._busy += 1
+                self._stats["total_wait_seconds"] += time.time() - task.queued_at
+            try:
+                self._execute(task)
+            finally:
+                with self._cond:
+                    self._running[task.source] -= 1
+                    self._busy -= 1
+                    # Un créneau de quota s'est libéré : une tâche écartée peut
+                    # maintenant partir.
+                    self._cond.notify_all()
+
+    def _execute(self, task, inline=False):
+        if not task.future.set_running_or_notify_cancel():
+            task.state = _DONE
+            return
+        previous = getattr(self._local, "group", None), self.current_priority()
+        self._local.group, self._local.priority = task.group, task.priority
+        try:
+            task.future.set_result(task.func(*task.args))
+        except BaseException as e:
+            task.future.set_exception(e)
+        finally:
+            self._local.group, self._local.priority = previous
+            task.state = _DONE
+            with self._cond:
+                self._stats["completed"] += 1
+                if inline:
+                    self._stats["inline"] += 1
+
+
+search_scheduler = SearchScheduler()
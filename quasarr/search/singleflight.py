@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Quasarr
+# Project by https://github.com/rix1337
+
+"""Fusion des recherches identiques lancées en même temps (single-flight).
+
+Une recherche de saison dans Sonarr envoie une rafale de ``tvsearch`` presque
+simultanés, dont plusieurs strictement identiques. Sans fusion, chacun montait
+son propre pool de threads et interrogeait ZT, anime-sama et TMDB de son côté.
+Ici, le premier appel calcule ; les suivants, tant qu'il n'a pas fini,
+attendent son résultat et en reçoivent une copie.
+
+Le premier appel fixe les conditions du calcul, dont sa priorité : un appel
+qui se greffe en est prévenu (``on_join``) pour pouvoir la remonter — une
+recherche interactive ne doit pas attendre au rang d'un préchauffage.
+"""
+
+import threading
+
+from quasarr.providers.log import debug
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters", "context")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+        self.context = None
+
+
+class SingleFlight:
+    """Un seul calcul en vol par clé ; les appels concurrents le partagent."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {"leaders": 0, "coalesced": 0}
+
+    def do(self, key, func, context=None, on_join=None):
+        """Résultat de ``func()``, calculé une seule fois pour les appels simultanés.
+
+        Un appel qui se greffe sur un calcul en vol appelle ``on_join`` avec le
+        ``context`` du premier appel avant d'attendre.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                call.context = context
+                self._stats["leaders"] += 1
+            else:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            debug(f"Joining in-flight search {key}", source="search")
+            if on_join is not None:
+                on_join(call.context)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return list(call.result)
+
+        try:
+            call.result = func()
+            return list(call.result)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
+
+
+search_flight = SingleFlight()
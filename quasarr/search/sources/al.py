@@ -9,13 +9,14 @@ from datetime import datetime, timedelta
 from html import unescape
 from urllib.parse import urljoin, quote_plus
 
-from bs4 import BeautifulSoup
-
 from quasarr.downloads.sources.al import (guess_title,
                                           parse_info_from_feed_entry, parse_info_from_download_item)
+from quasarr.providers import html_parser
 from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import info, debug
 from quasarr.providers.sessions.al import invalidate_session, fetch_via_requests_session
+from quasarr.search.cancellation import raise_if_cancelled
+from quasarr.search.outcome import failed
 
 hostname = "al"
 supported_mirrors = ["rapidgator", "ddownload"]
@@ -120,7 +121,7 @@ def get_release_id(tag):
     return 0
 
 
-def al_feed(shared_state, start_time, request_from, mirror=None):
+def al_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     releases = []
     host = shared_state.values["config"]("Hostnames").get(hostname)
 
@@ -143,9 +144,9 @@ def al_feed(shared_state, start_time, request_from, mirror=None):
     except Exception as e:
         info(f"{hostname}: could not fetch feed: {e}")
         invalidate_session(shared_state)
-        return releases
+        return failed(releases, e)
 
-    soup = BeautifulSoup(r.content, 'html.parser')
+    soup = html_parser.parse(r.content)
 
     # 1) New “Releases”
     release_rows = soup.select("#releases_updates_list table tbody tr")
@@ -246,7 +247,7 @@ def extract_season(title: str) -> int | None:
 
 
 def al_search(shared_state, start_time, request_from, search_string,
-              mirror=None, season=None, episode=None):
+              mirror=None, season=None, episode=None, cancel=None):
     releases = []
     host = shared_state.values["config"]("Hostnames").get(hostname)
 
@@ -282,7 +283,7 @@ def al_search(shared_state, start_time, request_from, search_string,
     except Exception as e:
         info(f"{hostname}: search load error: {e}")
         invalidate_session(shared_state)
-        return releases
+        return failed(releases, e)
 
     if r.history:
         # If just one valid search result exists, AL skips the search result page
@@ -292,14 +293,14 @@ def al_search(shared_state, start_time, request_from, search_string,
         debug(f"{search_string} redirected to {absolute_redirect_url} instead of search results page")
 
         try:
-            soup = BeautifulSoup(r.text, "html.parser")
+            soup = html_parser.parse(r.text)
             page_title = soup.title.string
         except:
             page_title = ""
 
         results = [{"url": absolute_redirect_url, "title": page_title}]
     else:
-        soup = BeautifulSoup(r.text, 'html.parser')
+        soup = html_parser.parse(r.text)
         results = []
 
         for panel in soup.select('div.panel.panel-default'):
@@ -336,6 +337,7 @@ def al_search(shared_state, start_time, request_from, search_string,
             results.append({"url": url, "title": name})
 
     for result in results:
+        raise_if_cancelled(cancel)
         try:
             url = result["url"]
             title = result.get("title") or ""
@@ -358,7 +360,7 @@ def al_search(shared_state, start_time, request_from, search_string,
             recently_searched[url] = entry
             shared_state.update(context, recently_searched)
 
-            content = BeautifulSoup(data_html, "html.parser")
+            content = html_parser.parse(data_html)
 
             # Find each download‐table and process it
             release_id = 0
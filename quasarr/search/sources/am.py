@@ -17,7 +17,6 @@ Les releases produites ici sont téléchargées via yt-dlp (voir
 """
 
 import html
-import random
 import re
 import threading
 import time
@@ -26,8 +25,8 @@ from base64 import urlsafe_b64encode
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
-import requests
-
+from quasarr.providers import host_redirects, http_client
+from quasarr.providers.http_cache import http_cache
 from quasarr.providers.imdb_metadata import (
     get_localized_title,
     get_romaji_title,
@@ -41,6 +40,9 @@ from quasarr.providers.tvdb_metadata import (
 )
 from quasarr.providers.players import register_player, is_player_enabled
 from quasarr.providers.log import info, debug, error, log_event
+from quasarr.search import cancellation
+from quasarr.search.outcome import failed
+from quasarr.search.politeness import politeness
 
 hostname = "am"
 
@@ -67,20 +69,57 @@ FILM_SIZE_MB = 1500
 # La langue est préfixée dynamiquement selon le résultat (VOSTFR / FRENCH).
 RELEASE_QUALITY = "1080p.WEB.x264-ANIMESAMA"
 
-# Jitter anti-blocage appliqué avant chaque chargement HTTP anime-sama. Les
-# requêtes restent indépendantes : une recherche peut continuer pendant que le
-# worker yt-dlp télécharge un autre épisode.
-MIN_REQUEST_DELAY = 0.8
-MAX_REQUEST_DELAY = 5.0
-
 _NUM_RE = re.compile(r"(\d+)")
 
 
 def _am_request(method, url, **kwargs):
-    delay = random.uniform(MIN_REQUEST_DELAY, MAX_REQUEST_DELAY)
-    debug(f"{hostname.upper()} waiting {delay:.2f}s before loading {url}")
-    time.sleep(delay)
-    return requests.request(method, url, **kwargs)
+    # Anti-blocage : débit, rafale et concurrence de l'hostname "am" sont
+    # réglés dans ``quasarr.search.politeness``. Une requête dans le budget part
+    # tout de suite ; les autres attendent qu'un jeton revienne. Les requêtes
+    # restent indépendantes : une recherche peut continuer pendant que le worker
+    # yt-dlp télécharge un autre épisode.
+    # Les helpers ne reçoivent pas le jeton d'annulation : am_search le lie au
+    # thread courant. Une recherche abandonnée cesse aussi d'attendre.
+    # Les GET passent par le cache HTTP sur disque (episodes.js, catalogue).
+    # Une URL sur un domaine quitté est réécrite avant l'envoi, et encore après
+    # l'attente du créneau (``host_redirects``).
+    cancel = cancellation.current()
+    url = host_redirects.resolve(hostname, url)
+
+    def fetch(url, **kwargs):
+        with politeness.slot(hostname, cancel):
+            return http_client.request(method, host_redirects.resolve(hostname, url), **kwargs)
+
+    try:
+        if method.upper() == "GET":
+            response = http_cache.get(url, fetch, **kwargs)
+        else:
+            response = fetch(url, **kwargs)
+    except cancellation.SearchCancelled:
+        raise
+    except Exception as exc:
+        _note_request_error(exc)
+        raise
+    _note_server_error(response, url)
+    return response
+
+
+# Erreurs réseau / HTTP 5xx de la recherche en cours sur ce thread. Les helpers
+# les journalisent et poursuivent (un slug introuvable, un dossier vide) :
+# am_search les rapporte, pour que l'échec ne passe pas pour une absence.
+_request_errors = threading.local()
+
+
+def _note_request_error(exc):
+    errors = getattr(_request_errors, "errors", None)
+    if errors is not None:
+        errors.append(exc)
+
+
+def _note_server_error(response, url):
+    errors = getattr(_request_errors, "errors", None)
+    if errors is not None and response.status_code >= 500:
+        errors.append(RuntimeError(f"HTTP {response.status_code} for {url}"))
 
 
 def _user_agent(shared_state):
@@ -166,8 +205,11 @@ def _update_hostname(shared_state, current_host, final_url):
     except Exception:
         return current_host
     if final_host and current_host and final_host != current_host:
-        info(f"{hostname.upper()} redirect detected. Updating hostname to '{final_host}'.")
-        shared_state.values["config"]("Hostnames").save(hostname.lower(), final_host)
+        # Une seule fois par migration, même si des requêtes concurrentes
+        # ont suivi la même redirection (cf. ``host_redirects.learn``).
+        if host_redirects.learn(hostname, current_host, final_host):
+            info(f"{hostname.upper()} redirect detected. Updating hostname to '{final_host}'.")
+            shared_state.values["config"]("Hostnames").save(hostname.lower(), final_host)
         return final_host
     return current_host
 
@@ -388,6 +430,35 @@ def _resolve_slug(shared_state, am, names, headers):
     return None, None, am
 
 
+# Même principe pour la résolution du slug (pages catalogue / recherche
+# interne) : identique pour tous les épisodes d'une série. Clé = imdb_id.
+_SLUG_CACHE = {}
+_SLUG_CACHE_LOCK = threading.Lock()
+_SLUG_CACHE_TTL = 30 * 60
+
+
+def _resolve_slug_cached(shared_state, am, imdb_id, names, headers):
+    """``_resolve_slug`` avec cache mémoire (voir ``_SLUG_CACHE``)."""
+    now = time.time()
+    with _SLUG_CACHE_LOCK:
+        hit = _SLUG_CACHE.get(imdb_id)
+        if hit and hit[0] > now:
+            return hit[1]
+    result = _resolve_slug(shared_state, am, names, headers)
+    if result[0]:
+        with _SLUG_CACHE_LOCK:
+            _SLUG_CACHE[imdb_id] = (now + _SLUG_CACHE_TTL, result)
+    return result
+
+
+def clear_caches():
+    """Vide les caches mémoire (slugs, dossiers d'épisodes)."""
+    with _SLUG_CACHE_LOCK:
+        _SLUG_CACHE.clear()
+    with _EPISODES_CACHE_LOCK:
+        _EPISODES_CACHE.clear()
+
+
 def _season_path_for_language(declarations, is_movie, season_num, lang):
     """Chemin anime-sama pour une langue donnée, ou None si absent."""
     matching = [path for _label, path in declarations
@@ -623,7 +694,7 @@ def _find_overflow_episode_source(shared_state, imdb_id, season_num, episode_num
         if path == selected_path:
             eps_map, episode_indices = selected_eps, selected_indices
         else:
-            eps_map, episode_indices, current_am = _fetch_episodes(
+            eps_map, episode_indices, current_am = _fetch_episodes_cached(
                 shared_state, current_am, slug, path, headers
             )
         count = len(episode_indices)
@@ -655,7 +726,7 @@ def _subsequent_part_episodes(shared_state, declarations, language, after_path,
     flat = []
     current_am = am
     for path in paths[start + 1:]:
-        eps_map, episode_indices, current_am = _fetch_episodes(
+        eps_map, episode_indices, current_am = _fetch_episodes_cached(
             shared_state, current_am, slug, path, headers
         )
         if not eps_map or not episode_indices:
@@ -668,8 +739,9 @@ def _subsequent_part_episodes(shared_state, declarations, language, after_path,
 
 
 # Cache mémoire court des dossiers anime-sama : le regroupement absolu relit
-# plusieurs fois les mêmes dossiers (contrôle de total + parcours), et chaque
-# lecture est jitterée. Clé = (slug, path).
+# plusieurs fois les mêmes dossiers (contrôle de total + parcours), Sonarr
+# cherche ensuite les épisodes d'une saison un par un, et chaque lecture est
+# jitterée. Clé = (slug, path).
 _EPISODES_CACHE = {}
 _EPISODES_CACHE_LOCK = threading.Lock()
 _EPISODES_CACHE_TTL = 10 * 60
@@ -1033,7 +1105,21 @@ def _emit_located_releases(shared_state, located, slug, season_for_tag, names, y
 
 
 def am_search(shared_state, start_time, request_from, search_string,
-              mirror=None, season=None, episode=None):
+              mirror=None, season=None, episode=None, cancel=None):
+    errors = _request_errors.errors = []
+    try:
+        with cancellation.bound(cancel):
+            releases = _am_search(shared_state, start_time, request_from, search_string,
+                                  mirror=mirror, season=season, episode=episode)
+    finally:
+        _request_errors.errors = None
+    if errors:
+        return failed(releases, errors[0])
+    return releases
+
+
+def _am_search(shared_state, start_time, request_from, search_string,
+               mirror=None, season=None, episode=None):
     releases = []
     request_lower = (request_from or "").lower()
     is_movie = "radarr" in request_lower
@@ -1047,7 +1133,7 @@ def am_search(shared_state, start_time, request_from, search_string,
         debug(f"{hostname.upper()} only supports IMDb-ID searches.")
         return releases
 
-    am = shared_state.values["config"]("Hostnames").get(hostname)
+    am = host_redirects.resolve_host(hostname, shared_state.values["config"]("Hostnames").get(hostname))
     if not am:
         info(f"{hostname.upper()} host missing in configuration. Search aborted.")
         return releases
@@ -1067,7 +1153,7 @@ def am_search(shared_state, start_time, request_from, search_string,
     # une autre série (cf. get_year / _release_title).
     year = get_year(shared_state, imdb_id)
 
-    slug, declarations, am = _resolve_slug(shared_state, am, names, headers)
+    slug, declarations, am = _resolve_slug_cached(shared_state, am, imdb_id, names, headers)
     if not slug:
         debug(f"{hostname.upper()} no anime-sama entry found for {names!r}.")
         return releases
@@ -1096,7 +1182,7 @@ def am_search(shared_state, start_time, request_from, search_string,
     # absolu et de base au film / au repli saison-relatif. Sinon on part à vide.
     if season_path:
         debug(f"{hostname.upper()} using {season_path} (lang={language}) for {slug}")
-        eps_map, episode_indices, am = _fetch_episodes(
+        eps_map, episode_indices, am = _fetch_episodes_cached(
             shared_state, am, slug, season_path, headers
         )
         if not eps_map:
@@ -1176,6 +1262,6 @@ def am_search(shared_state, start_time, request_from, search_string,
     return releases
 
 
-def am_feed(shared_state, start_time, request_from, mirror=None):
+def am_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     # anime-sama n'expose pas de flux exploitable façon RSS ; rien à renvoyer.
     return []
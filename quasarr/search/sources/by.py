@@ -9,11 +9,10 @@ from base64 import urlsafe_b64encode
 from datetime import datetime
 from urllib.parse import quote_plus
 
-import requests
-from bs4 import BeautifulSoup
-
+from quasarr.providers import html_parser, http_client
 from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import info, debug
+from quasarr.search.outcome import failed
 
 hostname = "by"
 supported_mirrors = ["rapidgator", "ddownload", "nitroflare"]
@@ -62,6 +61,8 @@ def _parse_posts(soup, shared_state, base_url, password, mirror_filter,
                 if tr.find('p', class_='TITLE') and tr.find('p', class_='TITLE').find('a', href=True)
             ]
 
+    validator = shared_state.release_validator(request_from, search_string, season, episode) if is_search else None
+
     for entry in items:
         if entry.find('table'):
             continue  # Skip header rows
@@ -109,7 +110,7 @@ def _parse_posts(soup, shared_state, base_url, password, mirror_filter,
                     if not (RESOLUTION_REGEX.search(title) or CODEC_REGEX.search(title)):
                         continue
 
-                valid, _reject_reason = shared_state.is_valid_release(title, request_from, search_string, season, episode)
+                valid, _reject_reason = validator.validate(title)
                 if not valid:
                     continue
                 if XXX_REGEX.search(title) and 'xxx' not in search_string.lower():
@@ -148,7 +149,7 @@ def _parse_posts(soup, shared_state, base_url, password, mirror_filter,
     return releases
 
 
-def by_feed(shared_state, start_time, request_from, mirror=None):
+def by_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     by = shared_state.values['config']('Hostnames').get(hostname)
     password = by
 
@@ -163,17 +164,19 @@ def by_feed(shared_state, start_time, request_from, mirror=None):
     url = f"{base_url}/{feed_type}"
     headers = {'User-Agent': shared_state.values['user_agent']}
     try:
-        html_doc = requests.get(url, headers=headers, timeout=10).content
-        soup = BeautifulSoup(html_doc, 'html.parser')
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        html_doc = response.content
+        soup = html_parser.parse(html_doc)
         releases = _parse_posts(soup, shared_state, base_url, password, request_from=request_from, mirror_filter=mirror)
     except Exception as e:
         info(f"Error loading {hostname.upper()} feed: {e}")
-        releases = []
+        releases = failed([], e)
     debug(f"Time taken: {time.time() - start_time:.2f}s ({hostname})")
     return releases
 
 
-def by_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None):
+def by_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None, cancel=None):
     by = shared_state.values['config']('Hostnames').get(hostname)
     password = by
 
@@ -190,8 +193,10 @@ def by_search(shared_state, start_time, request_from, search_string, mirror=None
     url = f"{base_url}/?q={q}"
     headers = {'User-Agent': shared_state.values['user_agent']}
     try:
-        html_doc = requests.get(url, headers=headers, timeout=10).content
-        soup = BeautifulSoup(html_doc, 'html.parser')
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        html_doc = response.content
+        soup = html_parser.parse(html_doc)
         releases = _parse_posts(
             soup, shared_state, base_url, password, mirror_filter=mirror,
             is_search=True, request_from=request_from,
@@ -199,6 +204,6 @@ def by_search(shared_state, start_time, request_from, search_string, mirror=None
         )
     except Exception as e:
         info(f"Error loading {hostname.upper()} search: {e}")
-        releases = []
+        releases = failed([], e)
     debug(f"Time taken: {time.time() - start_time:.2f}s ({hostname})")
     return releases
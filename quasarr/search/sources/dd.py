@@ -10,6 +10,8 @@ from datetime import datetime, timezone
 from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import info, debug
 from quasarr.providers.sessions.dd import create_and_persist_session, retrieve_and_validate_session
+from quasarr.search.cancellation import SearchCancelled, raise_if_cancelled
+from quasarr.search.outcome import failed
 
 hostname = "dd"
 supported_mirrors = ["ironfiles", "rapidgator", "filefactory"]
@@ -30,7 +32,7 @@ def dd_feed(*args, **kwargs):
     return dd_search(*args, **kwargs)
 
 
-def dd_search(shared_state, start_time, request_from, search_string="", mirror=None, season=None, episode=None):
+def dd_search(shared_state, start_time, request_from, search_string="", mirror=None, season=None, episode=None, cancel=None):
     releases = []
     dd = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = dd
@@ -42,7 +44,7 @@ def dd_search(shared_state, start_time, request_from, search_string="", mirror=N
     dd_session = retrieve_and_validate_session(shared_state)
     if not dd_session:
         info(f"Could not retrieve valid session for {dd}")
-        return releases
+        return failed(releases, "no valid session")
 
     if mirror and mirror not in supported_mirrors:
         debug(f'Mirror "{mirror}" not supported by "{hostname.upper()}". Supported mirrors: {supported_mirrors}.'
@@ -76,6 +78,7 @@ def dd_search(shared_state, start_time, request_from, search_string="", mirror=N
     try:
         release_list = []
         for page in range(0, 100, 20):
+            raise_if_cancelled(cancel)
             qualities_str = ",".join(qualities)
             url = f'https://{dd}/index/search/keyword/{search_string}/qualities/{qualities_str}/from/{page}/search'
 
@@ -83,6 +86,7 @@ def dd_search(shared_state, start_time, request_from, search_string="", mirror=N
             if releases_on_page:
                 release_list.extend(releases_on_page)
 
+        validator = shared_state.release_validator(request_from, search_string, season, episode)
         for release in release_list:
             try:
                 if release.get("fake"):
@@ -93,11 +97,7 @@ def dd_search(shared_state, start_time, request_from, search_string="", mirror=N
                 else:
                     title = release.get("release")
 
-                    valid, _reject_reason = shared_state.is_valid_release(title,
-                                                                        request_from,
-                                                                        search_string,
-                                                                        season,
-                                                                        episode)
+                    valid, _reject_reason = validator.validate(title)
                     if not valid:
                         continue
 
@@ -128,8 +128,11 @@ def dd_search(shared_state, start_time, request_from, search_string="", mirror=N
                 info(f"Error parsing {hostname.upper()} feed: {e}")
                 continue
 
+    except SearchCancelled:
+        raise
     except Exception as e:
         info(f"Error loading {hostname.upper()} feed: {e}")
+        releases = failed(releases, e)
 
     elapsed_time = time.time() - start_time
     debug(f"Time taken: {elapsed_time:.2f}s ({hostname})")
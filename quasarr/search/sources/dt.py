@@ -10,11 +10,10 @@ from base64 import urlsafe_b64encode
 from datetime import timezone, timedelta
 from urllib.parse import quote_plus
 
-import requests
-from bs4 import BeautifulSoup
-
+from quasarr.providers import html_parser, http_client
 from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import info, debug
+from quasarr.search.outcome import failed
 
 hostname = "dt"
 supported_mirrors = ["rapidgator", "nitroflare", "ddownload"]
@@ -55,7 +54,7 @@ def parse_published_datetime(article):
     return dt.isoformat()
 
 
-def dt_feed(shared_state, start_time, request_from, mirror=None):
+def dt_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     releases = []
     dt = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = dt
@@ -75,8 +74,10 @@ def dt_feed(shared_state, start_time, request_from, mirror=None):
     headers = {'User-Agent': shared_state.values["user_agent"]}
 
     try:
-        resp = requests.get(url, headers=headers, timeout=10).content
-        feed = BeautifulSoup(resp, "html.parser")
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        resp = response.content
+        feed = html_parser.parse(resp)
 
         for article in feed.find_all('article'):
             try:
@@ -135,13 +136,14 @@ def dt_feed(shared_state, start_time, request_from, mirror=None):
 
     except Exception as e:
         info(f"Error loading {hostname.upper()} feed: {e}")
+        releases = failed(releases, e)
 
     elapsed = time.time() - start_time
     debug(f"Time taken: {elapsed:.2f}s ({hostname})")
     return releases
 
 
-def dt_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None):
+def dt_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None, cancel=None):
     releases = []
     dt = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = dt
@@ -188,9 +190,12 @@ def dt_search(shared_state, start_time, request_from, search_string, mirror=None
         )
         headers = {"User-Agent": shared_state.values["user_agent"]}
 
-        resp = requests.get(url, headers=headers, timeout=10).content
-        page = BeautifulSoup(resp, "html.parser")
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        resp = response.content
+        page = html_parser.parse(resp)
 
+        validator = shared_state.release_validator(request_from, search_string, season, episode)
         for article in page.find_all("article"):
             try:
                 link_tag = article.select_one("h4.font-weight-bold a")
@@ -206,11 +211,7 @@ def dt_search(shared_state, start_time, request_from, search_string, mirror=None
                          replace(')', '')
                          )
 
-                valid, _reject_reason = shared_state.is_valid_release(title,
-                                                                    request_from,
-                                                                    search_string,
-                                                                    season,
-                                                                    episode)
+                valid, _reject_reason = validator.validate(title)
                 if not valid:
                     continue
 
@@ -260,6 +261,7 @@ def dt_search(shared_state, start_time, request_from, search_string, mirror=None
 
     except Exception as e:
         info(f"Error loading {hostname.upper()} search page: {e}")
+        releases = failed(releases, e)
 
     elapsed = time.time() - start_time
     debug(f"Search time: {elapsed:.2f}s ({hostname})")
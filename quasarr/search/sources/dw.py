@@ -7,10 +7,9 @@ import re
 import time
 from base64 import urlsafe_b64encode
 
-import requests
-from bs4 import BeautifulSoup
-
+from quasarr.providers import html_parser, http_client
 from quasarr.providers.log import info, debug
+from quasarr.search.outcome import failed
 
 hostname = "dw"
 supported_mirrors = ["1fichier", "rapidgator", "ddownload", "katfile"]
@@ -52,7 +51,7 @@ def extract_size(text):
     raise ValueError(f"Invalid size format: {text}")
 
 
-def dw_feed(shared_state, start_time, request_from, mirror=None):
+def dw_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     releases = []
     dw = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = dw
@@ -77,8 +76,10 @@ def dw_feed(shared_state, start_time, request_from, mirror=None):
     }
 
     try:
-        request = requests.get(url, headers=headers, timeout=10).content
-        feed = BeautifulSoup(request, "html.parser")
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        request = response.content
+        feed = html_parser.parse(request)
         articles = feed.find_all('h4')
 
         for article in articles:
@@ -120,6 +121,7 @@ def dw_feed(shared_state, start_time, request_from, mirror=None):
 
     except Exception as e:
         info(f"Error loading {hostname.upper()} feed: {e}")
+        releases = failed(releases, e)
 
     elapsed_time = time.time() - start_time
     debug(f"Time taken: {elapsed_time:.2f}s ({hostname})")
@@ -127,7 +129,7 @@ def dw_feed(shared_state, start_time, request_from, mirror=None):
     return releases
 
 
-def dw_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None):
+def dw_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None, cancel=None):
     releases = []
     dw = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = dw
@@ -152,26 +154,26 @@ def dw_search(shared_state, start_time, request_from, search_string, mirror=None
     }
 
     try:
-        request = requests.get(url, headers=headers, timeout=10).content
-        search = BeautifulSoup(request, "html.parser")
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        request = response.content
+        search = html_parser.parse(request)
         results = search.find_all('h4')
 
     except Exception as e:
         info(f"Error loading {hostname.upper()} search feed: {e}")
-        return releases
+        return failed(releases, e)
 
     imdb_id = shared_state.is_imdb_id(search_string)
 
+    validator = shared_state.release_validator(request_from, search_string, season, episode)
+
     if results:
         for result in results:
             try:
                 title = result.a.text.strip()
 
-                valid, _reject_reason = shared_state.is_valid_release(title,
-                                                                    request_from,
-                                                                    search_string,
-                                                                    season,
-                                                                    episode)
+                valid, _reject_reason = validator.validate(title)
                 if not valid:
                     continue
 
@@ -6,10 +6,10 @@ import re
 import time
 from base64 import urlsafe_b64encode
 
-import requests
-from bs4 import BeautifulSoup
-
+from quasarr.providers import html_parser, http_client
 from quasarr.providers.log import info, debug
+from quasarr.search.cancellation import raise_if_cancelled
+from quasarr.search.outcome import failed
 
 hostname = "fx"
 supported_mirrors = ["rapidgator"]
@@ -25,7 +25,7 @@ def extract_size(text):
         raise ValueError(f"Invalid size format: {text}")
 
 
-def fx_feed(shared_state, start_time, request_from, mirror=None):
+def fx_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     releases = []
 
     fx = shared_state.values["config"]("Hostnames").get(hostname.lower())
@@ -47,17 +47,19 @@ def fx_feed(shared_state, start_time, request_from, mirror=None):
     }
 
     try:
-        request = requests.get(url, headers=headers, timeout=10).content
-        feed = BeautifulSoup(request, "html.parser")
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        request = response.content
+        feed = html_parser.parse(request)
         items = feed.find_all("article")
     except Exception as e:
         info(f"Error loading {hostname.upper()} feed: {e}")
-        return releases
+        return failed(releases, e)
 
     if items:
         for item in items:
             try:
-                article = BeautifulSoup(str(item), "html.parser")
+                article = html_parser.parse(str(item))
                 try:
                     source = article.find('h2', class_='entry-title').a["href"]
                     titles = article.find_all("a", href=re.compile("(filecrypt|safe." + fx + ")"))
@@ -116,7 +118,7 @@ def fx_feed(shared_state, start_time, request_from, mirror=None):
     return releases
 
 
-def fx_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None):
+def fx_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None, cancel=None):
     releases = []
     fx = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = fx.split(".")[0]
@@ -137,28 +139,35 @@ def fx_search(shared_state, start_time, request_from, search_string, mirror=None
     }
 
     try:
-        request = requests.get(url, headers=headers, timeout=10).content
-        search = BeautifulSoup(request, "html.parser")
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        request = response.content
+        search = html_parser.parse(request)
         results = search.find('h2', class_='entry-title')
 
     except Exception as e:
         info(f"Error loading {hostname.upper()} feed: {e}")
-        return releases
+        return failed(releases, e)
+
+    validator = shared_state.release_validator(request_from, search_string, season, episode)
 
     if results:
         for result in results:
+            raise_if_cancelled(cancel)
             try:
                 result_source = result["href"]
-                request = requests.get(result_source, headers=headers, timeout=10).content
-                feed = BeautifulSoup(request, "html.parser")
+                response = http_client.get(result_source, headers=headers, timeout=10)
+                response.raise_for_status()
+                request = response.content
+                feed = html_parser.parse(request)
                 items = feed.find_all("article")
             except Exception as e:
                 info(f"Error loading {hostname.upper()} feed: {e}")
-                return releases
+                return failed(releases, e)
 
             for item in items:
                 try:
-                    article = BeautifulSoup(str(item), "html.parser")
+                    article = html_parser.parse(str(item))
                     try:
                         titles = article.find_all("a", href=re.compile(r"filecrypt\."))
                     except:
@@ -168,11 +177,7 @@ def fx_search(shared_state, start_time, request_from, search_string, mirror=None
                         link = title["href"]
                         title = shared_state.sanitize_title(title.text)
 
-                        valid, _reject_reason = shared_state.is_valid_release(title,
-                                                                            request_from,
-                                                                            search_string,
-                                                                            season,
-                                                                            episode)
+                        valid, _reject_reason = validator.validate(title)
                         if not valid:
                             continue
 
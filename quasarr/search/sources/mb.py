@@ -9,11 +9,10 @@ from base64 import urlsafe_b64encode
 from datetime import datetime, timedelta
 from urllib.parse import quote_plus
 
-import requests
-from bs4 import BeautifulSoup
-
+from quasarr.providers import html_parser, http_client
 from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import info, debug
+from quasarr.search.outcome import failed
 
 hostname = "mb"
 supported_mirrors = ["rapidgator", "ddownload"]
@@ -47,6 +46,8 @@ def _parse_posts(soup, shared_state, password, mirror_filter,
     releases = []
     one_hour_ago = (datetime.now() - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S')
 
+    validator = shared_state.release_validator(request_from, search_string, season, episode) if is_search else None
+
     for post in soup.select("div.post"):
         try:
             # title & source
@@ -68,11 +69,7 @@ def _parse_posts(soup, shared_state, password, mirror_filter,
                     published = dt_obj.strftime("%a, %d %b %Y %H:%M:%S +0000")
 
             if is_search:
-                valid, _reject_reason = shared_state.is_valid_release(title,
-                                                                    request_from,
-                                                                    search_string,
-                                                                    season,
-                                                                    episode)
+                valid, _reject_reason = validator.validate(title)
                 if not valid:
                     continue
 
@@ -140,7 +137,7 @@ def _parse_posts(soup, shared_state, password, mirror_filter,
     return releases
 
 
-def mb_feed(shared_state, start_time, request_from, mirror=None):
+def mb_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     mb = shared_state.values["config"]("Hostnames").get(hostname)
 
     if not "arr" in request_from.lower():
@@ -152,17 +149,19 @@ def mb_feed(shared_state, start_time, request_from, mirror=None):
     url = f"https://{mb}/category/{section}/"
     headers = {'User-Agent': shared_state.values["user_agent"]}
     try:
-        html_doc = requests.get(url, headers=headers, timeout=10).content
-        soup = BeautifulSoup(html_doc, "html.parser")
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        html_doc = response.content
+        soup = html_parser.parse(html_doc)
         releases = _parse_posts(soup, shared_state, password, mirror_filter=mirror)
     except Exception as e:
         info(f"Error loading {hostname.upper()} feed: {e}")
-        releases = []
+        releases = failed([], e)
     debug(f"Time taken: {time.time() - start_time:.2f}s ({hostname})")
     return releases
 
 
-def mb_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None):
+def mb_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None, cancel=None):
     mb = shared_state.values["config"]("Hostnames").get(hostname)
 
     if not "arr" in request_from.lower():
@@ -182,8 +181,10 @@ def mb_search(shared_state, start_time, request_from, search_string, mirror=None
     url = f"https://{mb}/?s={q}&id=20&post_type=post"
     headers = {'User-Agent': shared_state.values["user_agent"]}
     try:
-        html_doc = requests.get(url, headers=headers, timeout=10).content
-        soup = BeautifulSoup(html_doc, "html.parser")
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        html_doc = response.content
+        soup = html_parser.parse(html_doc)
         releases = _parse_posts(
             soup, shared_state, password, mirror_filter=mirror,
             is_search=True, request_from=request_from,
@@ -191,6 +192,6 @@ def mb_search(shared_state, start_time, request_from, search_string, mirror=None
         )
     except Exception as e:
         info(f"Error loading {hostname.upper()} search: {e}")
-        releases = []
+        releases = failed([], e)
     debug(f"Time taken: {time.time() - start_time:.2f}s ({hostname})")
     return releases
@@ -10,9 +10,7 @@ import time
 from base64 import urlsafe_b64encode
 from urllib.parse import quote_plus, urljoin, urlparse
 
-import requests
-from bs4 import BeautifulSoup
-
+from quasarr.providers import html_parser, http_client
 from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import info, debug
 
@@ -89,7 +87,7 @@ def _fetch_detail_metadata(shared_state, source_url, headers, current_host):
         return updated_host, production_year, size_mb
 
     try:
-        response = requests.get(source_url, headers=headers, timeout=10)
+        response = http_client.get(source_url, headers=headers, timeout=10)
         response.raise_for_status()
     except Exception as exc:
         debug(f"{hostname.upper()} failed to load detail page {source_url}: {exc}")
@@ -98,7 +96,7 @@ def _fetch_detail_metadata(shared_state, source_url, headers, current_host):
     updated_host = _update_hostname(shared_state, current_host, response.url)
 
     try:
-        detail_soup = BeautifulSoup(response.text, "html.parser")
+        detail_soup = html_parser.parse(response.text)
         text = detail_soup.get_text(" ", strip=True)
         production_year = _extract_production_year(text)
         size_mb = _extract_size_mb(shared_state, text) or 0
@@ -149,6 +147,9 @@ def _parse_results(shared_state,
     current_host = password
     metadata_cache = {}
 
+    validator = (shared_state.release_validator(request_from, search_string, season, episode)
+                 if search_string is not None else None)
+
     for card in cards:
         try:
             title_link = card.select_one("div.cover_infos_title a")
@@ -162,11 +163,7 @@ def _parse_results(shared_state,
                 continue
 
             if search_string is not None:
-                valid, _reject_reason = shared_state.is_valid_release(title,
-                                                                    request_from,
-                                                                    search_string,
-                                                                    season,
-                                                                    episode)
+                valid, _reject_reason = validator.validate(title)
                 if not valid:
                     debug(
                         f"{hostname.upper()} filtered title '{title}' "
@@ -302,11 +299,11 @@ def me_feed(shared_state, start_time, request_from, mirror=None):
     )
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         me = _update_hostname(shared_state, me, response.url)
         password = me
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = html_parser.parse(response.text)
         releases = _parse_results(shared_state,
                                   soup,
                                   response.url,
@@ -362,11 +359,11 @@ def me_search(shared_state,
     )
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         me = _update_hostname(shared_state, me, response.url)
         password = me
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = html_parser.parse(response.text)
         releases = _parse_results(shared_state,
                                   soup,
                                   response.url,
@@ -6,16 +6,16 @@ import html
 import time
 from base64 import urlsafe_b64encode
 
-import requests
-
+from quasarr.providers import http_client
 from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import info, debug
+from quasarr.search.outcome import failed
 
 hostname = "nx"
 supported_mirrors = ["filer"]
 
 
-def nx_feed(shared_state, start_time, request_from, mirror=None):
+def nx_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     releases = []
     nx = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = nx
@@ -38,11 +38,12 @@ def nx_feed(shared_state, start_time, request_from, mirror=None):
     }
 
     try:
-        response = requests.get(url, headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
         feed = response.json()
     except Exception as e:
         info(f"Error loading {hostname.upper()} feed: {e}")
-        return releases
+        return failed(releases, e)
 
     items = feed['result']['list']
     for item in items:
@@ -98,7 +99,7 @@ def nx_feed(shared_state, start_time, request_from, mirror=None):
     return releases
 
 
-def nx_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None):
+def nx_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None, cancel=None):
     releases = []
     nx = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = nx
@@ -129,23 +130,21 @@ def nx_search(shared_state, start_time, request_from, search_string, mirror=None
     }
 
     try:
-        response = requests.get(url, headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
         feed = response.json()
     except Exception as e:
         info(f"Error loading {hostname.upper()} search: {e}")
-        return releases
+        return failed(releases, e)
 
     items = feed['result']['releases']
+    validator = shared_state.release_validator(request_from, search_string, season, episode)
     for item in items:
         try:
             if item['type'] == valid_type:
                 title = item['name']
                 if title:
-                    valid, _reject_reason = shared_state.is_valid_release(title,
-                                                                        request_from,
-                                                                        search_string,
-                                                                        season,
-                                                                        episode)
+                    valid, _reject_reason = validator.validate(title)
                     if not valid:
                         continue
 
@@ -8,16 +8,15 @@ import time
 from base64 import urlsafe_b64encode
 from datetime import datetime, timedelta
 
-import requests
-
+from quasarr.providers import html_parser, http_client
 from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import info, debug
+from quasarr.search.cancellation import raise_if_cancelled
+from quasarr.search.outcome import failed
 
 hostname = "sf"
 supported_mirrors = ["1fichier", "ddownload", "katfile", "rapidgator", "turbobit"]
 
-from bs4 import BeautifulSoup
-
 check = lambda s: s.replace(
     ''.join(chr((ord(c) - 97 - 7) % 26 + 97) for c in "ylhr"),
     ''.join(chr((ord(c) - 97 - 7) % 26 + 97) for c in "hu")
@@ -95,7 +94,7 @@ def parse_mirrors(base_url, entry):
     return mirrors
 
 
-def sf_feed(shared_state, start_time, request_from, mirror=None):
+def sf_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     releases = []
     sf = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = check(sf)
@@ -117,17 +116,19 @@ def sf_feed(shared_state, start_time, request_from, mirror=None):
     days_to_cover = 2
 
     while days_to_cover > 0:
+        raise_if_cancelled(cancel)
         days_to_cover -= 1
         formatted_date = date.strftime('%Y-%m-%d')
         date -= timedelta(days=1)
 
         try:
-            response = requests.get(f"https://{sf}/updates/{formatted_date}#list", headers, timeout=10)
+            response = http_client.get(f"https://{sf}/updates/{formatted_date}#list", headers=headers, timeout=10)
+            response.raise_for_status()
         except Exception as e:
             info(f"Error loading {hostname.upper()} feed: {e} for {formatted_date}")
-            return releases
+            return failed(releases, e)
 
-        content = BeautifulSoup(response.text, "html.parser")
+        content = html_parser.parse(response.text)
         items = content.find_all("div", {"class": "row"}, style=re.compile("order"))
 
         for item in items:
@@ -191,7 +192,7 @@ def extract_size(text):
         raise ValueError(f"Invalid size format: {text}")
 
 
-def sf_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None):
+def sf_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None, cancel=None):
     releases = []
     sf = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = check(sf)
@@ -219,14 +220,18 @@ def sf_search(shared_state, start_time, request_from, search_string, mirror=None
     headers = {'User-Agent': shared_state.values["user_agent"]}
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
         feed = response.json()
     except Exception as e:
         info(f"Error loading {hostname.upper()} search: {e}")
-        return releases
+        return failed(releases, e)
 
     results = feed.get('result', [])
+    validator = shared_state.release_validator(request_from, search_string, season, episode)
+    error = None  # une série illisible : recherche incomplète
     for result in results:
+        raise_if_cancelled(cancel)
         sanitized_search_string = shared_state.sanitize_string(search_string)
         sanitized_title = shared_state.sanitize_string(result.get("title", ""))
         if not re.search(rf'\b{re.escape(sanitized_search_string)}\b', sanitized_title):
@@ -248,7 +253,7 @@ def sf_search(shared_state, start_time, request_from, search_string, mirror=None
             imdb_cached = entry.get("imdb_id")
             if imdb_cached:
                 imdb_id = imdb_cached
-            content = BeautifulSoup(data_html, "html.parser")
+            content = html_parser.parse(data_html)
         else:
             # fresh fetch: record timestamp
             entry = {"timestamp": datetime.now()}
@@ -256,12 +261,15 @@ def sf_search(shared_state, start_time, request_from, search_string, mirror=None
             # load series page
             series_url = f"https://{sf}/{series_id}"
             try:
-                series_page = requests.get(series_url, headers=headers, timeout=10).text
-                imdb_link = BeautifulSoup(series_page, "html.parser").find("a", href=re.compile(r"imdb\.com"))
+                response = http_client.get(series_url, headers=headers, timeout=10)
+                response.raise_for_status()
+                series_page = response.text
+                imdb_link = html_parser.parse(series_page).find("a", href=re.compile(r"imdb\.com"))
                 imdb_id = re.search(r'tt\d+', str(imdb_link)).group() if imdb_link else None
                 season_id = re.findall(r"initSeason\('(.+?)\',", series_page)[0]
-            except Exception:
+            except Exception as e:
                 debug(f"Failed to load or parse series page for {series_id}")
+                error = e
                 continue
 
             # fetch API HTML
@@ -269,7 +277,8 @@ def sf_search(shared_state, start_time, request_from, search_string, mirror=None
             api_url = f'https://{sf}/api/v1/{season_id}/season/ALL?lang=ALL&_={epoch}'
             debug(f"Requesting SF API URL: {api_url}")
             try:
-                api_resp = requests.get(api_url, headers=headers, timeout=10)
+                api_resp = http_client.get(api_url, headers=headers, timeout=10)
+                api_resp.raise_for_status()
                 resp_json = api_resp.json()
                 if resp_json.get('error'):
                     info(f"SF API error for series '{series_id}' at URL {api_url}: {resp_json.get('message')}")
@@ -277,6 +286,7 @@ def sf_search(shared_state, start_time, request_from, search_string, mirror=None
                 data_html = resp_json.get("html", "")
             except Exception as e:
                 info(f"Error loading SF API for {series_id} at {api_url}: {e}")
+                error = e
                 continue
 
             # cache content and imdb_id
@@ -284,7 +294,7 @@ def sf_search(shared_state, start_time, request_from, search_string, mirror=None
             entry["imdb_id"] = imdb_id
             recently_searched[series_id] = entry
             shared_state.update(context, recently_searched)
-            content = BeautifulSoup(data_html, "html.parser")
+            content = html_parser.parse(data_html)
 
         # parse episodes/releases
         for item in content.find_all("h3"):
@@ -342,11 +352,7 @@ def sf_search(shared_state, start_time, request_from, search_string, mirror=None
                         continue
 
                 # check down here on purpose, because the title may be modified at episode stage
-                valid, _reject_reason = shared_state.is_valid_release(title,
-                                                                    request_from,
-                                                                    search_string,
-                                                                    season,
-                                                                    episode)
+                valid, _reject_reason = validator.validate(title)
                 if not valid:
                     continue
 
@@ -372,4 +378,6 @@ def sf_search(shared_state, start_time, request_from, search_string, mirror=None
 
     elapsed_time = time.time() - start_time
     debug(f"Time taken: {elapsed_time:.2f}s ({hostname})")
+    if error is not None:
+        return failed(releases, error)
     return releases
@@ -10,11 +10,10 @@ import xml.etree.ElementTree as ET
 from base64 import urlsafe_b64encode
 from urllib.parse import quote_plus
 
-import requests
-from bs4 import BeautifulSoup
-
+from quasarr.providers import html_parser, http_client
 from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import info, debug
+from quasarr.search.outcome import failed
 
 hostname = "sl"
 supported_mirrors = ["nitroflare", "ddownload"]  # ignoring captcha-protected multiup/mirrorace for now
@@ -38,7 +37,7 @@ def parse_pubdate_to_iso(pubdate_str):
     return dt.isoformat()
 
 
-def sl_feed(shared_state, start_time, request_from, mirror=None):
+def sl_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     releases = []
 
     sl = shared_state.values["config"]("Hostnames").get(hostname.lower())
@@ -59,7 +58,9 @@ def sl_feed(shared_state, start_time, request_from, mirror=None):
     headers = {'User-Agent': shared_state.values['user_agent']}
 
     try:
-        xml_text = requests.get(url, headers=headers, timeout=10).text
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        xml_text = response.text
         root = ET.fromstring(xml_text)
 
         for item in root.find('channel').findall('item'):
@@ -113,13 +114,14 @@ def sl_feed(shared_state, start_time, request_from, mirror=None):
 
     except Exception as e:
         info(f"Error loading {hostname.upper()} feed: {e}")
+        releases = failed(releases, e)
 
     elapsed = time.time() - start_time
     debug(f"Time taken: {elapsed:.2f}s ({hostname})")
     return releases
 
 
-def sl_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None):
+def sl_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None, cancel=None):
     releases = []
     sl = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = sl
@@ -148,22 +150,21 @@ def sl_search(shared_state, start_time, request_from, search_string, mirror=None
         q = quote_plus(search_string)
         url = f'https://{sl}/{feed_type}/?s={q}'
         headers = {"User-Agent": shared_state.values['user_agent']}
-        html_text = requests.get(url, headers=headers, timeout=10).text
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        html_text = response.text
 
-        soup = BeautifulSoup(html_text, 'html.parser')
+        soup = html_parser.parse(html_text)
         posts = soup.find_all('div', class_=lambda c: c and c.startswith('post-'))
 
+        validator = shared_state.release_validator(request_from, search_string, season, episode)
         for post in posts:
             try:
                 # Title and link
                 a = post.find('h1').find('a')
                 title = a.get_text(strip=True)
 
-                valid, _reject_reason = shared_state.is_valid_release(title,
-                                                                    request_from,
-                                                                    search_string,
-                                                                    season,
-                                                                    episode)
+                valid, _reject_reason = validator.validate(title)
                 if not valid:
                     continue
 
@@ -210,6 +211,7 @@ def sl_search(shared_state, start_time, request_from, search_string, mirror=None
 
     except Exception as e:
         info(f"Error loading {hostname.upper()} search page: {e}")
+        releases = failed(releases, e)
 
     elapsed = time.time() - start_time
     debug(f"Search time: {elapsed:.2f}s ({hostname})")
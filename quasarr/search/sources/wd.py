@@ -9,11 +9,10 @@ from base64 import urlsafe_b64encode
 from datetime import datetime, timedelta
 from urllib.parse import quote, quote_plus
 
-import requests
-from bs4 import BeautifulSoup
-
+from quasarr.providers import html_parser, http_client
 from quasarr.providers.imdb_metadata import get_localized_title
 from quasarr.providers.log import info, debug
+from quasarr.search.outcome import failed
 
 hostname = "wd"
 supported_mirrors = ["rapidgator", "ddownload", "katfile", "fikper", "turbobit"]
@@ -76,6 +75,8 @@ def _parse_rows(
 
     one_hour_ago = (datetime.now() - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S')
 
+    validator = shared_state.release_validator(request_from, search_string, season, episode) if is_search else None
+
     for tr in soup.select("table.table tbody tr.lh-sm"):
         try:
             a = tr.find("a", class_="upload-link")
@@ -92,11 +93,7 @@ def _parse_rows(
 
             # search context contains non-video releases (ebooks, games, etc.)
             if is_search:
-                valid, _reject_reason = shared_state.is_valid_release(title,
-                                                                    request_from,
-                                                                    search_string,
-                                                                    season,
-                                                                    episode)
+                valid, _reject_reason = validator.validate(title)
                 if not valid:
                     continue
 
@@ -152,7 +149,7 @@ def _parse_rows(
     return releases
 
 
-def wd_feed(shared_state, start_time, request_from, mirror=None):
+def wd_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     wd = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = wd
 
@@ -166,17 +163,18 @@ def wd_feed(shared_state, start_time, request_from, mirror=None):
     url = f"https://{wd}/{feed_type}"
     headers = {'User-Agent': shared_state.values["user_agent"]}
     try:
-        response = requests.get(url, headers=headers, timeout=10).content
-        soup = BeautifulSoup(response, "html.parser")
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        soup = html_parser.parse(response.content)
         releases = _parse_rows(soup, shared_state, wd, password, mirror)
     except Exception as e:
         info(f"Error loading {hostname.upper()} feed: {e}")
-        releases = []
+        releases = failed([], e)
     debug(f"Time taken: {time.time() - start_time:.2f}s ({hostname})")
     return releases
 
 
-def wd_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None):
+def wd_search(shared_state, start_time, request_from, search_string, mirror=None, season=None, episode=None, cancel=None):
     releases = []
     wd = shared_state.values["config"]("Hostnames").get(hostname.lower())
     password = wd
@@ -194,8 +192,9 @@ def wd_search(shared_state, start_time, request_from, search_string, mirror=None
     headers = {'User-Agent': shared_state.values["user_agent"]}
 
     try:
-        response = requests.get(url, headers=headers, timeout=10).content
-        soup = BeautifulSoup(response, "html.parser")
+        response = http_client.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        soup = html_parser.parse(response.content)
         releases = _parse_rows(
             soup, shared_state, wd, password, mirror,
             request_from=request_from,
@@ -204,6 +203,6 @@ def wd_search(shared_state, start_time, request_from, search_string, mirror=None
         )
     except Exception as e:
         info(f"Error loading {hostname.upper()} search: {e}")
-        releases = []
+        releases = failed([], e)
     debug(f"Time taken: {time.time() - start_time:.2f}s ({hostname})")
     return releases
@@ -10,12 +10,14 @@ import threading
 import time
 import unicodedata
 from base64 import urlsafe_b64encode
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, namedtuple
 from urllib.parse import parse_qs, quote_plus, urljoin, urlparse, urlunparse
 
-import requests
-from bs4 import BeautifulSoup, NavigableString
+from bs4 import CData, NavigableString, Tag
 
+from quasarr.providers import host_redirects, html_parser, http_client
+from quasarr.providers import shared_state as quasarr_state
+from quasarr.providers.http_cache import http_cache
 from quasarr.providers.imdb_metadata import (
     get_french_alternative_titles,
     get_localized_title,
@@ -29,33 +31,142 @@ from quasarr.providers.shared_state import (
     site_film_ordinal_tail,
     strip_site_film_ordinal,
 )
+from quasarr.search import detail_store
+from quasarr.search.cancellation import SearchCancelled, raise_if_cancelled
+from quasarr.search.outcome import failed
+from quasarr.search.parse_pool import parse_pool
+from quasarr.search.politeness import politeness
+from quasarr.search.scheduler import search_scheduler
 
 hostname = "zt"
 
-# Nombre de pages de détail récupérées en parallèle lors d'un feed.
-# Une page listing ZT contient ~25 cartes et Radarr en interroge deux catégories
-# ("films" + "autres-videos"), soit ~50 pages de détail par flux RSS. En
-# séquentiel cela dépasse le timeout de 100 s des clients *arr dès que la
-# latence atteint ~2 s par page.
-DETAIL_PREFETCH_WORKERS = 8
+# Les pages de détail et les flux de recherche sont chargés en parallèle sur
+# l'ordonnanceur global (quasarr.search.scheduler), sous le quota de la source
+# "zt". Une page listing ZT contient ~25 cartes et Radarr en interroge deux
+# catégories, soit ~50 pages de détail par flux RSS ; une recherche lance
+# jusqu'à 4 requêtes × 2 catégories, chacune paginée. En séquentiel, l'un comme
+# l'autre dépasse le timeout de 100 s des clients *arr.
 
-# Une recherche lance jusqu'à 4 requêtes (titre localisé, sans accents, titre
-# original, sans accents) × 2 catégories, chacune paginée : ~29 pages de listing
-# en séquentiel pour un titre courant, soit ~100 s à 3,5 s/page. Ces flux sont
-# indépendants, on les mène de front.
-SEARCH_STREAM_WORKERS = 8
+# Débit et requêtes simultanées vers ZT sont plafonnés *globalement* par
+# ``quasarr.search.politeness`` : les flux de recherche préchargent eux-mêmes
+# leurs pages de détail en parallèle, sans ce garde-fou les deux niveaux se
+# multiplieraient et on martèlerait le site.
 
-# Plafond *global* de requêtes simultanées vers ZT. Les flux de recherche
-# préchargent eux-mêmes leurs pages de détail en parallèle : sans ce garde-fou
-# les deux niveaux se multiplieraient (8 × 8) et on martèlerait le site.
-ZT_MAX_CONCURRENT_REQUESTS = 8
-_zt_request_slots = threading.Semaphore(ZT_MAX_CONCURRENT_REQUESTS)
 
+def _zt_get(url, headers=None, timeout=10, cancel=None, stop=None):
+    """GET vers ZT soumis au débit et à la concurrence de l'hostname "zt".
 
-def _zt_get(url, headers=None, timeout=10):
-    """GET vers ZT soumis au plafond de concurrence global."""
-    with _zt_request_slots:
-        return requests.get(url, headers=headers, timeout=timeout)
+    Passe par le cache HTTP sur disque : une page de détail déjà vue est servie
+    sans réseau ou revalidée par un 304. Une recherche annulée n'attend plus de
+    créneau et ne lance plus rien. Avec ``stop``, la lecture du corps s'arrête
+    dès que ``stop(body, start)`` est vrai (``http_client.get_until``).
+
+    Une URL sur un domaine que ZT a quitté est réécrite avant l'envoi
+    (``host_redirects``), puis de nouveau après l'attente du créneau : une
+    migration apprise pendant cette attente évite déjà la redirection.
+    """
+    raise_if_cancelled(cancel)
+    url = host_redirects.resolve(hostname, url)
+
+    def fetch(url, **kwargs):
+        with politeness.slot(hostname, cancel):
+            return http_client.get(host_redirects.resolve(hostname, url), stop=stop, **kwargs)
+
+    return http_cache.get(url, fetch, headers=headers, timeout=timeout)
+
+
+# Sonarr cherche les épisodes manquants un par un (S01E01, S01E02, …) : chaque
+# requête reparcourait les mêmes pages listing et les mêmes pages de détail.
+# Ce qu'une saison a coûté en réseau est donc mémorisé par (imdb_id, saison) :
+# les cartes de chaque page listing (titre, lien, qualité, date — quelques
+# centaines d'octets, pas la page entière) et les métadonnées de détail ;
+# chaque épisode rejoue la sélection, peu coûteuse, sur ces données.
+SEASON_CRAWL_TTL_SECONDS = 15 * 60
+SEASON_CRAWL_MAX_ENTRIES = 32
+
+_SEASON_CRAWLS = OrderedDict()
+_SEASON_CRAWLS_LOCK = threading.Lock()
+
+
+class _SeasonCrawl:
+    __slots__ = ("pages", "metadata", "created")
+
+    def __init__(self):
+        self.pages = {}  # url -> (url finale, cartes, page suivante ?)
+        self.metadata = {}
+        self.created = time.time()
+
+
+def _season_crawl(imdb_id, season):
+    """Mémo partagé par les recherches d'épisodes d'une même saison (ou None)."""
+    if not imdb_id or season is None or season == "":
+        return None
+    key = (imdb_id, str(season))
+    now = time.time()
+    with _SEASON_CRAWLS_LOCK:
+        crawl = _SEASON_CRAWLS.get(key)
+        if crawl is None or now - crawl.created > SEASON_CRAWL_TTL_SECONDS:
+            crawl = _SEASON_CRAWLS[key] = _SeasonCrawl()
+        _SEASON_CRAWLS.move_to_end(key)
+        while len(_SEASON_CRAWLS) > SEASON_CRAWL_MAX_ENTRIES:
+            _SEASON_CRAWLS.popitem(last=False)
+        return crawl
+
+
+def clear_season_crawls():
+    with _SEASON_CRAWLS_LOCK:
+        _SEASON_CRAWLS.clear()
+
+
+# Une page listing n'est utile que jusqu'à sa dernière carte ``div.cover_global`` ;
+# barre latérale et pied de page qui suivent pèsent autant que les cartes. La
+# lecture s'arrête donc au premier de ces repères vu après une carte (la
+# liste des cartes est d'un seul tenant). Sans repère, la page est lue en entier.
+_LISTING_CARD_MARKER = b"cover_global"
+_LISTING_END_MARKERS = (b'class="navigation"', b'class="pagination"', b"<footer", b'id="footer"')
+
+
+def _listing_complete(body, start):
+    """Vrai quand ``body`` contient toutes les cartes de la page listing."""
+    first_card = body.find(_LISTING_CARD_MARKER)
+    if first_card < 0:
+        return False
+    return any(
+        body.find(marker, max(first_card, start - len(marker))) >= 0
+        for marker in _LISTING_END_MARKERS
+    )
+
+
+# Cartes d'une page listing pleine : une page plus courte est la dernière,
+# sauf si sa pagination annonce la suivante.
+LISTING_PAGE_SIZE = 25
+
+_PAGE_NUMBER = re.compile(r"[?&]page=(\d+)")
+
+
+def _links_next_page(markup, url):
+    """Vrai si la page listing ``url`` renvoie vers la page suivante."""
+    match = _PAGE_NUMBER.search(url)
+    if not match:
+        return False
+    return re.search(rf"[?&;]page={int(match.group(1)) + 1}(?!\d)", markup) is not None
+
+
+def _crawl_page(crawl, url, headers, cancel=None):
+    """Page listing ``(url finale, cartes, page suivante ?)``, servie par le
+    mémo de saison si possible."""
+    if crawl is not None:
+        page = crawl.pages.get(url)
+        if page is not None:
+            return page
+    response = _zt_get(url, headers=headers, timeout=10, cancel=cancel, stop=_listing_complete)
+    response.raise_for_status()
+    cards = parse_pool.run(_parse_listing, response.text)
+    more = len(cards) >= LISTING_PAGE_SIZE or _links_next_page(response.text, url)
+    page = (response.url, cards, more)
+    if crawl is not None:
+        crawl.pages[url] = page
+    return page
 
 SUPPORTED_MIRRORS = {
     "rapidgator",
@@ -176,13 +287,14 @@ def _extract_supported_mirrors(detail_soup):
     return list(supported)
 
 
-def _collect_download_entries(detail_soup, base_url):
+def _collect_download_entries(detail_soup, base_url, index=None):
     entries = []
     seen_urls = set()
     current_host = None
     skip_current_host = False
 
-    for block in detail_soup.select("div.postinfo"):
+    blocks = index.postinfo_blocks if index is not None else detail_soup.select("div.postinfo")
+    for block in blocks:
         for bold in block.find_all("b"):
             host_div = bold.find("div")
             if host_div:
@@ -256,20 +368,24 @@ def _update_hostname(shared_state, current_host, final_url):
         return current_host
 
     if final_host and current_host and final_host != current_host:
-        info(f"{hostname.upper()} redirect detected. Updating hostname to '{final_host}'.")
-        shared_state.values["config"]("Hostnames").save(hostname.lower(), final_host)
+        # Une seule fois par migration, même si des requêtes concurrentes
+        # ont suivi la même redirection (cf. ``host_redirects.learn``).
+        if host_redirects.learn(hostname, current_host, final_host):
+            info(f"{hostname.upper()} redirect detected. Updating hostname to '{final_host}'.")
+            shared_state.values["config"]("Hostnames").save(hostname.lower(), final_host)
         return final_host
     return current_host
 
 
-def _extract_year_from_highlight(soup):
+def _extract_year_from_highlight(soup, index=None):
     """Return the release year advertised in the highlighted filename block."""
     if not soup:
         return ""
+    red_fonts = index.red_fonts if index is not None else soup.find_all("font", {"color": "red"})
 
     matches = []
     year_pattern = re.compile(r"(?:19|20)\d{2}")
-    for highlight in soup.find_all("font", {"color": "red"}):
+    for highlight in red_fonts:
         text = highlight.get_text(" ", strip=True)
         if not text:
             continue
@@ -325,17 +441,75 @@ def _extract_size_mb(shared_state, text):
             continue
 
     return 0
-def _extract_detail_title(soup):
+_QUALITY_CONTAINERS = frozenset(("div", "span", "p", "strong"))
+_QUALITY_LABEL_PATTERN = re.compile(r"^\s*qualit", re.IGNORECASE)
+_LANGUAGE_LABEL_PATTERN = re.compile(r"langue", re.IGNORECASE)
+# Chaînes retenues par get_text() (ni commentaires, ni scripts).
+_TEXT_STRING_TYPES = (NavigableString, CData)
+
+
+class _DetailIndex:
+    """Éléments d'une page de détail utiles à l'extraction, relevés en un parcours.
+
+    Chaque extracteur refaisait son propre parcours complet de l'arbre
+    (get_text, select, find_all…), une dizaine au total par page. L'index
+    relève tout en une passe, dans l'ordre du document, avec les mêmes
+    critères que les recherches qu'il remplace.
+    """
+
+    __slots__ = ("title_h1", "red_fonts", "strongs", "postinfo_blocks",
+                 "quality_strings", "language_string", "text")
+
+    def __init__(self, soup):
+        self.title_h1 = None            # select_one(".centersideinn h1")
+        self.red_fonts = []             # find_all("font", {"color": "red"})
+        self.strongs = []               # find_all("strong")
+        self.postinfo_blocks = []       # select("div.postinfo")
+        self.quality_strings = []       # find_all(string=_QUALITY_LABEL_PATTERN)
+        self.language_string = None     # find(string=_LANGUAGE_LABEL_PATTERN)
+        strings = []                    # get_text(" ", strip=True)
+
+        for node in soup.descendants:
+            if isinstance(node, NavigableString):
+                if type(node) in _TEXT_STRING_TYPES:
+                    stripped = node.strip()
+                    if stripped:
+                        strings.append(stripped)
+                if _QUALITY_LABEL_PATTERN.search(node):
+                    self.quality_strings.append(node)
+                if self.language_string is None and _LANGUAGE_LABEL_PATTERN.search(node):
+                    self.language_string = node
+                continue
+            if not isinstance(node, Tag):
+                continue
+            name = node.name
+            if name == "font":
+                if node.get("color") == "red":
+                    self.red_fonts.append(node)
+            elif name == "strong":
+                self.strongs.append(node)
+            elif name == "div":
+                if "postinfo" in (node.get("class") or ()):
+                    self.postinfo_blocks.append(node)
+            elif name == "h1":
+                if self.title_h1 is None and node.find_parent(class_="centersideinn"):
+                    self.title_h1 = node
+        self.text = " ".join(strings)
+
+
+def _extract_detail_title(soup, index=None):
     if not soup:
         return None
+    if index is None:
+        index = _DetailIndex(soup)
 
-    title_tag = soup.select_one(".centersideinn h1")
+    title_tag = index.title_h1
     if title_tag:
         text = title_tag.get_text(strip=True)
         if text:
             return text
 
-    font_red = soup.find("font", {"color": "red"})
+    font_red = index.red_fonts[0] if index.red_fonts else None
     if font_red:
         text = font_red.get_text(strip=True)
         if text:
@@ -343,12 +517,31 @@ def _extract_detail_title(soup):
     return None
 
 
-def _extract_quality_language_tokens(soup):
+def _extract_quality_language_tokens(soup, index=None):
     if not soup:
         return []
+    if index is None:
+        index = _DetailIndex(soup)
+
+    def candidate_quality_containers():
+        # Seuls les conteneurs dont le premier texte commence par « qualit »
+        # peuvent passer le filtre ci-dessous : on part de ces textes plutôt
+        # que d'extraire le texte de chaque div de la page. Même ordre que
+        # find_all (document, conteneur englobant d'abord).
+        seen = set()
+        for string in index.quality_strings:
+            chain = []
+            node = string.parent
+            while node is not None and node is not soup:
+                if node.name in _QUALITY_CONTAINERS and id(node) not in seen:
+                    chain.append(node)
+                node = node.parent
+            for tag in reversed(chain):
+                seen.add(id(tag))
+                yield tag
 
     def candidate_quality_texts():
-        for tag in soup.find_all(["div", "span", "p", "strong"]):
+        for tag in candidate_quality_containers():
             text = tag.get_text(" ", strip=True)
             if not text:
                 continue
@@ -389,8 +582,7 @@ def _extract_quality_language_tokens(soup):
 
     if len(tokens) <= 1:
         language_text = None
-        lang_pattern = re.compile(r"langue", re.IGNORECASE)
-        lang_tag = soup.find(string=lang_pattern)
+        lang_tag = index.language_string
         if lang_tag:
             container = lang_tag.find_parent(["div", "span", "p", "strong"])
             if not container:
@@ -409,13 +601,14 @@ def _extract_quality_language_tokens(soup):
 
     return tokens
 
-def _extract_original_title(soup):
+def _extract_original_title(soup, index=None):
     if not soup:
         return None
+    strongs = index.strongs if index is not None else soup.find_all("strong")
 
     label_pattern = re.compile(r"(?i)titre\s+original")
 
-    for strong in soup.find_all("strong"):
+    for strong in strongs:
         text = strong.get_text(" ", strip=True)
         if not text:
             continue
@@ -447,7 +640,7 @@ def _extract_original_title(soup):
                 if candidate:
                     return candidate
 
-    text = soup.get_text(" ", strip=True)
+    text = index.text if index is not None else soup.get_text(" ", strip=True)
     match = re.search(r"(?i)titre\s+original\s*[:：]\s*(.+)", text)
     if match:
         candidate = match.group(1).strip()
@@ -490,7 +683,120 @@ def _extract_identity(text):
     return identity
 
 
-def _fetch_detail_metadata(shared_state, source_url, headers, current_host):
+def _stored_detail_metadata(shared_state, source_url, current_host):
+    """Tuple de ``_fetch_detail_metadata`` relu depuis ``detail_store``, ou None."""
+    data = detail_store.get(shared_state, hostname, source_url)
+    if not data:
+        return None
+    try:
+        return (
+            current_host,
+            data["production_year"],
+            data["size_mb"],
+            data["detail_title"],
+            list(data["quality_tokens"]),
+            set(data["available_episodes"]),
+            [dict(entry, episodes=frozenset(entry["episodes"]))
+             for entry in data["download_entries"]],
+            data["original_title"],
+            data["filename_year"],
+            dict(data["identity"]),
+        )
+    except (KeyError, TypeError) as exc:
+        debug(f"{hostname.upper()} ignoring unreadable stored metadata for {source_url}: {exc}")
+        return None
+
+
+def _store_detail_metadata(shared_state, source_url, metadata):
+    (_host, production_year, size_mb, detail_title, quality_tokens, available_episodes,
+     download_entries, original_title, filename_year, identity) = metadata
+    detail_store.put(
+        shared_state, hostname, source_url,
+        {
+            "production_year": production_year,
+            "size_mb": size_mb,
+            "detail_title": detail_title,
+            "quality_tokens": list(quality_tokens),
+            "available_episodes": sorted(available_episodes),
+            "download_entries": [dict(entry, episodes=sorted(entry["episodes"]))
+                                 for entry in download_entries],
+            "original_title": original_title,
+            "filename_year": filename_year,
+            "identity": identity,
+        },
+        # Une page de série s'enrichit à chaque épisode publié.
+        series=bool(available_episodes) or any(entry["episodes"] for entry in download_entries),
+    )
+
+
+_EPISODE_LINK_PATTERN = re.compile(r"(?i)\b(?:ep(?:isode)?)\s*(\d{1,3})(?:\s*[-à]\s*(\d{1,3}))?")
+
+
+def _parse_detail_page(shared_state, markup, page_url):
+    """Champs d'une page de détail, extraits d'un seul parcours de l'arbre.
+
+    Renvoie ``(année de production, taille en Mo, titre, jetons qualité /
+    langue, épisodes, liens, titre original, année du nom de fichier,
+    identité)``.
+    """
+    detail_soup = html_parser.parse(markup)
+    index = _DetailIndex(detail_soup)
+    text = index.text
+    # Le site annonce deux années : le champ de fiche « Année de production »
+    # et celle lue dans le nom de fichier surligné, saisi par l'uploadeur.
+    # Aucune des deux n'est fiable à tous les coups (mesuré sur 12 films :
+    # 11/12 pour la fiche, 8/12 pour le nom de fichier). Plutôt que de parier
+    # sur l'une, on les remonte toutes les deux et on laissera Radarr trancher.
+    #
+    # L'année reste celle du site, jamais celle de TMDB : c'est elle qui
+    # distingue deux homonymes, la réécrire ferait importer un autre film
+    # sans aucune alerte.
+    highlighted_year = _extract_year_from_highlight(detail_soup, index)
+    available_episodes = set()
+    for block in index.postinfo_blocks:
+        for bold in block.find_all("b"):
+            for link in bold.find_all("a"):
+                link_text = link.get_text(" ", strip=True)
+                for start_str, end_str in _EPISODE_LINK_PATTERN.findall(link_text):
+                    start_ep = int(start_str)
+                    end_ep = int(end_str) if end_str else start_ep
+                    available_episodes.update(range(start_ep, end_ep + 1))
+    # Identite du film telle que publiee par le site : sert a corroborer une
+    # annee differente de celle qu'il annonce.
+    identity = {"director": "", "runtime": None}
+    identity.update(_extract_identity(text))
+    return (
+        _extract_production_year(text) or highlighted_year,
+        _extract_size_mb(shared_state, text) or 0,
+        _extract_detail_title(detail_soup, index),
+        _extract_quality_language_tokens(detail_soup, index),
+        available_episodes,
+        _collect_download_entries(detail_soup, page_url, index),
+        _extract_original_title(detail_soup, index),
+        highlighted_year,
+        identity,
+    )
+
+
+def _parse_detail_record(markup, page_url):
+    """``_parse_detail_page`` exécutable dans ``parse_pool`` (sans shared_state)."""
+    return _parse_detail_page(quasarr_state, markup, page_url)
+
+
+class _DetailUnavailable(tuple):
+    """Tuple de ``_fetch_detail_metadata`` pour une page non chargée ou vide.
+
+    Il se déballe comme les autres, mais ne doit pas être mémorisé : le mémo de
+    saison le rejouerait aux épisodes suivants comme une page sans liens.
+    """
+
+
+def _fetch_detail_metadata(shared_state, source_url, headers, current_host, cancel=None, errors=None):
+    if source_url:
+        stored = _stored_detail_metadata(shared_state, source_url, current_host)
+        if stored is not None:
+            return stored
+
     updated_host = current_host
     production_year = ""
     filename_year = ""
@@ -519,11 +825,15 @@ def _fetch_detail_metadata(shared_state, source_url, headers, current_host):
         )
 
     try:
-        response = _zt_get(source_url, headers=headers, timeout=10)
+        response = _zt_get(source_url, headers=headers, timeout=10, cancel=cancel)
         response.raise_for_status()
+    except SearchCancelled:
+        raise
     except Exception as exc:
         debug(f"{hostname.upper()} failed to load detail page {source_url}: {exc}")
-        return (
+        if errors is not None:
+            errors.append(exc)
+        return _DetailUnavailable((
             updated_host,
             production_year,
             size_mb,
@@ -534,51 +844,22 @@ def _fetch_detail_metadata(shared_state, source_url, headers, current_host):
             original_title,
             filename_year,
             identity,
-        )
+        ))
 
     updated_host = _update_hostname(shared_state, current_host, response.url)
 
     try:
-        detail_soup = BeautifulSoup(response.text, "html.parser")
-        text = detail_soup.get_text(" ", strip=True)
-        title = _extract_detail_title(detail_soup)
-        original_title = _extract_original_title(detail_soup)
-        # Le site annonce deux années : le champ de fiche « Année de production »
-        # et celle lue dans le nom de fichier surligné, saisi par l'uploadeur.
-        # Aucune des deux n'est fiable à tous les coups (mesuré sur 12 films :
-        # 11/12 pour la fiche, 8/12 pour le nom de fichier). Plutôt que de parier
-        # sur l'une, on les remonte toutes les deux et on laissera Radarr trancher.
-        #
-        # L'année reste celle du site, jamais celle de TMDB : c'est elle qui
-        # distingue deux homonymes, la réécrire ferait importer un autre film
-        # sans aucune alerte.
-        highlighted_year = _extract_year_from_highlight(detail_soup)
-        production_year = _extract_production_year(text) or highlighted_year
-        filename_year = highlighted_year
-        size_mb = _extract_size_mb(shared_state, text) or 0
-        quality_tokens = _extract_quality_language_tokens(detail_soup)
-        download_entries = _collect_download_entries(detail_soup, response.url)
-        episode_pattern = re.compile(
-            r"(?i)\b(?:ep(?:isode)?)\s*(\d{1,3})(?:\s*[-à]\s*(\d{1,3}))?"
-        )
-        for link in detail_soup.select("div.postinfo b a"):
-            link_text = link.get_text(" ", strip=True)
-            if not link_text:
-                continue
-            for start_str, end_str in episode_pattern.findall(link_text):
-                try:
-                    start_ep = int(start_str)
-                except ValueError:
-                    continue
-                if end_str:
-                    try:
-                        end_ep = int(end_str)
-                    except ValueError:
-                        end_ep = start_ep
-                    for ep_num in range(start_ep, end_ep + 1):
-                        available_episodes.add(ep_num)
-                else:
-                    available_episodes.add(start_ep)
+        (
+            production_year,
+            size_mb,
+            detail_title,
+            quality_tokens,
+            available_episodes,
+            download_entries,
+            original_title,
+            filename_year,
+            identity,
+        ) = parse_pool.run(_parse_detail_record, response.text, response.url)
         if production_year:
             debug(
                 f"{hostname.upper()} extracted production year '{production_year}' from {response.url}"
@@ -587,13 +868,12 @@ def _fetch_detail_metadata(shared_state, source_url, headers, current_host):
             debug(
                 f"{hostname.upper()} extracted size {size_mb} MB from {response.url}"
             )
-        if title:
-            detail_title = title
-        identity.update(_extract_identity(text))
+        parsed = True
     except Exception as exc:
+        parsed = False
         debug(f"{hostname.upper()} failed to parse detail page {response.url}: {exc}")
 
-    return (
+    metadata = (
         updated_host,
         production_year,
         size_mb,
@@ -605,6 +885,15 @@ def _fetch_detail_metadata(shared_state, source_url, headers, current_host):
         filename_year,
         identity,
     )
+    # Page de défi Cloudflare, gabarit « page introuvable », page tronquée :
+    # rien d'exploitable, elle ne doit ni rester une semaine en base ni être
+    # rejouée par le mémo de saison.
+    if not parsed or not (detail_title or download_entries):
+        if parsed:
+            debug(f"{hostname.upper()} detail page {response.url} has no title nor links, not storing it")
+        return _DetailUnavailable(metadata)
+    _store_detail_metadata(shared_state, source_url, metadata)
+    return metadata
 
 
 def _strip_parenthetical_content(text):
@@ -976,6 +1265,31 @@ def _attach_episode_fragment(url, episode):
     return urlunparse(parsed._replace(fragment=updated_fragment))
 
 
+# Ce que la recherche lit d'une carte de page listing. ``title`` vaut None
+# quand la carte n'a pas de lien de titre.
+_ListingCard = namedtuple("_ListingCard", ("title", "href", "quality", "published"))
+
+
+def _listing_cards(soup):
+    cards = []
+    for card in soup.select("div.cover_global"):
+        title_link = card.select_one("div.cover_infos_title a")
+        quality_tag = card.select_one("span.detail_release")
+        time_tag = card.find("time")
+        cards.append(_ListingCard(
+            title=title_link.get_text(strip=True) if title_link else None,
+            href=title_link.get("href", "").strip() if title_link else "",
+            quality=quality_tag.get_text(" ", strip=True) if quality_tag else "",
+            published=time_tag.get_text(strip=True) if time_tag else "",
+        ))
+    return cards
+
+
+def _parse_listing(markup):
+    """Cartes d'une page listing (exécutable dans ``parse_pool``)."""
+    return _listing_cards(html_parser.parse(markup))
+
+
 def _parse_results(shared_state,
                    soup,
                    base_url,
@@ -986,19 +1300,43 @@ def _parse_results(shared_state,
                    search_string=None,
                    season=None,
                    episode=None,
-                   imdb_id=None):
+                   imdb_id=None,
+                   cancel=None,
+                   metadata_cache=None,
+                   cards=None,
+                   validator=None,
+                   errors=None):
+    """Releases des cartes d'une page listing.
+
+    ``cards`` : cartes déjà extraites (``_parse_listing``) ; à défaut, elles
+    sont lues dans ``soup``. ``validator`` : validateur de la recherche
+    (``shared_state.release_validator``), partagé entre les pages d'un même
+    flux ; à défaut, il est construit pour cette page. ``errors`` : liste où
+    noter les pages de détail restées illisibles (erreur réseau ou HTTP).
+    """
     releases = []
     category_id = _get_newznab_category_id(request_from)
     request_lower = (request_from or "").lower()
     request_is_sonarr = "sonarr" in request_lower
-    cards = soup.select("div.cover_global")
+    if cards is None:
+        cards = _listing_cards(soup)
 
     debug(
         f"{hostname.upper()} parsing {len(cards)} cards from {base_url} "
         f"(requester={request_from}, mirror={mirror})"
     )
 
-    metadata_cache = {}
+    # Un dict fourni par l'appelant (mémo de saison) est complété en place.
+    if metadata_cache is None:
+        metadata_cache = {}
+
+    if validator is None and search_string is not None:
+        validator = shared_state.release_validator(request_from, search_string, season, episode)
+    # Sonarr : un titre valide au niveau saison peut nécessiter la page de
+    # détail pour confirmer l'épisode.
+    season_validator = None
+    if validator is not None and request_is_sonarr and season is not None and episode is not None:
+        season_validator = validator.season_only()
 
     try:
         requested_season_num = int(season) if season is not None else None
@@ -1021,83 +1359,65 @@ def _parse_results(shared_state,
     # boucle reste seule juge : si elle est trop large on charge une page pour
     # rien, si elle est trop stricte la boucle retombe sur le chargement
     # paresseux. Dans les deux cas le résultat est identique.
+    #
+    # Chaque page part dès que sa carte est vue ; la boucle principale consomme
+    # les résultats dans l'ordre des cartes et traite la première dès qu'elle
+    # est arrivée, sans attendre les autres.
+    pending_details = {}
     if headers is not None:
-        detail_urls = []
-        for card in cards:
-            title_link = card.select_one("div.cover_infos_title a")
-            if not title_link:
-                continue
-            raw_title = title_link.get_text(strip=True)
-            if not raw_title:
-                continue
-
-            if search_string is not None:
-                valid, _ = shared_state.is_valid_release(
-                    raw_title, request_from, search_string, season, episode,
+        def _prefetch(url):
+            try:
+                return _fetch_detail_metadata(
+                    shared_state, url, headers, current_host, cancel, errors,
                 )
-                if not valid:
-                    # Sonarr : un titre valide au niveau saison peut nécessiter
-                    # la page de détail pour confirmer l'épisode.
-                    if not (request_is_sonarr and season is not None and episode is not None):
-                        continue
-                    season_only_valid, _ = shared_state.is_valid_release(
-                        raw_title, request_from, search_string, season, None,
-                    )
-                    if not season_only_valid:
-                        continue
+            except SearchCancelled:
+                raise
+            except Exception as exc:  # ne jamais faire tomber tout le flux
+                debug(f"{hostname.upper()} detail prefetch failed for {url}: {exc}")
+                return None
+
+        titled = [card for card in cards if card.title]
+        verdicts = (validator.validate_all([card.title for card in titled])
+                    if validator is not None else [(True, None)] * len(titled))
+        for card, (valid, _) in zip(titled, verdicts):
+            if not valid:
+                if season_validator is None:
+                    continue
+                season_only_valid, _ = season_validator.validate(card.title)
+                if not season_only_valid:
+                    continue
 
-            href = title_link.get("href", "").strip()
+            href = card.href
             if not href:
                 continue
             source = urljoin(base_url, href)
-            if source not in detail_urls:
-                detail_urls.append(source)
+            if source not in pending_details and source not in metadata_cache:
+                pending_details[source] = search_scheduler.submit(hostname, _prefetch, source)
 
-        if detail_urls:
-            def _prefetch(url):
-                try:
-                    return url, _fetch_detail_metadata(
-                        shared_state, url, headers, current_host,
-                    )
-                except Exception as exc:  # ne jamais faire tomber tout le flux
-                    debug(f"{hostname.upper()} detail prefetch failed for {url}: {exc}")
-                    return url, None
-
-            workers = min(DETAIL_PREFETCH_WORKERS, len(detail_urls))
+        if pending_details:
             debug(
-                f"{hostname.upper()} prefetching {len(detail_urls)} detail pages "
-                f"with {workers} workers for {base_url}"
+                f"{hostname.upper()} prefetching {len(pending_details)} detail pages "
+                f"for {base_url}"
             )
-            with ThreadPoolExecutor(max_workers=workers) as pool:
-                for url, meta in pool.map(_prefetch, detail_urls):
-                    if meta is not None:
-                        metadata_cache[url] = meta
 
     for card in cards:
+        raise_if_cancelled(cancel)
         try:
-            title_link = card.select_one("div.cover_infos_title a")
-            if not title_link:
+            if card.title is None:
                 debug(f"{hostname.upper()} skipping card without title link on {base_url}")
                 continue
-            raw_title = title_link.get_text(strip=True)
+            raw_title = card.title
             if not raw_title:
                 debug(f"{hostname.upper()} skipping card with empty title on {base_url}")
                 continue
 
             require_episode_verification = False
-            if search_string is not None:
-                valid, reject_reason = shared_state.is_valid_release(
-                    raw_title, request_from, search_string, season, episode,
-                )
+            if validator is not None:
+                # Verdicts déjà calculés par la passe de préchargement.
+                valid, reject_reason = validator.validate(raw_title)
                 if not valid:
-                    if (
-                        request_is_sonarr
-                        and season is not None
-                        and episode is not None
-                    ):
-                        valid_season_only, _ = shared_state.is_valid_release(
-                            raw_title, request_from, search_string, season, None,
-                        )
+                    if season_validator is not None:
+                        valid_season_only, _ = season_validator.validate(raw_title)
                         if valid_season_only:
                             require_episode_verification = True
                     if not require_episode_verification:
@@ -1111,20 +1431,16 @@ def _parse_results(shared_state,
             else:
                 title = shared_state.normalize_localized_season_episode_tags(raw_title)
 
-            quality = ""
-            quality_tag = card.select_one("span.detail_release")
-            if quality_tag:
-                quality = quality_tag.get_text(" ", strip=True)
+            quality = card.quality
 
-            href = title_link.get("href", "").strip()
+            href = card.href
             if not href:
                 debug(f"{hostname.upper()} skipping '{title}' because no href was found")
                 continue
 
             source = urljoin(base_url, href)
 
-            time_tag = card.find("time")
-            published = time_tag.get_text(strip=True) if time_tag else ""
+            published = card.published
             from datetime import datetime, timezone, timedelta
 
             mois_fr = {
@@ -1154,13 +1470,22 @@ def _parse_results(shared_state,
             detail_identity = {}
 
             if headers is not None:
-                if source not in metadata_cache:
-                    metadata_cache[source] = _fetch_detail_metadata(
+                meta = metadata_cache.get(source)
+                if meta is None and source in pending_details:
+                    meta = search_scheduler.join(pending_details.pop(source))
+                if meta is None:
+                    meta = _fetch_detail_metadata(
                         shared_state,
                         source,
                         headers,
                         current_host,
+                        cancel,
+                        errors,
                     )
+                # Une page non chargée sert à cette carte, pas aux recherches
+                # suivantes : elles la redemanderont.
+                if not isinstance(meta, _DetailUnavailable):
+                    metadata_cache[source] = meta
                 (
                     updated_host,
                     detail_year,
@@ -1172,7 +1497,7 @@ def _parse_results(shared_state,
                     detail_original_title,
                     detail_filename_year,
                     detail_identity,
-                ) = metadata_cache[source]
+                ) = meta
                 if updated_host:
                     current_host = updated_host
                 if detail_title:
@@ -1666,10 +1991,19 @@ def _parse_results(shared_state,
                 debug(
                     f"{hostname.upper()} no eligible download entries remained for '{title}'"
                 )
+        except SearchCancelled:
+            raise
         except Exception as exc:
             error(f"Error parsing {hostname.upper()} card: {exc}", source="zt")
             continue
 
+    # Pages préchargées que la boucle n'a pas consommées : elles restent utiles
+    # au mémo de saison.
+    for source, future in pending_details.items():
+        meta = search_scheduler.join(future)
+        if meta is not None and not isinstance(meta, _DetailUnavailable):
+            metadata_cache[source] = meta
+
     debug(f"{hostname.upper()} generated {len(releases)} releases from {base_url}")
     return releases
 
@@ -1698,7 +2032,7 @@ def _get_newznab_category_id(request_from):
     return None
 
 
-def zt_feed(shared_state, start_time, request_from, mirror=None):
+def zt_feed(shared_state, start_time, request_from, mirror=None, cancel=None):
     releases = []
     categories = _get_category(request_from)
     if not categories:
@@ -1706,7 +2040,7 @@ def zt_feed(shared_state, start_time, request_from, mirror=None):
         return releases
 
     config = shared_state.values["config"]("Hostnames")
-    zt = config.get(hostname)
+    zt = host_redirects.resolve_host(hostname, config.get(hostname))
     if not zt:
         info(f"{hostname.upper()} host missing in configuration. Feed aborted for requester '{request_from}'.")
         return releases
@@ -1722,17 +2056,21 @@ def zt_feed(shared_state, start_time, request_from, mirror=None):
         )
 
         try:
-            response = _zt_get(url, headers=headers, timeout=10)
+            response = _zt_get(url, headers=headers, timeout=10, cancel=cancel,
+                               stop=_listing_complete)
             response.raise_for_status()
             zt = _update_hostname(shared_state, zt, response.url)
-            soup = BeautifulSoup(response.text, "html.parser")
             releases = _parse_results(shared_state,
-                                    soup,
+                                    None,
                                     response.url,
                                     request_from,
                                     mirror,
-                                    headers,zt)
+                                    headers,zt,
+                                    cancel=cancel,
+                                    cards=parse_pool.run(_parse_listing, response.text))
             releases_all.extend(releases)
+        except SearchCancelled:
+            raise
         except Exception as exc:
             message = f"Error loading {hostname.upper()} feed: {exc}"
             info(message)
@@ -1748,7 +2086,8 @@ def zt_search(shared_state,
               search_string,
               mirror=None,
               season=None,
-              episode=None):
+              episode=None,
+              cancel=None):
     releases = []
     imdb_id = shared_state.is_imdb_id(search_string)
     if imdb_id:
@@ -1759,7 +2098,7 @@ def zt_search(shared_state,
         return releases
 
     config = shared_state.values["config"]("Hostnames")
-    zt = config.get(hostname)
+    zt = host_redirects.resolve_host(hostname, config.get(hostname))
     if not zt:
         info(f"{hostname.upper()} host missing in configuration. Search aborted for '{search_string}'.")
         return releases
@@ -1781,6 +2120,9 @@ def zt_search(shared_state,
 
     seen_links = set()
     aggregated_releases = []
+    detail_errors = []  # partagée par les flux : list.append est atomique
+    crawl = _season_crawl(imdb_id, season)
+    metadata_cache = crawl.metadata if crawl is not None else None
 
     def run_stream(raw_query, category):
         """Parcourt la pagination d'un couple (requête, catégorie).
@@ -1800,7 +2142,15 @@ def zt_search(shared_state,
         found_any_release = False
         diff_page = 3
 
+        # Page suivante demandée pendant l'analyse de la page courante : on ne
+        # sait qu'après cette analyse s'il la faut vraiment, au pire elle part
+        # pour rien une fois en fin de pagination.
+        next_page = None
+        # Verdicts de titre mémorisés d'une page à l'autre du flux.
+        validator = shared_state.release_validator(request_from, raw_query, season, episode)
+
         while page < 10:
+            raise_if_cancelled(cancel)
             url = f"https://{current_host}/?p={category}&search={q}&page={page}"
             headers = {"User-Agent": shared_state.values["user_agent"]}
 
@@ -1810,16 +2160,24 @@ def zt_search(shared_state,
             )
 
             try:
-                response = _zt_get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-                current_host = _update_hostname(shared_state, current_host, response.url)
-                soup = BeautifulSoup(response.text, "html.parser")
-                cards = soup.select("div.cover_global")
+                if next_page is not None and next_page[0] == url:
+                    final_url, cards, more = search_scheduler.join(next_page[1])
+                else:
+                    final_url, cards, more = _crawl_page(crawl, url, headers, cancel)
+                next_page = None
+                current_host = _update_hostname(shared_state, current_host, final_url)
                 debug(f"{hostname.upper()} found {len(cards)} cards on page {page}", source="zt")
+                # Dernière page (courte, sans lien vers la suivante) : rien à
+                # précharger, et la pagination s'arrête après elle.
+                if more and page + 1 < 10:
+                    next_url = f"https://{current_host}/?p={category}&search={q}&page={page + 1}"
+                    next_page = (next_url, search_scheduler.submit(
+                        hostname, _crawl_page, crawl, next_url, headers, cancel,
+                    ))
                 found = _parse_results(
                     shared_state,
-                    soup,
-                    response.url,
+                    None,
+                    final_url,
                     request_from,
                     mirror,
                     headers,
@@ -1828,6 +2186,11 @@ def zt_search(shared_state,
                     season=season,
                     episode=episode,
                     imdb_id=imdb_id,
+                    cancel=cancel,
+                    metadata_cache=metadata_cache,
+                    cards=cards,
+                    validator=validator,
+                    errors=detail_errors,
                 )
                 collected.extend(found)
                 matched_on_page = len(found)
@@ -1836,7 +2199,7 @@ def zt_search(shared_state,
                     found_any_release = True
                     diff_page = 3
 
-                if not cards:
+                if not cards or not more:
                     break
 
                 if matched_on_page == 0 and found_any_release:
@@ -1845,6 +2208,8 @@ def zt_search(shared_state,
                     diff_page -= 1
 
                 page += 1
+            except SearchCancelled:
+                raise
             except Exception as exc:
                 message = f"Error loading {hostname.upper()} search: {exc}"
                 info(message)
@@ -1902,15 +2267,13 @@ def zt_search(shared_state,
     streams = [(q, category) for q in queries if searchable(q) for category in categories]
 
     if streams:
-        workers = min(SEARCH_STREAM_WORKERS, len(streams))
         debug(
             f"{hostname.upper()} running {len(streams)} search streams "
-            f"({len(queries)} queries x {len(categories)} categories) with {workers} workers"
+            f"({len(queries)} queries x {len(categories)} categories)"
         )
-        with ThreadPoolExecutor(max_workers=workers) as pool:
-            # pool.map conserve l'ordre : le résultat final reste celui de la
-            # version séquentielle, à déduplication identique.
-            stream_results = list(pool.map(lambda sc: run_stream(*sc), streams))
+        # map conserve l'ordre : le résultat final reste celui de la version
+        # séquentielle, à déduplication identique.
+        stream_results = search_scheduler.map(hostname, lambda sc: run_stream(*sc), streams)
 
         for collected in stream_results:
             for release in collected:
@@ -1923,4 +2286,8 @@ def zt_search(shared_state,
     log_event("search_complete", source="zt", level="INFO",
               query=search_string, results_count=len(aggregated_releases),
               time_seconds=round(time.time() - start_time, 2))
+    # Quelques pages de détail perdues n'invalident pas une recherche qui a
+    # trouvé des releases ; sans aucune, l'absence n'est pas établie.
+    if detail_errors and not aggregated_releases:
+        return failed(aggregated_releases, detail_errors[0])
     return aggregated_releases
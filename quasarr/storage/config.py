@@ -49,6 +49,13 @@ class Config(object):
         'FlareSolverr': [
             ("url", "str", ""),
         ],
+        # Réglages du moteur de recherche ; vide = valeur par défaut du code.
+        'Search': [
+            ("anime_zt_delay_seconds", "str", ""),
+            ("prewarm_site_interval_seconds", "str", ""),
+            ("host_rate_limits", "str", ""),
+            ("parse_processes", "str", ""),
+        ],
         # Accès en lecture seule à Radarr/Sonarr pour la page "manquants
         # introuvables" : Quasarr y lit la liste des titres voulus et la
         # blocklist. Aucune écriture n'est faite dans Radarr/Sonarr.
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Banc d'essai des moteurs d'analyse HTML sur les fixtures zt.
+
+Pour chaque page de ``tests/fixtures/zt`` (cas de non-régression compris) et
+chaque moteur installé, affiche le temps médian d'analyse, puis vérifie que
+l'extraction zt (cartes du listing, liens et métadonnées des pages de détail)
+est identique à celle obtenue avec ``html.parser``.
+
+  python tests/bench_html_parser.py
+  python tests/bench_html_parser.py --repeat 50 --backend lxml
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Importer quasarr exige une clé 2captcha, inutile ici (cf. conftest.py).
+os.environ.setdefault("API_KEY", "bench_dummy_key")
+
+from quasarr.providers import html_parser  # noqa: E402
+from quasarr.search.sources import zt  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "zt"
+
+
+def _pages():
+    return sorted(FIXTURES_DIR.rglob("*.html"))
+
+
+def _extract(soup):
+    """Ce que zt lit d'une page : identique d'un moteur à l'autre ou pas."""
+    cards = [card.select_one("div.cover_infos_title a") for card in soup.select("div.cover_global")]
+    text = soup.get_text(" ", strip=True)
+    return {
+        "cards": [(a.get_text(strip=True), a.get("href")) if a else None for a in cards],
+        "title": zt._extract_detail_title(soup),
+        "original_title": zt._extract_original_title(soup),
+        "year": zt._extract_year_from_highlight(soup),
+        "production_year": zt._extract_production_year(text),
+        "quality": zt._extract_quality_language_tokens(soup),
+        "entries": zt._collect_download_entries(soup, "https://zt.test/"),
+        "identity": zt._extract_identity(text),
+    }
+
+
+def _time(markup, backend, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        html_parser.parse(markup, backend)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="analyses par page et par moteur")
+    parser.add_argument("--backend", action="append", help="moteur à mesurer (répétable)")
+    args = parser.parse_args()
+
+    requested = args.backend or html_parser.PREFERRED_BACKENDS
+    backends = [name for name in requested if html_parser.is_available(name)]
+    missing = [name for name in requested if name not in backends]
+    if missing:
+        print(f"Not installed: {', '.join(missing)}")
+    if not backends:
+        return 1
+
+    pages = _pages()
+    width = max(len(str(page.relative_to(FIXTURES_DIR))) for page in pages)
+    print(f"{'page':<{width}}  " + "  ".join(f"{name:>12}" for name in backends))
+
+    totals = dict.fromkeys(backends, 0.0)
+    mismatches = []
+    for page in pages:
+        markup = page.read_text(encoding="utf-8")
+        reference = _extract(html_parser.parse(markup, html_parser.FALLBACK_BACKEND))
+        row = []
+        for name in backends:
+            elapsed = _time(markup, name, args.repeat)
+            totals[name] += elapsed
+            row.append(f"{elapsed:>9.2f} ms")
+            if name != html_parser.FALLBACK_BACKEND and _extract(html_parser.parse(markup, name)) != reference:
+                mismatches.append((page.relative_to(FIXTURES_DIR), name))
+        print(f"{str(page.relative_to(FIXTURES_DIR)):<{width}}  " + "  ".join(row))
+
+    print(f"{'total':<{width}}  " + "  ".join(f"{totals[name]:>9.2f} ms" for name in backends))
+    for page, name in mismatches:
+        print(f"MISMATCH: {name} extracts different data from {page}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
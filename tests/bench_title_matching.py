@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Banc d'essai de la comparaison de titres, avec seuils de non-régression.
+
+Mesure le débit (appels par seconde) de ``sanitize_string``,
+``search_string_in_sanitized_title``, ``is_valid_release``, ``match_in_title``
+et ``normalize_magazine_title`` sur un corpus fait des titres des fixtures zt
+(cartes des pages listing, titres des pages de détail, requêtes des cas de
+non-régression) et de titres de release synthétiques, générés à graine fixe.
+
+Les caches de ``title_normalization`` sont vidés avant chaque passe : on
+mesure la première comparaison d'une page, pas une relecture de cache.
+
+Le débit de chaque fonction est comparé à ``bench_title_matching.json`` ; un
+débit inférieur de plus de ``--tolerance`` à la référence fait échouer le
+banc (code 1). La référence dépend de la machine : la régénérer avec
+``--update-baseline`` après un changement de machine ou une optimisation.
+
+  python tests/bench_title_matching.py
+  python tests/bench_title_matching.py --repeat 10 --tolerance 0.2
+  python tests/bench_title_matching.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Importer quasarr exige une clé 2captcha, inutile ici (cf. conftest.py).
+os.environ.setdefault("API_KEY", "bench_dummy_key")
+
+from quasarr.providers import html_parser, shared_state, title_normalization  # noqa: E402
+from quasarr.search.sources import zt  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "zt"
+BASELINE_PATH = Path(__file__).with_suffix(".json")
+
+SEED = 1337
+SYNTHETIC_TITLES = 3000
+DEFAULT_TOLERANCE = 0.3
+
+_WORDS = [
+    "Inception", "Intouchables", "Breaking", "Bad", "One", "Piece", "Dune", "Partie", "Deux",
+    "Le", "La", "Les", "The", "Of", "Seigneur", "Anneaux", "Cœur", "Élève", "Straße", "Gardiens",
+    "Galaxie", "Vol.", "II", "III", "Rocky", "Naruto", "Shippuden", "Film", "Navy", "CIS", "Barbie",
+    "Princesse", "Royales", "Légende", "Pierre", "Strong", "World", "Heart", "Gold", "Sp", "Et",
+]
+_TAGS = [
+    "FRENCH.1080p.WEB.H264-GRP", "MULTi.2160p.UHD.BluRay.x265-HDR", "TRUEFRENCH.720p.HDTV.x264-TEAM",
+    "VOSTFR.1080p.WEBRip.AAC-ANIME", "FRENCH.DVDRIP.XviD-OLD",
+]
+_MAGAZINES = ["Der.Spiegel", "Auto.Motor.und.Sport", "c't", "Chip", "Computer.Bild", "Stern"]
+_REQUESTERS = ["Radarr/5.2", "Sonarr/4.0", "LazyLibrarian"]
+
+
+def _fixture_titles():
+    titles, queries = [], []
+    for page in sorted(FIXTURES_DIR.rglob("*.html")):
+        soup = html_parser.parse(page.read_text(encoding="utf-8"))
+        titles.extend(link.get_text(strip=True)
+                      for link in soup.select("div.cover_global div.cover_infos_title a"))
+        detail_title = zt._extract_detail_title(soup)
+        if detail_title:
+            titles.append(detail_title)
+    for manifest in sorted(FIXTURES_DIR.rglob("manifest.json")):
+        search_string = json.loads(manifest.read_text(encoding="utf-8")).get("search_string")
+        if search_string:
+            queries.append(search_string)
+    return titles, queries
+
+
+def build_corpus(size=SYNTHETIC_TITLES, seed=SEED):
+    """Corpus déterministe : titres, couples (requête, titre) et magazines."""
+    rng = random.Random(seed)
+    fixture_titles, fixture_queries = _fixture_titles()
+
+    names = list(fixture_titles)
+    while len(names) < size:
+        names.append(" ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 6))))
+
+    titles = []
+    for name in names:
+        shape = rng.random()
+        if shape < 0.4:
+            suffix = f"S{rng.randint(1, 12):02d}E{rng.randint(1, 24):02d}"
+        elif shape < 0.5:
+            suffix = f"Saison {rng.randint(1, 12)} Episode {rng.randint(1, 24)}"
+        else:
+            suffix = str(rng.randint(1960, 2026))
+        titles.append(f"{name}.{suffix}.{rng.choice(_TAGS)}".replace(" ", "."))
+
+    queries = fixture_queries + [names[rng.randrange(len(names))] for _ in range(32)]
+    pairs = []
+    for title in titles:
+        query = rng.choice(queries)
+        season = rng.choice([None, rng.randint(1, 12)])
+        episode = rng.choice([None, rng.randint(1, 24)]) if season else None
+        pairs.append((query, title, rng.choice(_REQUESTERS), season, episode))
+
+    magazines = [
+        f"{rng.choice(_MAGAZINES)}.{rng.choice(['No', 'Nr', 'Sonderheft'])}."
+        f"{rng.randint(1, 12)}.{rng.randint(2015, 2026)}"
+        if rng.random() < 0.5 else
+        f"{rng.choice(_MAGAZINES)}.{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(2015, 2026)}"
+        for _ in range(size // 4)
+    ]
+    return {"titles": titles, "pairs": pairs, "magazines": magazines}
+
+
+def _cases(corpus):
+    titles, pairs, magazines = corpus["titles"], corpus["pairs"], corpus["magazines"]
+    return {
+        "sanitize_string": lambda: [shared_state.sanitize_string(title) for title in titles],
+        "search_string_in_sanitized_title": lambda: [
+            shared_state.search_string_in_sanitized_title(query, title)
+            for query, title, _, _, _ in pairs],
+        "is_valid_release": lambda: [
+            shared_state.is_valid_release(title, request_from, query, season, episode)
+            for query, title, request_from, season, episode in pairs],
+        "match_in_title": lambda: [
+            shared_state.match_in_title(title, season, episode)
+            for _, title, _, season, episode in pairs],
+        "normalize_magazine_title": lambda: [
+            shared_state.normalize_magazine_title(title) for title in magazines],
+    }
+
+
+def run(corpus=None, repeat=5):
+    """Débit de chaque fonction (appels/s), meilleure de ``repeat`` passes
+    (après une passe de chauffe non mesurée)."""
+    corpus = corpus or build_corpus()
+    results = {}
+    for name, case in _cases(corpus).items():
+        case()
+        best = None
+        calls = 0
+        for _ in range(repeat):
+            title_normalization.clear_caches()
+            started = time.perf_counter()
+            calls = len(case())
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = calls / best if best else float("inf")
+    return results
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """``{fonction: (débit, référence)}`` pour chaque débit sous le seuil."""
+    return {
+        name: (ops, baseline[name])
+        for name, ops in results.items()
+        if name in baseline and ops < baseline[name] * (1 - tolerance)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="passes par fonction (la meilleure compte)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="baisse de débit tolérée par rapport à la référence (0.3 = 30 %%)")
+    parser.add_argument("--update-baseline", action="store_true", help="enregistre ces mesures comme référence")
+    args = parser.parse_args()
+
+    corpus = build_corpus()
+    print(f"corpus: {len(corpus['titles'])} titles, {len(corpus['pairs'])} pairs, "
+          f"{len(corpus['magazines'])} magazines")
+    results = run(corpus, args.repeat)
+    baseline = load_baseline()
+
+    width = max(len(name) for name in results)
+    print(f"{'function':<{width}}  {'ops/sec':>12}  {'baseline':>12}  {'change':>8}")
+    for name, ops in results.items():
+        reference = baseline.get(name)
+        if reference:
+            print(f"{name:<{width}}  {ops:>12,.0f}  {reference:>12,.0f}  {(ops / reference - 1) * 100:+7.1f}%")
+        else:
+            print(f"{name:<{width}}  {ops:>12,.0f}  {'-':>12}")
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps({name: round(ops) for name, ops in results.items()},
+                                            indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    failed = regressions(results, baseline, args.tolerance)
+    for name, (ops, reference) in failed.items():
+        print(f"REGRESSION: {name} at {ops:,.0f} ops/sec, baseline {reference:,.0f} "
+              f"(tolerance {args.tolerance:.0%})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,7 +36,8 @@ class MockSharedState:
 
     Provides:
       - values dict with 'internal_address', 'user_agent', 'config'
-      - convert_to_mb, is_valid_release, normalize_localized_season_episode_tags,
+      - convert_to_mb, is_valid_release, release_validator,
+        normalize_localized_season_episode_tags,
         normalize_magazine_title, is_imdb_id  (delegating to real implementations)
     """
 
@@ -61,6 +62,11 @@ class MockSharedState:
         from quasarr.providers.shared_state import is_valid_release
         return is_valid_release(title, request_from, search_string, season, episode)
 
+    @staticmethod
+    def release_validator(request_from, search_string, season=None, episode=None):
+        from quasarr.providers.shared_state import release_validator
+        return release_validator(request_from, search_string, season, episode)
+
     @staticmethod
     def normalize_localized_season_episode_tags(title):
         from quasarr.providers.shared_state import normalize_localized_season_episode_tags
@@ -81,3 +87,69 @@ class MockSharedState:
 def shared_state():
     """Return a fresh MockSharedState for each test."""
     return MockSharedState()
+
+
+# Clés des sources de recherche dans la section Hostnames.
+SEARCH_SOURCES = ("al", "am", "by", "dd", "dt", "dw", "fx", "mb", "nx", "sf", "sl", "wd", "zt")
+
+
+@pytest.fixture
+def only_sources(shared_state):
+    """Ne déclare que les sources demandées, les autres restent vides.
+
+    ``only_sources("sf", "zt")`` leur donne l'hôte ``<clé>.test`` ; un hôte
+    précis se passe par mot-clé : ``only_sources("zt", am="anime-sama.test")``.
+    Renvoie ``shared_state``.
+    """
+
+    def configure(*keys, **hosts):
+        hostnames = shared_state.values["config"]("Hostnames")
+        hosts = {**{key: f"{key}.test" for key in keys}, **hosts}
+        for key in SEARCH_SOURCES:
+            hostnames.save(key, hosts.get(key, ""))
+        return shared_state
+
+    return configure
+
+
+@pytest.fixture
+def only_zt(only_sources):
+    """Config ne déclarant que zt."""
+    return only_sources("zt")
+
+
+@pytest.fixture(autouse=True)
+def _unthrottled_sources(monkeypatch):
+    """Les tests simulent le réseau : pas de limite de débit (testée à part)."""
+    from quasarr.search.politeness import HostLimit, PolitenessScheduler
+    from quasarr.search.sources import am, zt
+    unthrottled = PolitenessScheduler(limits={}, default=HostLimit(rate=1e6, burst=1e6, concurrency=64))
+    monkeypatch.setattr(am, "politeness", unthrottled)
+    monkeypatch.setattr(zt, "politeness", unthrottled)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_search_cache():
+    """Caches et santé des sources sont globaux au process : chaque test part à vide."""
+    from quasarr.providers import host_redirects, metadata_cache
+    from quasarr.search.cache import result_cache
+    from quasarr.search import detail_store, negative_cache
+    from quasarr.search.health import source_health
+    from quasarr.search.sources import am, zt
+    result_cache.clear()
+    source_health.clear()
+    negative_cache.invalidate_cache()
+    detail_store.invalidate_cache()
+    host_redirects.invalidate_cache()
+    metadata_cache.invalidate_cache()
+    am.clear_caches()
+    zt.clear_season_crawls()
+    yield
+    result_cache.clear()
+    source_health.clear()
+    negative_cache.invalidate_cache()
+    detail_store.invalidate_cache()
+    host_redirects.invalidate_cache()
+    metadata_cache.invalidate_cache()
+    am.clear_caches()
+    zt.clear_season_crawls()
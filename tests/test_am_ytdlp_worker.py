@@ -140,23 +140,53 @@ def test_sonarr_response_monitor_keeps_exact_queue_and_history_payloads():
     assert captured["queue"]["requester"] == "Sonarr/4.0"
 
 
-def test_am_page_load_uses_random_jitter(monkeypatch):
-    waits = []
+def test_am_page_load_goes_through_the_rate_limit(monkeypatch):
     calls = []
     response = object()
-    monkeypatch.setattr(am.random, "uniform", lambda low, high: 2.4)
-    monkeypatch.setattr(am.time, "sleep", waits.append)
+    slots = []
     monkeypatch.setattr(
-        am.requests,
+        am.http_client,
         "request",
         lambda method, url, **kwargs: calls.append((method, url, kwargs)) or response,
     )
+    real_slot = am.politeness.slot
+    monkeypatch.setattr(am.politeness, "slot",
+                        lambda host, cancel=None: slots.append(host) or real_slot(host, cancel))
 
     assert am._am_request("GET", "https://anime.invalid/page", timeout=10) is response
-    assert waits == [2.4]
+    assert slots == ["am"]
     assert calls == [("GET", "https://anime.invalid/page", {"timeout": 10})]
 
 
+def test_download_resolution_skips_search_rate_limit_and_http_cache(monkeypatch):
+    # Un grab relit episodes.js à chaque fois, sans attendre de jeton "am".
+    download_am._REWRITE_CACHE.clear()
+    fetched = []
+    bodies = {
+        "episodes.js": "var eps1 = ['https://vidmoly.to/embed-a', 'https://vidmoly.to/embed-b'];",
+        "vostfr/": "<html>pas de script vidéo</html>",
+    }
+
+    def fake_get(url, **kwargs):
+        fetched.append(url)
+        body = next(text for suffix, text in bodies.items() if url.endswith(suffix))
+        return SimpleNamespace(url=url, text=body, raise_for_status=lambda: None)
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("download went through the search request path")
+
+    monkeypatch.setattr(download_am.http_client, "get", fake_get)
+    monkeypatch.setattr(am.politeness, "slot", forbidden)
+    monkeypatch.setattr(am.http_cache, "get", forbidden)
+    hostnames = SimpleNamespace(get=lambda key: "anime-sama.test", save=forbidden)
+    state = SimpleNamespace(values={"config": lambda section: hostnames, "user_agent": "Quasarr tests"})
+    url = "https://anime-sama.test/catalogue/frieren/saison1/vostfr/#episode=2"
+
+    assert download_am.get_am_download_links(state, url, None, "Frieren") == ["https://vidmoly.to/embed-b"]
+    assert download_am.get_am_download_links(state, url, None, "Frieren") == ["https://vidmoly.to/embed-b"]
+    assert fetched.count("https://anime-sama.test/catalogue/frieren/saison1/vostfr/episodes.js") == 2
+
+
 def test_episode_label_parser_accepts_only_exact_episode_number():
     assert am._strict_episode_number("EPISODE 8") == 8
     assert am._strict_episode_number(" episode 12 ") == 12
@@ -1109,7 +1139,7 @@ def test_requested_am_player_is_the_only_download_candidate(monkeypatch):
     )
     config = SimpleNamespace(get=lambda _key: "anime-sama.invalid")
     state = SimpleNamespace(values={"config": lambda _section: config, "user_agent": "test"})
-    monkeypatch.setattr(download_am, "_am_request", lambda *_args, **_kwargs: response)
+    monkeypatch.setattr(download_am, "_am_get", lambda *_args, **_kwargs: response)
     monkeypatch.setattr(download_am, "_update_hostname", lambda *_args: "anime-sama.invalid")
     monkeypatch.setattr(download_am, "is_player_enabled", lambda *_args: True)
 
@@ -1515,12 +1545,12 @@ def test_vidmoly_to_link_is_rewritten_to_biz_before_download(monkeypatch):
         def raise_for_status(self):
             return None
 
-    def fake_request(_method, url, **_kwargs):
+    def fake_request(url, **_kwargs):
         if "videos.js" in url:
             return Resp(videos_js, url)
         return Resp(page_html, "https://anime-sama.to/catalogue/fire-force/saison2/vostfr/")
 
-    monkeypatch.setattr(download_am, "_am_request", fake_request)
+    monkeypatch.setattr(download_am, "_am_get", fake_request)
     try:
         rewritten = download_am._apply_site_iframe_rewrites(
             None,
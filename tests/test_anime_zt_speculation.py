@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""zt spéculatif pour les animes.
+
+zt n'était lancé qu'après la réponse (vide) d'anime-sama : la latence d'une
+recherche anime était la somme des deux. Il part désormais en parallèle après
+``anime_zt_delay_seconds``, et il est écarté dès qu'anime-sama trouve quelque
+chose.
+"""
+
+import threading
+import time
+
+import pytest
+
+import quasarr.search as search
+from quasarr.search.health import source_health
+
+
+@pytest.fixture
+def anime_search(only_sources, shared_state, monkeypatch):
+    only_sources("zt", am="anime-sama.test")
+    shared_state.values["config"]("Hostnames").save("anime_zt_delay_seconds", "0.1")
+    monkeypatch.setattr(search, "is_anime", lambda ss, imdb_id: True)
+    return shared_state
+
+
+def _slow(seconds, releases):
+    def source(*args, **kwargs):
+        time.sleep(seconds)
+        return releases
+    return source
+
+
+class TestSpeculativeStart:
+    def test_zt_overlaps_a_slow_empty_anime_sama(self, monkeypatch, anime_search):
+        monkeypatch.setattr(search, "am_search", _slow(0.6, []))
+        monkeypatch.setattr(search, "zt_search", _slow(0.6, [{"details": {"hostname": "zt", "title": "zt"}}]))
+
+        started = time.time()
+        results = search.get_search_results(anime_search, "Sonarr/4", imdb_id="tt0409591",
+                                            season="1", episode="1")
+        elapsed = time.time() - started
+
+        assert [r["details"]["title"] for r in results] == ["zt"]
+        assert elapsed < 1.1, f"zt attendu en parallèle d'anime-sama ({elapsed:.2f}s)"
+
+    def test_anime_sama_hits_discard_the_speculative_zt(self, monkeypatch, anime_search):
+        zt_cancel = []
+
+        def slow_zt(*args, cancel=None, **kwargs):
+            zt_cancel.append(cancel)
+            cancel.wait(2)
+            return [{"details": {"hostname": "zt", "title": "zt"}}]
+
+        monkeypatch.setattr(search, "am_search", _slow(0.3, [{"details": {"hostname": "am", "title": "am"}}]))
+        monkeypatch.setattr(search, "zt_search", slow_zt)
+
+        started = time.time()
+        results = search.get_search_results(anime_search, "Sonarr/4", imdb_id="tt0409591",
+                                            season="1", episode="1")
+
+        assert [r["details"]["title"] for r in results] == ["am"]
+        assert time.time() - started < 1, "la recherche ne doit pas attendre le zt écarté"
+        assert zt_cancel and zt_cancel[0].cancelled
+        # Écarté n'est pas échoué : le disjoncteur de zt n'en tient pas compte.
+        time.sleep(0.1)
+        assert source_health.stats()["zt"]["calls"] == 0
+
+    def test_zt_finishing_first_is_held_until_anime_sama_answers(self, monkeypatch, anime_search):
+        monkeypatch.setattr(search, "am_search", _slow(0.4, [{"details": {"hostname": "am", "title": "am"}}]))
+        monkeypatch.setattr(search, "zt_search", _slow(0, [{"details": {"hostname": "zt", "title": "zt"}}]))
+
+        results = search.get_search_results(anime_search, "Sonarr/4", imdb_id="tt0409591",
+                                            season="1", episode="1")
+
+        assert [r["details"]["title"] for r in results] == ["am"]
+
+
+class TestSpeculationDisabled:
+    def test_negative_delay_waits_for_anime_sama(self, monkeypatch, anime_search):
+        anime_search.values["config"]("Search").save("anime_zt_delay_seconds", "-1")
+        am_done = threading.Event()
+
+        def slow_am(*args, **kwargs):
+            time.sleep(0.3)
+            am_done.set()
+            return []
+
+        def zt(*args, **kwargs):
+            assert am_done.is_set(), "zt lancé avant la réponse d'anime-sama"
+            return []
+
+        monkeypatch.setattr(search, "am_search", slow_am)
+        monkeypatch.setattr(search, "zt_search", zt)
+
+        search.get_search_results(anime_search, "Sonarr/4", imdb_id="tt0409591",
+                                  season="1", episode="1")
+
+    def test_default_delay_applies_when_unset(self, shared_state):
+        assert search.anime_zt_delay_seconds(shared_state) == search.ANIME_ZT_SPECULATIVE_DELAY_SECONDS
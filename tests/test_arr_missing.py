@@ -107,6 +107,14 @@ class TestMissingSeries:
         assert "Breaking Bad" not in [s['arr_title'] for s in arr_client.get_missing_series()]
 
 
+class TestMissingEpisodes:
+    def test_one_row_per_wanted_episode(self, fake_arr):
+        result = arr_client.get_missing_episodes()
+        assert [(e['imdb_id'], e['season'], e['episode']) for e in result] == [
+            ("tt2364582", 2, 1), ("tt2364582", 2, 2),
+        ]
+
+
 class TestZtSearchUrl:
     def test_builds_encoded_search_link(self, shared_state):
         url = arr_client.zt_search_url(shared_state, "Barbie : Rock et Royales", "films")
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""Métadonnées des pages de détail zt : analysées une fois, relues ensuite
+depuis la table ``detail_metadata``, y compris après un redémarrage."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from quasarr.search import detail_store
+from quasarr.search.sources import zt
+from tests.conftest import MockSharedState, load_fixture
+
+HEADERS = {"User-Agent": "Mozilla/5.0 (test)"}
+FILM_URL = "https://zt.test/?p=film&id=1234-inception"
+SERIES_URL = "https://zt.test/?p=serie&id=78001-breaking-bad"
+CHALLENGE_PAGE = """<!DOCTYPE html><html lang="en-US"><head><title>Just a moment...</title>
+<meta http-equiv="refresh" content="390"></head><body>
+<div class="main-wrapper" role="main"><div class="main-content">
+<h1 class="zone-name-title h1">zt.test</h1>
+<h2 class="h2" id="challenge-running">Checking if the site connection is secure</h2>
+<noscript><div class="h2">Enable JavaScript and cookies to continue</div></noscript>
+</div></div>
+<script src="/cdn-cgi/challenge-platform/h/b/orchestrate/chl_page/v1"></script>
+</body></html>
+"""
+
+
+class MemoryDB:
+    def __init__(self):
+        self.rows = {}
+
+    def retrieve(self, key):
+        return self.rows.get(key)
+
+    def retrieve_all_titles(self):
+        return [[key, value] for key, value in self.rows.items()] or None
+
+    def update_store(self, key, value):
+        self.rows[key] = value
+        return True
+
+    def delete(self, key):
+        self.rows.pop(key, None)
+        return True
+
+
+class StoredState(MockSharedState):
+    def __init__(self):
+        super().__init__(zt_hostname="zt.test")
+        self.db = MemoryDB()
+
+    def get_db(self, table):
+        assert table == detail_store.TABLE
+        return self.db
+
+
+def _fetch(state, url, fixture):
+    calls = []
+
+    def fake_get(requested, **kwargs):
+        calls.append(requested)
+        response = MagicMock()
+        response.text = load_fixture(fixture)
+        response.url = requested
+        response.raise_for_status = MagicMock()
+        return response
+
+    with patch("quasarr.search.sources.zt.http_client.get", side_effect=fake_get):
+        return zt._fetch_detail_metadata(state, url, HEADERS, "zt.test"), calls
+
+
+class TestDetailStore:
+    def test_second_lookup_skips_download_and_parse(self):
+        state = StoredState()
+        first, calls = _fetch(state, FILM_URL, "detail_film_inception")
+        with patch.object(zt.html_parser, "parse", side_effect=AssertionError("re-parsed")):
+            second, again = _fetch(state, FILM_URL, "detail_film_inception")
+
+        assert len(calls) == 1
+        assert again == []
+        assert second == first
+
+    def test_entries_survive_a_restart(self):
+        state = StoredState()
+        first, _ = _fetch(state, SERIES_URL, "detail_series_breakingbad_s1")
+        detail_store.invalidate_cache()
+
+        second, calls = _fetch(state, SERIES_URL, "detail_series_breakingbad_s1")
+        assert calls == []
+        assert second == first
+        assert all(isinstance(entry["episodes"], frozenset) for entry in second[6])
+
+    def test_series_pages_expire_sooner(self, monkeypatch):
+        state = StoredState()
+        _fetch(state, SERIES_URL, "detail_series_breakingbad_s1")
+        _fetch(state, FILM_URL, "detail_film_inception")
+
+        later = detail_store.time.time() + detail_store.SERIES_TTL_SECONDS + 1
+        monkeypatch.setattr(detail_store.time, "time", lambda: later)
+        assert detail_store.get(state, "zt", SERIES_URL) is None
+        assert detail_store.get(state, "zt", FILM_URL) is not None
+
+    def test_other_schema_version_is_ignored_and_pruned(self, monkeypatch):
+        state = StoredState()
+        _fetch(state, FILM_URL, "detail_film_inception")
+        detail_store.invalidate_cache()
+        monkeypatch.setattr(detail_store, "SCHEMA_VERSION", detail_store.SCHEMA_VERSION + 1)
+
+        assert detail_store.get(state, "zt", FILM_URL) is None
+        detail_store._PRUNER.join(2)  # ménage lancé en arrière-plan
+        assert state.db.rows == {}
+
+    def test_connection_is_opened_once_per_thread(self):
+        state = StoredState()
+        opened = []
+        state.get_db = lambda table: opened.append(table) or state.db
+        for n in range(3):
+            detail_store.get(state, "zt", f"{FILM_URL}-{n}")
+        detail_store.put(state, "zt", FILM_URL, {"title": "Inception"})
+        detail_store._PRUNER.join(2)
+
+        assert len(opened) == 2  # ce thread, puis le ménage
+
+    def test_slow_database_does_not_block_memory_hits(self):
+        state = StoredState()
+        detail_store.put(state, "zt", FILM_URL, {"title": "Inception"})
+        detail_store._PRUNER.join(2)
+        reading = threading.Event()
+        release = threading.Event()
+
+        def slow_retrieve(key):
+            reading.set()
+            release.wait(5)
+            return None
+
+        state.db.retrieve = slow_retrieve
+        blocked = threading.Thread(target=detail_store.get, args=(state, "zt", SERIES_URL))
+        blocked.start()
+        try:
+            assert reading.wait(2)
+            started = time.time()
+            assert detail_store.get(state, "zt", FILM_URL) == {"title": "Inception"}
+            assert time.time() - started < 1
+        finally:
+            release.set()
+            blocked.join(5)
+
+    def test_failed_download_is_not_stored(self):
+        state = StoredState()
+        with patch("quasarr.search.sources.zt.http_client.get", side_effect=OSError("down")):
+            zt._fetch_detail_metadata(state, FILM_URL, HEADERS, "zt.test")
+        assert state.db.rows == {}
+        assert detail_store.stats()["stored"] == 0
+
+    def test_challenge_page_is_not_stored(self):
+        state = StoredState()
+        challenge = MagicMock(url=FILM_URL, raise_for_status=MagicMock(), text=CHALLENGE_PAGE)
+        with patch("quasarr.search.sources.zt.http_client.get", return_value=challenge):
+            metadata = zt._fetch_detail_metadata(state, FILM_URL, HEADERS, "zt.test")
+
+        assert metadata[3] is None and metadata[6] == []
+        assert state.db.rows == {}
+        assert detail_store.stats()["stored"] == 0
+
+    def test_hit_keeps_the_current_hostname(self):
+        state = StoredState()
+        _fetch(state, FILM_URL, "detail_film_inception")
+        with patch("quasarr.search.sources.zt.http_client.get") as get:
+            stored = zt._fetch_detail_metadata(state, FILM_URL, HEADERS, "zt-new.test")
+        get.assert_not_called()
+        assert stored[0] == "zt-new.test"
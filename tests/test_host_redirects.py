@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Migrations de domaine : apprises à la première redirection, appliquées
+avant l'envoi des requêtes suivantes et conservées après un redémarrage."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from quasarr.providers import host_redirects
+from quasarr.providers import shared_state as quasarr_state
+from quasarr.search.sources import zt
+from tests.conftest import MockSharedState
+from tests.test_detail_store import MemoryDB
+
+
+def _persisted(monkeypatch):
+    database = MemoryDB()
+    monkeypatch.setitem(quasarr_state.values, "dbfile", "/config/Quasarr.db")
+    monkeypatch.setattr(quasarr_state, "get_db", lambda table: database)
+    return database
+
+
+class TestHostRedirects:
+    def test_listing_and_detail_urls_are_rewritten(self):
+        assert host_redirects.learn("zt", "old.test", "new.test")
+        assert host_redirects.resolve("zt", "https://old.test/?p=films&search=dune&page=2") == \
+            "https://new.test/?p=films&search=dune&page=2"
+        assert host_redirects.resolve("zt", "https://OLD.test/?p=film&id=1-dune") == \
+            "https://new.test/?p=film&id=1-dune"
+        assert host_redirects.resolve("am", "https://old.test/x") == "https://old.test/x"
+        assert host_redirects.resolve_host("zt", "other.test") == "other.test"
+
+    def test_chains_collapse_and_moving_back_does_not_loop(self):
+        host_redirects.learn("zt", "a.test", "b.test")
+        host_redirects.learn("zt", "b.test", "c.test")
+        assert host_redirects.resolve_host("zt", "a.test") == "c.test"
+
+        host_redirects.learn("zt", "c.test", "a.test")
+        assert host_redirects.resolve_host("zt", "a.test") == "a.test"
+        assert host_redirects.resolve_host("zt", "b.test") == "a.test"
+
+    def test_concurrent_redirects_are_learned_once(self):
+        results = []
+        barrier = threading.Barrier(8)
+
+        def follow():
+            barrier.wait()
+            results.append(host_redirects.learn("zt", "old.test", "new.test"))
+
+        threads = [threading.Thread(target=follow) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results.count(True) == 1
+
+    def test_map_survives_a_restart(self, monkeypatch):
+        database = _persisted(monkeypatch)
+        host_redirects.learn("am", "anime-sama.fr", "anime-sama.org")
+        host_redirects.invalidate_cache()
+
+        assert host_redirects.resolve_host("am", "anime-sama.fr") == "anime-sama.org"
+        assert list(database.rows) == ["am"]
+
+
+class TestZtRedirects:
+    def test_first_redirect_updates_config_once(self):
+        state = MockSharedState(zt_hostname="old.test")
+        config = state.values["config"]("Hostnames")
+        config.save = MagicMock(wraps=config.save)
+
+        assert zt._update_hostname(state, "old.test", "https://new.test/?p=films") == "new.test"
+        assert zt._update_hostname(state, "old.test", "https://new.test/?p=films&page=2") == "new.test"
+        config.save.assert_called_once_with("zt", "new.test")
+
+    def test_requests_from_the_old_host_skip_the_redirect(self):
+        host_redirects.learn("zt", "old.test", "new.test")
+        with patch("quasarr.search.sources.zt.http_client.get") as get:
+            zt._zt_get("https://old.test/?p=series&search=dune&page=1")
+        assert get.call_args.args[0] == "https://new.test/?p=series&search=dune&page=1"
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Choix du moteur d'analyse HTML : le plus rapide installé, repli sur
+``html.parser``, et extraction zt identique quel que soit le moteur."""
+
+import pytest
+from bs4 import FeatureNotFound
+
+from quasarr.providers import html_parser
+from tests.bench_html_parser import FIXTURES_DIR, _extract
+
+FAST_BACKENDS = [name for name in html_parser.available_backends()
+                 if name != html_parser.FALLBACK_BACKEND]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_detection():
+    html_parser.set_backend(None)
+    yield
+    html_parser.set_backend(None)
+
+
+class TestBackendSelection:
+    def test_first_installed_backend_wins(self, monkeypatch):
+        monkeypatch.setattr(html_parser, "is_available", lambda name: name == "html.parser")
+        assert html_parser.backend() == "html.parser"
+
+        html_parser.set_backend(None)
+        monkeypatch.setattr(html_parser, "is_available", lambda name: True)
+        assert html_parser.backend() == html_parser.PREFERRED_BACKENDS[0]
+
+    def test_fallback_is_always_available(self):
+        assert html_parser.FALLBACK_BACKEND in html_parser.available_backends()
+        assert html_parser.parse("<p>x</p>").p.get_text() == "x"
+
+    def test_missing_backend_cannot_be_forced(self):
+        with pytest.raises(FeatureNotFound):
+            html_parser.set_backend("no-such-parser")
+
+
+@pytest.mark.skipif(not FAST_BACKENDS, reason="aucun moteur rapide installé (lxml)")
+@pytest.mark.parametrize("backend", FAST_BACKENDS)
+def test_fast_backend_extracts_the_same_zt_data(backend):
+    for page in sorted(FIXTURES_DIR.rglob("*.html")):
+        markup = page.read_text(encoding="utf-8")
+        expected = _extract(html_parser.parse(markup, html_parser.FALLBACK_BACKEND))
+        assert _extract(html_parser.parse(markup, backend)) == expected, page.name
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Cache HTTP sur disque : service sans réseau tant que l'entrée est fraîche,
+revalidation par 304 ensuite, éviction LRU à taille bornée."""
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from quasarr.providers import http_cache as http_cache_module
+from quasarr.providers.http_cache import HttpCache, max_age_for
+from quasarr.search import detail_store
+
+DETAIL = "https://zt.test/?p=film&id=45231-inception"
+LISTING = "https://zt.test/?p=films&search=inception&page=1"
+SERIES = "https://zt.test/?p=series&id=78001-breaking-bad-saison-1"
+
+
+def _response(status, body=b"", headers=None, url=DETAIL):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = url
+    response.encoding = "utf-8"
+    return response
+
+
+class _Site:
+    """Faux site : renvoie 304 quand l'ETag envoyé correspond."""
+
+    def __init__(self, body=b"<html>detail</html>", etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.calls = []
+
+    def __call__(self, url, headers=None, **kwargs):
+        self.calls.append(dict(headers or {}))
+        if self.etag and (headers or {}).get("If-None-Match") == self.etag:
+            return _response(304, url=url)
+        headers = {"ETag": self.etag} if self.etag else {}
+        return _response(200, self.body, headers, url=url)
+
+
+class TestHttpCache:
+    def test_fresh_entry_is_served_without_network(self, tmp_path):
+        cache = HttpCache(str(tmp_path))
+        site = _Site()
+        first = cache.get(DETAIL, site, headers={"User-Agent": "t"}, timeout=10)
+        second = cache.get(DETAIL, site, headers={"User-Agent": "t"}, timeout=10)
+
+        assert first.text == second.text == "<html>detail</html>"
+        assert second.url == DETAIL
+        assert len(site.calls) == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_stale_entry_is_revalidated(self, tmp_path):
+        cache = HttpCache(str(tmp_path))
+        site = _Site()
+        cache.get(LISTING, site)
+        response = cache.get(LISTING, site)
+
+        assert site.calls[1]["If-None-Match"] == '"v1"'
+        assert response.status_code == 200
+        assert response.text == "<html>detail</html>"
+        assert cache.stats()["revalidated"] == 1
+        assert cache.stats()["hit_rate"] == 50.0
+
+    def test_changed_page_replaces_the_entry(self, tmp_path):
+        cache = HttpCache(str(tmp_path))
+        cache.get(LISTING, _Site(body=b"old", etag='"v1"'))
+        assert cache.get(LISTING, _Site(body=b"new", etag='"v2"')).text == "new"
+        assert cache.get(LISTING, _Site(body=b"x", etag='"v2"')).text == "new"
+
+    def test_unvalidated_page_without_max_age_is_not_stored(self, tmp_path):
+        cache = HttpCache(str(tmp_path))
+        site = _Site(etag=None)
+        cache.get(LISTING, site)
+        cache.get(LISTING, site)
+        assert len(site.calls) == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_truncated_page_is_not_stored(self, tmp_path):
+        cache = HttpCache(str(tmp_path))
+
+        def partial(url, **kwargs):
+            response = _Site()(url, **kwargs)
+            response.truncated = True
+            return response
+
+        cache.get(LISTING, partial)
+        assert cache.stats()["entries"] == 0
+
+    def test_entries_survive_a_restart(self, tmp_path):
+        HttpCache(str(tmp_path)).get(DETAIL, _Site())
+        site = _Site()
+        assert HttpCache(str(tmp_path)).get(DETAIL, site).text == "<html>detail</html>"
+        assert site.calls == []
+
+    def test_size_bound_evicts_least_recently_used(self, tmp_path):
+        cache = HttpCache(str(tmp_path), max_bytes=25)
+        urls = [f"https://zt.test/?p=film&id={n}-x" for n in range(3)]
+        cache.get(urls[0], _Site(body=b"a" * 10))
+        cache.get(urls[1], _Site(body=b"b" * 10))
+        cache.get(urls[0], _Site())  # urls[0] redevient le plus récent
+        cache.get(urls[2], _Site(body=b"c" * 10))
+
+        site = _Site()
+        cache.get(urls[1], site)
+        assert len(site.calls) == 1  # évincée
+        assert cache.stats()["evicted"] >= 1
+        assert cache.stats()["bytes"] <= 25
+
+    def test_disabled_without_config_dir(self, monkeypatch):
+        monkeypatch.setattr(http_cache_module.shared_state, "values", {})
+        cache = HttpCache()
+        site = _Site()
+        cache.get(DETAIL, site, timeout=3)
+        cache.get(DETAIL, site, timeout=3)
+        assert len(site.calls) == 2
+        assert cache.stats()["enabled"] is False
+
+    def test_series_page_is_refetched_after_the_series_ttl(self, tmp_path, monkeypatch):
+        cache = HttpCache(str(tmp_path))
+        site = _Site(body=b"<html>episodes 1-3</html>")
+        cache.get(SERIES, site)
+
+        now = http_cache_module.time.time()
+        monkeypatch.setattr(http_cache_module.time, "time",
+                            lambda: now + detail_store.SERIES_TTL_SECONDS + 1)
+        site.body, site.etag = b"<html>episodes 1-4</html>", '"v2"'
+
+        assert cache.get(SERIES, site).text == "<html>episodes 1-4</html>"
+        assert len(site.calls) == 2
+        assert site.calls[1]["If-None-Match"] == '"v1"'
+
+    def test_max_age_rules(self):
+        assert max_age_for(DETAIL) > 0
+        assert max_age_for(SERIES) <= detail_store.SERIES_TTL_SECONDS
+        assert max_age_for("https://zt.test/?p=mangas&id=4102-one-piece") <= detail_store.SERIES_TTL_SECONDS
+        assert max_age_for(LISTING) == 0
+        assert max_age_for("https://anime-sama.test/catalogue/x/saison1/vostfr/episodes.js") > 0
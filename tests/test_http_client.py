@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Client HTTP partagé : une session par hôte, connexions réutilisées, aucun
+cookie conservé d'un appel à l'autre, transfert compressé et lecture
+interrompue une fois le nécessaire reçu."""
+
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from quasarr.providers.http_client import DEFAULT_TIMEOUT, DRAIN_BELOW_BYTES, HttpClient
+
+CARDS = b'<div class="cover_global">a</div><div class="cover_global">b</div>'
+
+
+def _listing(tail_bytes):
+    return CARDS + b'<div class="navigation">1 2</div>' + b"x" * tail_bytes
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        encoding = None
+        if self.path.startswith("/listing/"):
+            body = _listing(int(self.path.rsplit("/", 1)[1]))
+        elif self.path == "/encoding":
+            body = (self.headers.get("Accept-Encoding") or "").encode() + b" " * 2000
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body, encoding = gzip.compress(body), "gzip"
+        else:
+            body = (self.headers.get("Cookie") or "no-cookie").encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Set-Cookie", "session=abc")
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # lecture interrompue par le client
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestHttpClient:
+    def test_connections_are_reused(self, server):
+        client = HttpClient()
+        for _ in range(5):
+            assert client.get(f"{server}/page").status_code == 200
+        stats = client.stats()["127.0.0.1:" + server.rsplit(":", 1)[1]]
+        assert stats["requests"] == 5
+        assert stats["connections_opened"] == 1
+        assert stats["reuse_rate"] == 80.0
+        client.close()
+
+    def test_cookies_are_not_kept(self, server):
+        client = HttpClient()
+        client.get(server)
+        assert client.get(server).text == "no-cookie"
+        client.close()
+
+    def test_one_session_per_host(self):
+        client = HttpClient()
+        first = client.session_for("https://a.test/x")
+        assert client.session_for("https://A.test/y") is first
+        assert client.session_for("https://b.test/") is not first
+
+    def test_least_recently_used_host_is_evicted(self):
+        client = HttpClient(max_hosts=2)
+        first = client.session_for("https://a.test/")
+        client.session_for("https://b.test/")
+        client.session_for("https://c.test/")
+        assert set(client.stats()) == {"b.test", "c.test"}
+        assert client.session_for("https://a.test/") is not first
+
+    def test_default_timeout(self, monkeypatch):
+        client = HttpClient()
+        seen = {}
+        session = client.session_for("https://a.test/").session
+        monkeypatch.setattr(session, "request", lambda method, url, **kw: seen.update(kw))
+        client.get("https://a.test/")
+        assert seen["timeout"] == DEFAULT_TIMEOUT
+        client.get("https://a.test/", timeout=3)
+        assert seen["timeout"] == 3
+
+
+def _after_navigation(body, start):
+    return b'class="navigation"' in body
+
+
+class TestTransfer:
+    def test_compressed_transfer_is_negotiated_and_counted(self, server):
+        client = HttpClient()
+        response = client.get(f"{server}/encoding")
+        assert response.text.strip().startswith("gzip")
+        stats = client.stats()["127.0.0.1:" + server.rsplit(":", 1)[1]]
+        assert stats["bytes_decoded"] == len(response.content)
+        assert 0 < stats["bytes_received"] < stats["bytes_decoded"]
+        client.close()
+
+    def test_reading_stops_once_the_caller_has_enough(self, server):
+        client = HttpClient()
+        response = client.get(f"{server}/listing/2000000", stop=_after_navigation)
+        assert response.truncated
+        assert response.content.startswith(CARDS)
+        assert len(response.content) < 200_000
+        assert client.stats()["127.0.0.1:" + server.rsplit(":", 1)[1]]["early_stops"] == 1
+        client.close()
+
+    def test_short_tail_is_drained_to_keep_the_connection(self, server):
+        client = HttpClient()
+        for _ in range(3):
+            response = client.get_until(f"{server}/listing/{DRAIN_BELOW_BYTES // 2}", _after_navigation)
+            assert not response.truncated
+            assert response.content == _listing(DRAIN_BELOW_BYTES // 2)
+        stats = client.stats()["127.0.0.1:" + server.rsplit(":", 1)[1]]
+        assert stats["connections_opened"] == 1
+        assert stats["early_stops"] == 0
+        client.close()
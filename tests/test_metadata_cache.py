@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Réponses TMDB : demandées une fois, relues ensuite depuis la table
+``tmdb_metadata``, y compris après un redémarrage ou depuis l'autre processus."""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from quasarr.providers import imdb_metadata, metadata_cache
+from quasarr.providers import shared_state as quasarr_state
+from tests.test_detail_store import MemoryDB
+
+FIND = {"tv_results": [{"id": 1429, "name": "L'Attaque des Titans", "genre_ids": [16]}], "movie_results": []}
+SEASONS = {"seasons": [{"season_number": 0, "episode_count": 5},
+                       {"season_number": 1, "episode_count": 25},
+                       {"season_number": 2, "episode_count": 12}]}
+ALTERNATIVES = {"results": [{"iso_3166_1": "JP", "title": "Shingeki no Kyojin", "type": "Romaji"},
+                            {"iso_3166_1": "FR", "title": "L'Attaque des Titans", "type": ""}]}
+
+
+def _persisted(monkeypatch):
+    database = MemoryDB()
+    monkeypatch.setitem(quasarr_state.values, "dbfile", "/config/Quasarr.db")
+    monkeypatch.setattr(quasarr_state, "get_db", lambda table: database)
+    return database
+
+
+def _tmdb(monkeypatch, responses):
+    """Simule TMDB : ``responses`` associe un fragment d'URL à sa réponse JSON."""
+    monkeypatch.setenv("TMDB_API_KEY", "token")
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        response = MagicMock(status_code=200)
+        response.json.return_value = next(body for part, body in responses.items() if part in url)
+        return response
+
+    return patch("quasarr.providers.imdb_metadata.requests.get", side_effect=fake_get), calls
+
+
+class TestMetadataCache:
+    def test_entries_expire_after_their_ttl(self, monkeypatch):
+        metadata_cache.put("find", "tt1", ["result", "movie"], ttl=60)
+        assert metadata_cache.get("find", "tt1") == ["result", "movie"]
+
+        now = metadata_cache.time.time()
+        monkeypatch.setattr(metadata_cache.time, "time", lambda: now + 61)
+        assert metadata_cache.get("find", "tt1") is None
+
+    def test_memory_front_is_bounded_lru(self, monkeypatch):
+        monkeypatch.setattr(metadata_cache, "MAX_MEMORY_ENTRIES", 2)
+        metadata_cache.put("find", "a", 1)
+        metadata_cache.put("find", "b", 2)
+        metadata_cache.get("find", "a")
+        metadata_cache.put("find", "c", 3)
+
+        assert metadata_cache.get("find", "a") == 1
+        assert metadata_cache.get("find", "b") is None
+        assert metadata_cache.stats()["memory_entries"] == 2
+
+    def test_entries_survive_a_restart(self, monkeypatch):
+        database = _persisted(monkeypatch)
+        metadata_cache.put("identity", "tt1", {"year": "2010"})
+        metadata_cache.invalidate_cache()
+
+        assert metadata_cache.get("identity", "tt1") == {"year": "2010"}
+        assert list(database.rows) == ["identity|tt1"]
+        assert metadata_cache.stats()["db_hits"] == 1
+
+    def test_stale_entries_are_pruned(self, monkeypatch):
+        database = _persisted(monkeypatch)
+        database.rows["find|old"] = json.dumps({"version": metadata_cache.SCHEMA_VERSION, "expires": 0, "data": 1})
+        database.rows["find|v0"] = json.dumps({"version": 0, "expires": 2 ** 40, "data": 1})
+
+        assert metadata_cache.get("find", "new") is None
+        metadata_cache._PRUNER.join(2)  # ménage lancé en arrière-plan
+        assert database.rows == {}
+
+    def test_slow_database_does_not_block_memory_hits(self, monkeypatch):
+        database = _persisted(monkeypatch)
+        metadata_cache.put("find", "tt1", ["result", "movie"])
+        metadata_cache._PRUNER.join(2)
+        reading = threading.Event()
+        release = threading.Event()
+
+        def slow_retrieve(key):
+            reading.set()
+            release.wait(5)
+            return None
+
+        database.retrieve = slow_retrieve
+        blocked = threading.Thread(target=metadata_cache.get, args=("find", "tt2"))
+        blocked.start()
+        try:
+            assert reading.wait(2)
+            started = time.time()
+            assert metadata_cache.get("find", "tt1") == ["result", "movie"]
+            assert time.time() - started < 1
+        finally:
+            release.set()
+            blocked.join(5)
+
+
+class TestImdbMetadata:
+    def test_find_is_requested_once_across_restarts(self, monkeypatch):
+        _persisted(monkeypatch)
+        fake, calls = _tmdb(monkeypatch, {"/find/": FIND})
+        with fake:
+            assert imdb_metadata.is_anime(None, "tt2560140") is False  # pas d'origine JP
+            metadata_cache.invalidate_cache()
+            result, media_type = imdb_metadata._tmdb_find("tt2560140")
+        assert (result["id"], media_type) == (1429, "tv")
+        assert len(calls) == 1
+
+    def test_season_numbers_stay_integers(self, monkeypatch):
+        _persisted(monkeypatch)
+        fake, calls = _tmdb(monkeypatch, {"/find/": FIND, "/tv/1429": SEASONS})
+        with fake:
+            assert imdb_metadata.get_season_episode_counts(None, "tt2560140") == {1: 25, 2: 12}
+            metadata_cache.invalidate_cache()
+            assert imdb_metadata.get_season_episode_counts(None, "tt2560140") == {1: 25, 2: 12}
+        assert len(calls) == 2
+
+    def test_romaji_and_french_titles_share_one_request(self, monkeypatch):
+        fake, calls = _tmdb(monkeypatch, {"/find/": FIND, "alternative_titles": ALTERNATIVES})
+        with fake:
+            assert imdb_metadata.get_romaji_title(None, "tt2560140") == "Shingeki no Kyojin"
+            assert imdb_metadata.get_french_alternative_titles(None, "tt2560140") == ["L'Attaque des Titans"]
+        assert sum("alternative_titles" in url for url in calls) == 1
+
+    def test_failures_are_kept_briefly(self, monkeypatch):
+        monkeypatch.setenv("TMDB_API_KEY", "token")
+        with patch("quasarr.providers.imdb_metadata.requests.get", side_effect=OSError("down")) as get:
+            imdb_metadata.get_french_alternative_titles(None, "tt1")
+            imdb_metadata.get_french_alternative_titles(None, "tt1")
+            assert get.call_count == 1  # /find échoue, pas re-tenté à la carte suivante
+
+            now = metadata_cache.time.time()
+            monkeypatch.setattr(metadata_cache.time, "time",
+                                lambda: now + imdb_metadata.FAILURE_TTL_SECONDS + 1)
+            imdb_metadata.get_french_alternative_titles(None, "tt1")
+            assert get.call_count == 2
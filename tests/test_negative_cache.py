@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Cache négatif par (source, IMDb-ID, saison).
+
+Un titre absent d'un site ne doit pas coûter un parcours complet à chaque
+recherche : la source est sautée jusqu'à expiration, et la durée double à
+chaque nouvel échec.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+import quasarr.search as search
+from quasarr.search import negative_cache
+
+
+@pytest.fixture
+def counting_zt(monkeypatch):
+    calls = []
+    releases = []
+
+    def fake_zt(*args, **kwargs):
+        calls.append(kwargs.get("episode"))
+        return list(releases)
+
+    monkeypatch.setattr(search, "zt_search", fake_zt)
+    return calls, releases
+
+
+class TestSearchSkipsKnownMisses:
+    def test_empty_season_search_skips_the_source_next_time(self, only_zt, counting_zt):
+        calls, _ = counting_zt
+
+        search.get_search_results(only_zt, "Sonarr/4", imdb_id="tt0409591", season="2")
+        search.result_cache.clear()
+        search.get_search_results(only_zt, "Sonarr/4", imdb_id="tt0409591", season="2", episode="3")
+
+        assert len(calls) == 1
+
+    def test_empty_episode_search_is_not_remembered(self, only_zt, counting_zt):
+        calls, _ = counting_zt
+
+        search.get_search_results(only_zt, "Sonarr/4", imdb_id="tt0409591", season="2", episode="3")
+        search.get_search_results(only_zt, "Sonarr/4", imdb_id="tt0409591", season="2", episode="4")
+
+        assert len(calls) == 2
+
+    def test_other_seasons_are_still_searched(self, only_zt, counting_zt):
+        calls, _ = counting_zt
+
+        search.get_search_results(only_zt, "Sonarr/4", imdb_id="tt0409591", season="2")
+        search.get_search_results(only_zt, "Sonarr/4", imdb_id="tt0409591", season="3")
+
+        assert len(calls) == 2
+
+    def test_mirror_filtered_searches_are_not_remembered(self, only_zt, counting_zt):
+        calls, _ = counting_zt
+
+        search.get_search_results(only_zt, "Radarr/6", imdb_id="tt4955162", mirror="1fichier")
+        search.get_search_results(only_zt, "Radarr/6", imdb_id="tt4955162")
+
+        assert len(calls) == 2
+
+    def test_source_that_swallows_its_error_is_not_a_miss(self, only_sources):
+        # fx attrape l'erreur réseau, la journalise et rend une liste vide.
+        only_fx = only_sources("fx")
+        outage = requests.ConnectionError("fx.test unreachable")
+
+        with patch("quasarr.search.sources.fx.http_client.get", side_effect=outage) as get:
+            search.get_search_results(only_fx, "Sonarr/4", imdb_id="tt0409591", season="2")
+            search.result_cache.clear()
+            search.get_search_results(only_fx, "Sonarr/4", imdb_id="tt0409591", season="2")
+
+        assert get.call_count == 2
+        assert not negative_cache.is_known_miss(only_fx, "fx", "tt0409591", "2")
+        assert negative_cache.stats(only_fx)["entries"] == 0
+
+
+class TestExpiry:
+    def test_ttl_doubles_up_to_the_cap(self):
+        assert negative_cache.ttl_for(1) == negative_cache.BASE_TTL_SECONDS
+        assert negative_cache.ttl_for(2) == 2 * negative_cache.BASE_TTL_SECONDS
+        assert negative_cache.ttl_for(50) == negative_cache.MAX_TTL_SECONDS
+
+    def test_expired_entry_is_retried_and_a_hit_clears_it(self, shared_state, monkeypatch):
+        negative_cache.record(shared_state, "zt", "tt1", "", "", [])
+        assert negative_cache.is_known_miss(shared_state, "zt", "tt1", "")
+
+        later = time.time() + negative_cache.BASE_TTL_SECONDS + 1
+        monkeypatch.setattr(negative_cache.time, "time", lambda: later)
+        assert not negative_cache.is_known_miss(shared_state, "zt", "tt1", "")
+
+        negative_cache.record(shared_state, "zt", "tt1", "", "", [{"details": {}}])
+        assert negative_cache.stats(shared_state)["entries"] == 0
+
+    def test_purge_by_source(self, shared_state):
+        negative_cache.record(shared_state, "zt", "tt1", "", "", [])
+        negative_cache.record(shared_state, "sf", "tt1", "", "", [])
+
+        assert negative_cache.purge(shared_state, source="zt") == 1
+        assert negative_cache.stats(shared_state)["active_by_source"] == {"sf": 1}
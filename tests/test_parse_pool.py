@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Analyse HTML déportée dans des processus : mêmes enregistrements que sur
+place, et repli sur place si le pool est désactivé ou cassé."""
+
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from quasarr.search import parse_pool as parse_pool_module
+from quasarr.search.parse_pool import ParsePool, parse_processes
+from quasarr.search.sources import zt
+from tests.conftest import load_fixture
+
+DETAIL_URL = "https://zt.test/?p=serie&id=78001-breaking-bad"
+
+
+class TestParseProcesses:
+    @pytest.mark.parametrize("raw,expected", [
+        ("", 0), (None, 0), ("0", 0), ("3", 3), ("-2", 0), ("beaucoup", 0),
+    ])
+    def test_values(self, raw, expected):
+        assert parse_processes(raw) == expected
+
+    def test_auto_leaves_a_core_free(self, monkeypatch):
+        monkeypatch.setattr(parse_pool_module.os, "cpu_count", lambda: 8)
+        assert parse_processes("auto") == 7
+
+
+class TestParsePool:
+    def test_disabled_pool_parses_in_process(self):
+        pool = ParsePool(processes=0)
+        cards = pool.run(zt._parse_listing, load_fixture("search_films_inception"))
+        assert [card.title for card in cards][:1] == ["Inception"]
+        assert pool.stats() == {"remote": 0, "inline": 1, "failures": 0,
+                                "processes": 0, "active": False}
+
+    def test_worker_process_returns_the_same_records(self):
+        pool = ParsePool(processes=1)
+        try:
+            listing = load_fixture("search_series_breakingbad")
+            detail = load_fixture("detail_series_breakingbad_s1")
+            assert pool.run(zt._parse_listing, listing) == zt._parse_listing(listing)
+            assert (pool.run(zt._parse_detail_record, detail, DETAIL_URL)
+                    == zt._parse_detail_record(detail, DETAIL_URL))
+            assert pool.stats()["remote"] == 2
+        finally:
+            pool.shutdown()
+
+    def test_broken_pool_falls_back_in_process(self, monkeypatch):
+        class Broken:
+            def submit(self, *args):
+                raise BrokenProcessPool("worker died")
+
+            def shutdown(self, **kwargs):
+                pass
+
+        pool = ParsePool(processes=2)
+        monkeypatch.setattr(pool, "_executor", Broken())
+        cards = pool.run(zt._parse_listing, load_fixture("search_films_inception"))
+
+        assert cards == zt._parse_listing(load_fixture("search_films_inception"))
+        assert pool.stats()["failures"] == 1
+        assert pool.stats()["active"] is False
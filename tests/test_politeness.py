@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Politesse par hostname : une requête dans le budget part sans attendre, les
+suivantes sont espacées au débit du site, la concurrence reste plafonnée."""
+
+import threading
+import time
+
+from quasarr.search.politeness import (
+    DEFAULT_LIMIT,
+    HOST_LIMITS,
+    HostLimit,
+    PolitenessScheduler,
+    parse_limits,
+)
+
+
+def _timed_slot(scheduler, host):
+    started = time.monotonic()
+    with scheduler.slot(host):
+        pass
+    return time.monotonic() - started
+
+
+class TestTokenBucket:
+    def test_burst_goes_out_immediately(self):
+        scheduler = PolitenessScheduler(limits={"am": HostLimit(rate=1, burst=3, concurrency=3)})
+        assert all(_timed_slot(scheduler, "am") < 0.05 for _ in range(3))
+        assert scheduler.stats()["am"]["delayed"] == 0
+
+    def test_requests_beyond_the_burst_wait_for_a_token(self):
+        scheduler = PolitenessScheduler(limits={"am": HostLimit(rate=10, burst=1, concurrency=1)})
+        _timed_slot(scheduler, "am")
+        waited = _timed_slot(scheduler, "am")
+        assert 0.05 < waited < 0.5
+        assert scheduler.stats()["am"]["delayed"] == 1
+
+    def test_hosts_are_independent(self):
+        scheduler = PolitenessScheduler(limits={"am": HostLimit(rate=0.01, burst=1, concurrency=1)})
+        _timed_slot(scheduler, "am")
+        assert _timed_slot(scheduler, "zt") < 0.05
+
+    def test_concurrency_is_capped(self):
+        scheduler = PolitenessScheduler(limits={"zt": HostLimit(rate=100, burst=100, concurrency=2)})
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def request():
+            with scheduler.slot("zt"):
+                with lock:
+                    running[0] += 1
+                    peak[0] = max(peak[0], running[0])
+                time.sleep(0.05)
+                with lock:
+                    running[0] -= 1
+
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert peak[0] == 2
+        assert scheduler.stats()["zt"]["in_flight"] == 0
+
+
+class TestLimits:
+    def test_defaults(self):
+        scheduler = PolitenessScheduler()
+        assert scheduler.limit_for("am") == HOST_LIMITS["am"]
+        assert scheduler.limit_for("sf") == DEFAULT_LIMIT
+
+    def test_parse_config_value(self):
+        assert parse_limits("am=0.5/3/2, zt = 8/16/8; bad=1/2, nul=0/1/1") == {
+            "am": HostLimit(0.5, 3, 2),
+            "zt": HostLimit(8.0, 16, 8),
+        }
+        assert parse_limits("") == {}
+        assert parse_limits(None) == {}
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Validateur de releases construit une fois par recherche : mêmes verdicts
+que ``is_valid_release``, chaque titre n'est évalué qu'une fois."""
+
+from unittest.mock import patch
+
+import pytest
+
+from quasarr.providers import shared_state
+from quasarr.providers.shared_state import is_valid_release, release_validator
+
+TITLES = [
+    "Dune.Part.Two.2024.FRENCH.1080p.WEB.H264-GRP",
+    "Dune.S01E02.FRENCH.1080p.WEB.H264-GRP",
+    "Dune.S01.FRENCH.1080p.WEB.H264-GRP",
+    "Dune.Saison.1.Episode.3.FRENCH.1080p.WEB.H264-GRP",
+    "Dune.S02E01-E03.FRENCH.1080p.WEB.H264-GRP",
+    "Arrival.2016.FRENCH.1080p.BluRay.x264-GRP",
+]
+
+
+@pytest.mark.parametrize("request_from, search_string, season, episode", [
+    ("Radarr/5.0", "Dune", None, None),
+    ("Sonarr/4.0", "Dune", 1, 2),
+    ("Sonarr/4.0", "Dune", "1", None),
+    ("Sonarr/4.0", "tt1160419", 2, "2"),
+    ("LazyLibrarian", "Dune", None, None),
+    ("Prowlarr", "Dune", None, None),
+    (None, "Dune", None, None),
+])
+def test_same_verdicts_as_is_valid_release(request_from, search_string, season, episode):
+    validator = release_validator(request_from, search_string, season, episode)
+    expected = [is_valid_release(title, request_from, search_string, season, episode)
+                for title in TITLES]
+    assert validator.validate_all(TITLES) == expected
+
+
+def test_each_title_is_evaluated_once():
+    validator = release_validator("Sonarr/4.0", "Dune", 1, 2)
+    with patch.object(shared_state, "search_string_in_sanitized_title",
+                      wraps=shared_state.search_string_in_sanitized_title) as matcher:
+        first = validator.validate_all(TITLES)
+        calls = matcher.call_count
+        assert validator.validate_all(TITLES) == first
+    assert calls < len(TITLES)  # "Arrival" écarté par l'index, sans comparaison
+    assert matcher.call_count == calls
+
+
+def test_season_only_drops_the_episode():
+    validator = release_validator("Sonarr/4.0", "Dune", 1, 5)
+    assert validator.validate("Dune.S01.FRENCH.1080p.WEB.H264-GRP")[0] is False
+    assert validator.season_only().validate("Dune.S01.FRENCH.1080p.WEB.H264-GRP") == (True, None)
+    assert validator.season_only() is validator.season_only()
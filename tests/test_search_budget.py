@@ -24,14 +24,9 @@ def fast_budget(monkeypatch):
 
 
 @pytest.fixture
-def only_am_and_zt(shared_state):
+def only_am_and_zt(only_sources):
     """Config ne déclarant que anime-sama et zt."""
-    hostnames = shared_state.values["config"]("Hostnames")
-    for key in ("al", "by", "dd", "dt", "dw", "fx", "mb", "nx", "sf", "sl", "wd"):
-        hostnames.save(key, "")
-    hostnames.save("am", "anime-sama.test")
-    hostnames.save("zt", "zt.test")
-    return shared_state
+    return only_sources("zt", am="anime-sama.test")
 
 
 class TestAnimeFallbackRespectsBudget:
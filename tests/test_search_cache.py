@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Cache des résultats de recherche entre requêtes.
+
+Radarr rejoue la même recherche (nouvel essai, recherche automatique) : la
+seconde doit être servie depuis le cache sans relancer les sources, et une
+entrée périmée doit être servie tout de suite puis rafraîchie en arrière-plan.
+"""
+
+import threading
+import time
+
+import quasarr.search as search
+from quasarr.search.outcome import failed
+from quasarr.search.cache import SearchResultCache, cache_key, result_cache
+
+
+def _counting_zt(calls, title="depuis zt"):
+    def fake_zt(*args, **kwargs):
+        calls.append(args[3])
+        return [{"details": {"hostname": "zt", "title": title}}]
+    return fake_zt
+
+
+class TestRepeatedSearchesHitTheCache:
+    def test_second_identical_search_does_not_rerun_the_source(self, monkeypatch, only_zt):
+        calls = []
+        monkeypatch.setattr(search, "zt_search", _counting_zt(calls))
+
+        first = search.get_search_results(only_zt, "Radarr/6.4.0", imdb_id="tt4955162")
+        second = search.get_search_results(only_zt, "Radarr/5.2.1", imdb_id="tt4955162")
+
+        assert calls == ["tt4955162"]
+        assert first == second == [{"details": {"hostname": "zt", "title": "depuis zt"}}]
+        assert result_cache.stats()["hits"] == 1
+
+    def test_key_separates_episodes_and_mirrors(self, monkeypatch, only_zt):
+        calls = []
+        monkeypatch.setattr(search, "zt_search", _counting_zt(calls))
+
+        search.get_search_results(only_zt, "Sonarr/4", imdb_id="tt0409591", season="1", episode="1")
+        search.get_search_results(only_zt, "Sonarr/4", imdb_id="tt0409591", season="1", episode="2")
+        search.get_search_results(only_zt, "Sonarr/4", imdb_id="tt0409591", season="1", episode="2",
+                                  mirror="1fichier")
+
+        assert len(calls) == 3
+
+    def test_failed_source_is_not_cached(self, monkeypatch, only_zt):
+        calls = []
+
+        def failing_zt(*args, **kwargs):
+            calls.append(1)
+            raise RuntimeError("site en panne")
+
+        monkeypatch.setattr(search, "zt_search", failing_zt)
+
+        search.get_search_results(only_zt, "Radarr/6.4.0", imdb_id="tt4955162")
+        search.get_search_results(only_zt, "Radarr/6.4.0", imdb_id="tt4955162")
+
+        assert len(calls) == 2
+
+    def test_error_caught_by_the_source_is_not_cached(self, monkeypatch, only_zt):
+        calls = []
+
+        def flaky_zt(*args, **kwargs):
+            calls.append(1)
+            return failed([], TimeoutError("zt.test timed out"))
+
+        monkeypatch.setattr(search, "zt_search", flaky_zt)
+
+        search.get_search_results(only_zt, "Radarr/6.4.0", imdb_id="tt4955162")
+        search.get_search_results(only_zt, "Radarr/6.4.0", imdb_id="tt4955162")
+
+        assert len(calls) == 2
+
+    def test_source_finishing_after_the_budget_is_not_cached(self, monkeypatch, only_zt):
+        monkeypatch.setattr(search, "SEARCH_BUDGET_SECONDS", 1)
+        finished = threading.Event()
+
+        def slow_zt(*args, cancel=None, **kwargs):
+            cancel.wait(5)  # la recherche rend la main sans lui
+            try:
+                return [{"details": {"hostname": "zt", "title": "première page seulement"}}]
+            finally:
+                finished.set()
+
+        monkeypatch.setattr(search, "zt_search", slow_zt)
+
+        assert search.get_search_results(only_zt, "Radarr/6.4.0", imdb_id="tt4955162") == []
+        assert finished.wait(5)
+        time.sleep(0.2)  # laisse passer le callback de la future
+
+        key = cache_key("tt4955162", None, None, "Radarr/6.4.0", None)
+        assert result_cache.lookup(key, "zt") is None
+
+    def test_feeds_are_never_cached(self, monkeypatch, only_zt):
+        calls = []
+
+        def fake_feed(*args, **kwargs):
+            calls.append(1)
+            return []
+
+        monkeypatch.setattr(search, "zt_feed", fake_feed)
+
+        search.get_search_results(only_zt, "Radarr/6.4.0")
+        search.get_search_results(only_zt, "Radarr/6.4.0")
+
+        assert len(calls) == 2
+
+
+class TestStaleWhileRevalidate:
+    def test_stale_entry_is_served_then_refreshed(self, monkeypatch, only_zt):
+        key = cache_key("tt4955162", "", "", "Radarr/6.4.0", None)
+        result_cache.store(key, "zt", [{"details": {"hostname": "zt", "title": "ancien"}}])
+        monkeypatch.setitem(result_cache._ttl_seconds, "zt", -1)  # tout est périmé
+
+        refreshed = threading.Event()
+
+        def slow_fresh_zt(*args, **kwargs):
+            time.sleep(0.2)
+            refreshed.set()
+            return [{"details": {"hostname": "zt", "title": "nouveau"}}]
+
+        monkeypatch.setattr(search, "zt_search", slow_fresh_zt)
+
+        started = time.time()
+        results = search.get_search_results(only_zt, "Radarr/6.4.0", imdb_id="tt4955162")
+
+        assert time.time() - started < 0.2, "l'entrée périmée doit être servie sans attendre"
+        assert [r["details"]["title"] for r in results] == ["ancien"]
+        assert refreshed.wait(2)
+
+        deadline = time.time() + 2
+        while time.time() < deadline and result_cache.lookup(key, "zt")[0][0]["details"]["title"] != "nouveau":
+            time.sleep(0.01)
+        assert result_cache.lookup(key, "zt")[0][0]["details"]["title"] == "nouveau"
+
+
+class TestSearchResultCache:
+    def test_entries_too_old_are_dropped(self):
+        cache = SearchResultCache(ttl_seconds={"zt": 0}, max_stale_seconds=0)
+        cache.store(("k",), "zt", [1])
+        time.sleep(0.01)
+        assert cache.lookup(("k",), "zt") is None
+
+    def test_clear_discards_writes_started_before_it(self):
+        cache = SearchResultCache()
+        generation = cache.generation
+        cache.clear()
+        assert cache.store(("k",), "zt", [1], generation) is False
+        assert cache.lookup(("k",), "zt") is None
+
+    def test_lru_bound(self):
+        cache = SearchResultCache(max_entries=2)
+        for n in range(3):
+            cache.store((n,), "zt", [n])
+        assert cache.lookup((0,), "zt") is None
+        assert cache.stats()["evictions"] == 1
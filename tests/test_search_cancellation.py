@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Annulation coopérative des sources quand le budget est épuisé.
+
+Avant : ``executor.shutdown(cancel_futures=True)`` n'annulait que les sources
+pas encore démarrées ; zt continuait à paginer et à précharger des pages de
+détail en arrière-plan pour une réponse déjà envoyée.
+"""
+
+import threading
+import time
+
+import pytest
+
+import quasarr.search as search
+from quasarr.search import cancellation
+from quasarr.search.cancellation import CancelToken, SearchCancelled
+from quasarr.search.politeness import HostLimit, PolitenessScheduler
+from quasarr.search.sources import am, zt
+
+
+@pytest.fixture
+def fast_budget(monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_BUDGET_SECONDS", 1)
+
+
+class TestBudgetCancelsRunningSources:
+    def test_running_source_stops_within_a_second(self, monkeypatch, fast_budget, only_zt):
+        stopped = threading.Event()
+
+        def paginating_zt(*args, cancel=None, **kwargs):
+            try:
+                for _ in range(600):  # ~60 s de pagination
+                    cancel.raise_if_cancelled()
+                    time.sleep(0.1)
+            finally:
+                stopped.set()
+            return []
+
+        monkeypatch.setattr(search, "zt_search", paginating_zt)
+
+        search.get_search_results(only_zt, "Radarr/6.4.0", imdb_id="tt4955162")
+
+        assert stopped.wait(1), "la source aurait dû s'arrêter après l'annulation"
+
+    def test_sources_within_budget_are_not_cancelled(self, monkeypatch, fast_budget, only_zt):
+        seen = []
+
+        def quick_zt(*args, cancel=None, **kwargs):
+            seen.append(cancel)
+            return []
+
+        monkeypatch.setattr(search, "zt_search", quick_zt)
+
+        search.get_search_results(only_zt, "Radarr/6.4.0", imdb_id="tt4955162")
+
+        assert len(seen) == 1 and not seen[0].cancelled
+
+
+class TestZtRequests:
+    def test_cancelled_request_never_reaches_the_site(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(zt.http_client, "get", lambda *a, **kw: calls.append(a))
+        token = CancelToken()
+        token.cancel()
+
+        with pytest.raises(SearchCancelled):
+            zt._zt_get("https://zt.test/", cancel=token)
+
+        assert calls == []
+
+    def test_waiting_for_a_slot_is_interrupted(self, monkeypatch):
+        monkeypatch.setattr(zt, "politeness", PolitenessScheduler(
+            limits={"zt": HostLimit(rate=0.01, burst=1, concurrency=1)}))
+        zt.politeness._bucket("zt").tokens = 0
+        token = CancelToken()
+        threading.Timer(0.1, token.cancel).start()
+
+        started = time.time()
+        with pytest.raises(SearchCancelled):
+            zt._zt_get("https://zt.test/", cancel=token)
+
+        assert time.time() - started < 1
+
+
+class TestAnimeSamaRequests:
+    def test_rate_limit_wait_is_cut_short_by_cancellation(self, monkeypatch):
+        monkeypatch.setattr(am, "politeness", PolitenessScheduler(
+            limits={"am": HostLimit(rate=0.2, burst=1, concurrency=1)}))
+        am.politeness._bucket("am").tokens = 0
+        monkeypatch.setattr(am.http_client, "request", lambda *a, **kw: pytest.fail("requête lancée"))
+        token = CancelToken()
+        threading.Timer(0.1, token.cancel).start()
+
+        started = time.time()
+        with cancellation.bound(token), pytest.raises(SearchCancelled):
+            am._am_request("GET", "https://anime.invalid/page")
+
+        assert time.time() - started < 1
+
+
+class TestCancelToken:
+    def test_deadline_cancels_by_itself(self):
+        token = CancelToken(timeout=0.05)
+        assert not token.cancelled
+        assert token.wait(1) is True
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Préchauffage : les listes « wanted » sont recherchées en période creuse,
+une recherche à la fois, espacées par l'intervalle du site le plus ménagé."""
+
+import pytest
+
+from quasarr.search import prewarm
+from tests.conftest import MockSharedState
+
+
+@pytest.fixture
+def wanted(monkeypatch):
+    monkeypatch.setattr(prewarm.arr_client, "is_configured", lambda kind: True)
+    monkeypatch.setattr(prewarm.arr_client, "get_missing_movies",
+                        lambda: [{"imdb_id": "tt1375666"}, {"imdb_id": ""}])
+    monkeypatch.setattr(prewarm.arr_client, "get_missing_episodes",
+                        lambda: [{"imdb_id": "tt0903747", "season": 1, "episode": 3}])
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    calls = []
+    monkeypatch.setattr(prewarm, "get_localized_title", lambda *a: ("Titre", "Title"))
+    monkeypatch.setattr(prewarm, "get_search_results",
+                        lambda ss, request_from, imdb_id="", season="", episode="", priority=None:
+                        calls.append((request_from, imdb_id, season, episode)) or [])
+    monkeypatch.setattr(prewarm, "IDLE_SECONDS", 0)
+    monkeypatch.setattr(prewarm, "is_idle", lambda: True)
+    return calls
+
+
+class TestWantedSearches:
+    def test_movies_and_episodes_become_arr_searches(self, wanted):
+        assert prewarm.wanted_searches() == [
+            (prewarm.RADARR_REQUESTER, "tt1375666", "", ""),
+            (prewarm.SONARR_REQUESTER, "tt0903747", "1", "3"),
+        ]
+
+    def test_unreachable_arr_is_skipped(self, monkeypatch):
+        def unreachable():
+            raise prewarm.arr_client.ArrError("down")
+
+        monkeypatch.setattr(prewarm.arr_client, "is_configured", lambda kind: kind == "Radarr")
+        monkeypatch.setattr(prewarm.arr_client, "get_missing_movies", unreachable)
+        assert prewarm.wanted_searches() == []
+
+    def test_requesters_map_to_arr_kinds(self):
+        from quasarr.search.cache import requester_kind
+        assert requester_kind(prewarm.RADARR_REQUESTER) == "radarr"
+        assert requester_kind(prewarm.SONARR_REQUESTER) == "sonarr"
+
+
+class TestPrewarmCycle:
+    def test_cycle_runs_every_wanted_search(self, wanted, searches):
+        prewarmer = prewarm.SearchPrewarmer()
+        prewarmer.shared_state = MockSharedState()
+        prewarmer.run_cycle(0)
+        assert [call[1] for call in searches] == ["tt1375666", "tt0903747"]
+        stats = prewarmer.stats()
+        assert stats["searches"] == 2
+        assert stats["pending"] == 0
+        assert stats["current"] is None
+
+    def test_cycle_waits_for_idle_and_stops(self, wanted, searches, monkeypatch):
+        prewarmer = prewarm.SearchPrewarmer()
+        prewarmer.shared_state = MockSharedState()
+        monkeypatch.setattr(prewarm, "is_idle", lambda: False)
+        monkeypatch.setattr(prewarm, "IDLE_POLL_SECONDS", 0.01)
+        prewarmer._stop.set()
+        prewarmer.run_cycle(0)
+        assert searches == []
+
+    def test_busy_scheduler_is_not_idle(self, monkeypatch):
+        monkeypatch.setattr(prewarm.search_scheduler, "stats",
+                            lambda: {"busy": 1, "queue_depth": 0})
+        assert prewarm.is_idle() is False
+
+
+class TestSiteInterval:
+    def test_defaults_to_slowest_configured_site(self):
+        shared_state = MockSharedState()
+        assert prewarm.site_interval_seconds(shared_state) == prewarm.SITE_INTERVAL_SECONDS["zt"]
+
+    def test_configured_value_wins(self):
+        shared_state = MockSharedState()
+        shared_state._config.save("prewarm_site_interval_seconds", "5")
+        assert prewarm.site_interval_seconds(shared_state) == 5
+
+    def test_negative_value_disables(self):
+        shared_state = MockSharedState()
+        shared_state._config.save("prewarm_site_interval_seconds", "-1")
+        assert prewarm.site_interval_seconds(shared_state) is None
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Classement des requêtes indexeur : flux, recherche automatique (rafale
+Radarr/Sonarr) ou recherche interactive."""
+
+import pytest
+
+from quasarr.search import priority
+from quasarr.search.scheduler import PRIORITY_AUTOMATIC, PRIORITY_FEED, PRIORITY_INTERACTIVE
+
+SONARR = "Sonarr/4.0.15.2941 (ubuntu 22.04)"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_history():
+    priority.reset()
+    yield
+    priority.reset()
+
+
+class TestClassify:
+    def test_feed_request(self):
+        assert priority.classify(SONARR) == PRIORITY_FEED
+
+    def test_single_arr_search_is_interactive(self):
+        assert priority.classify(SONARR, imdb_id="tt0903747") == PRIORITY_INTERACTIVE
+
+    def test_burst_of_arr_searches_is_automatic(self):
+        results = [priority.classify(SONARR, imdb_id="tt0903747") for _ in range(6)]
+        assert results[:priority.BURST_THRESHOLD] == [PRIORITY_INTERACTIVE] * priority.BURST_THRESHOLD
+        assert set(results[priority.BURST_THRESHOLD:]) == {PRIORITY_AUTOMATIC}
+
+    def test_burst_expires(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(priority.time, "time", lambda: now[0])
+        for _ in range(5):
+            priority.classify(SONARR, imdb_id="tt0903747")
+        now[0] += priority.BURST_WINDOW_SECONDS + 1
+        assert priority.classify(SONARR, imdb_id="tt0903747") == PRIORITY_INTERACTIVE
+
+    def test_bursts_are_tracked_per_client(self):
+        for _ in range(5):
+            priority.classify(SONARR, imdb_id="tt0903747")
+        assert priority.classify("Radarr/5.2", imdb_id="tt1375666") == PRIORITY_INTERACTIVE
+
+    def test_other_clients_are_interactive(self):
+        for _ in range(5):
+            assert priority.classify("LazyLibrarian", search_phrase="Dune") == PRIORITY_INTERACTIVE
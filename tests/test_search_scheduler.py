@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""Ordonnanceur global des tâches de recherche.
+
+Workers en nombre fixe, quota par source, tourniquet entre recherches, et
+surtout : des tâches imbriquées (zt → flux → pages de détail) ne doivent
+jamais bloquer le pool, même avec un seul worker.
+"""
+
+import threading
+import time
+
+from quasarr.search.scheduler import (
+    PRIORITY_AUTOMATIC,
+    PRIORITY_BACKGROUND,
+    PRIORITY_FEED,
+    PRIORITY_INTERACTIVE,
+    SearchScheduler,
+)
+
+
+class TestNestedWork:
+    def test_nested_maps_complete_with_a_single_worker(self):
+        scheduler = SearchScheduler(workers=1, quotas={"zt": 1})
+
+        def stream(n):
+            return sum(scheduler.map("zt", lambda x: x * 10, range(n)))
+
+        future = scheduler.submit("zt", lambda: scheduler.map("zt", stream, [1, 2, 3]))
+
+        assert future.result(timeout=5) == [0, 10, 30]
+
+    def test_join_runs_a_queued_subtask_inline(self):
+        scheduler = SearchScheduler(workers=1, quotas={"zt": 1})
+
+        def parent():
+            child = scheduler.submit("zt", lambda: "page 2")
+            return scheduler.join(child)
+
+        assert scheduler.submit("zt", parent).result(timeout=5) == "page 2"
+        assert scheduler.stats()["inline"] == 1
+
+    def test_map_keeps_order_and_raises_first_error(self):
+        scheduler = SearchScheduler(workers=4)
+
+        def work(n):
+            time.sleep(0.01 * (5 - n))
+            if n == 3:
+                raise ValueError(n)
+            return n
+
+        assert scheduler.map("zt", work, [0, 1, 2]) == [0, 1, 2]
+        try:
+            scheduler.map("zt", work, [0, 3, 4])
+        except ValueError as e:
+            assert e.args == (3,)
+        else:
+            raise AssertionError("ValueError attendue")
+
+
+class TestQuotasAndFairness:
+    def test_source_quota_limits_concurrency(self):
+        scheduler = SearchScheduler(workers=8, quotas={"am": 2})
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def work():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        futures = [scheduler.submit("am", work) for _ in range(6)]
+        for future in futures:
+            future.result(timeout=5)
+
+        assert peak[0] == 2
+
+    def test_groups_are_served_round_robin(self):
+        scheduler = SearchScheduler(workers=1)
+        gate = threading.Event()
+        order = []
+
+        blocker = scheduler.submit("x", gate.wait, 5)
+        while scheduler.stats()["busy"] < 1:
+            time.sleep(0.01)
+        first, second = scheduler.new_group(), scheduler.new_group()
+        futures = [scheduler.submit("x", order.append, f"a{i}", group=first) for i in range(3)]
+        futures += [scheduler.submit("x", order.append, f"b{i}", group=second) for i in range(3)]
+        gate.set()
+        blocker.result(timeout=5)
+        for future in futures:
+            future.result(timeout=5)
+
+        assert order == ["a0", "b0", "a1", "b1", "a2", "b2"]
+
+    def test_cancel_group_drops_queued_tasks(self):
+        scheduler = SearchScheduler(workers=1)
+        gate = threading.Event()
+        scheduler.submit("x", gate.wait, 5)
+        while scheduler.stats()["busy"] < 1:
+            time.sleep(0.01)
+        group = scheduler.new_group()
+        queued = scheduler.submit("x", lambda: "jamais", group=group)
+
+        assert scheduler.stats()["queue_depth"] == 1
+        assert scheduler.cancel_group(group) == 1
+        assert queued.cancelled()
+        gate.set()
+
+
+class TestPriorities:
+    def _blocked(self, scheduler):
+        gate = threading.Event()
+        blocker = scheduler.submit("x", gate.wait, 5, priority=PRIORITY_INTERACTIVE)
+        while scheduler.stats()["busy"] < 1:
+            time.sleep(0.01)
+        return gate, blocker
+
+    def test_interactive_search_jumps_the_queue(self):
+        scheduler = SearchScheduler(workers=1)
+        gate, blocker = self._blocked(scheduler)
+        order = []
+        futures = [scheduler.submit("x", order.append, "feed", priority=PRIORITY_FEED),
+                   scheduler.submit("x", order.append, "auto", priority=PRIORITY_AUTOMATIC),
+                   scheduler.submit("x", order.append, "human", priority=PRIORITY_INTERACTIVE)]
+        gate.set()
+        blocker.result(timeout=5)
+        for future in futures:
+            future.result(timeout=5)
+
+        assert order == ["human", "auto", "feed"]
+
+    def test_subtasks_inherit_priority(self):
+        scheduler = SearchScheduler(workers=2)
+        future = scheduler.submit(
+            "zt", lambda: scheduler.map("zt", lambda _: scheduler.current_priority(), [1, 2]),
+            priority=PRIORITY_INTERACTIVE,
+        )
+        assert future.result(timeout=5) == [PRIORITY_INTERACTIVE, PRIORITY_INTERACTIVE]
+
+    def test_raised_group_overtakes_and_passes_its_priority_on(self):
+        scheduler = SearchScheduler(workers=1)
+        gate, blocker = self._blocked(scheduler)
+        order = []
+        prewarm = scheduler.new_group()
+        futures = [scheduler.submit("x", order.append, "feed", priority=PRIORITY_FEED),
+                   scheduler.submit("x", order.append, "prewarm", group=prewarm,
+                                    priority=PRIORITY_BACKGROUND)]
+
+        assert scheduler.raise_priority(prewarm, PRIORITY_INTERACTIVE) == 1
+        assert scheduler.raise_priority(prewarm, PRIORITY_AUTOMATIC) == 0  # jamais redescendu
+        later = scheduler.submit("x", scheduler.current_priority, group=prewarm,
+                                 priority=PRIORITY_BACKGROUND)
+        gate.set()
+        blocker.result(timeout=5)
+        for future in futures:
+            future.result(timeout=5)
+
+        assert order == ["prewarm", "feed"]
+        assert later.result(timeout=5) == PRIORITY_INTERACTIVE
+
+    def test_background_work_leaves_reserved_workers_free(self):
+        scheduler = SearchScheduler(workers=3, reserved_workers=1)
+        gate = threading.Event()
+        background = [scheduler.submit("x", gate.wait, 5, priority=PRIORITY_BACKGROUND)
+                      for _ in range(3)]
+        deadline = time.time() + 2
+        while scheduler.stats()["busy"] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        stats = scheduler.stats()
+        assert stats["busy"] == 2
+        assert stats["queued_by_priority"] == {"background": 1}
+
+        human = scheduler.submit("x", lambda: "ok", priority=PRIORITY_INTERACTIVE)
+        assert human.result(timeout=2) == "ok"
+        gate.set()
+        for future in background:
+            future.result(timeout=5)
+
+
+class TestStats:
+    def test_reports_depth_and_utilization(self):
+        scheduler = SearchScheduler(workers=2)
+        gate = threading.Event()
+        futures = [scheduler.submit("x", gate.wait, 5) for _ in range(3)]
+
+        deadline = time.time() + 2
+        while scheduler.stats()["busy"] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        stats = scheduler.stats()
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+
+        assert stats["utilization"] == 100
+        assert stats["queue_depth"] == 1
+        assert stats["queued_by_source"] == {"x": 1}
+        assert scheduler.stats()["completed"] == 3
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""Fusion des recherches identiques concurrentes.
+
+Sonarr envoie plusieurs ``tvsearch`` identiques à quelques millisecondes
+d'écart : un seul calcul doit partir, les autres reçoivent son résultat.
+"""
+
+import threading
+import time
+
+import quasarr.search as search
+from quasarr.search.scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, search_scheduler
+from quasarr.search.singleflight import SingleFlight
+
+
+def _burst(count, target):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(index):
+        barrier.wait()
+        results[index] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+class TestIdenticalSearchesAreCoalesced:
+    def test_burst_runs_the_source_once(self, monkeypatch, only_zt):
+        calls = []
+
+        def slow_zt(*args, **kwargs):
+            calls.append(1)
+            time.sleep(0.2)
+            return [{"details": {"hostname": "zt", "title": "Show.S01E01"}}]
+
+        monkeypatch.setattr(search, "zt_search", slow_zt)
+
+        results = _burst(5, lambda: search.get_search_results(
+            only_zt, "Sonarr/4.0", imdb_id="tt0409591", season="1", episode="1"))
+
+        assert len(calls) == 1
+        assert all(r == [{"details": {"hostname": "zt", "title": "Show.S01E01"}}] for r in results)
+
+    def test_different_episodes_are_not_merged(self, monkeypatch, only_zt):
+        calls = []
+
+        def slow_zt(*args, **kwargs):
+            calls.append(kwargs["episode"])
+            time.sleep(0.1)
+            return []
+
+        monkeypatch.setattr(search, "zt_search", slow_zt)
+
+        episodes = iter(["1", "2"])
+        lock = threading.Lock()
+
+        def next_search():
+            with lock:
+                episode = next(episodes)
+            return search.get_search_results(
+                only_zt, "Sonarr/4.0", imdb_id="tt0409591", season="1", episode=episode)
+
+        _burst(2, next_search)
+
+        assert sorted(calls) == ["1", "2"]
+
+    def test_interactive_caller_raises_an_in_flight_prewarm(self, monkeypatch, only_zt):
+        started = threading.Event()
+        joined = threading.Event()
+        real_raise = search_scheduler.raise_priority
+
+        def raise_priority(group, priority):
+            real_raise(group, priority)
+            joined.set()
+
+        monkeypatch.setattr(search_scheduler, "raise_priority", raise_priority)
+
+        def prewarmed_zt(*args, **kwargs):
+            started.set()
+            joined.wait(5)
+            # une page de détail soumise après la greffe
+            detail = search_scheduler.submit("zt", search_scheduler.current_priority)
+            return [{"details": {"hostname": "zt", "title": "priorité %d" % search_scheduler.join(detail)}}]
+
+        monkeypatch.setattr(search, "zt_search", prewarmed_zt)
+
+        def prewarm():
+            return search.get_search_results(only_zt, "Sonarr/4.0", imdb_id="tt0409591", season="1",
+                                             episode="1", priority=PRIORITY_BACKGROUND)
+
+        leader = threading.Thread(target=prewarm)
+        leader.start()
+        assert started.wait(5)
+        results = search.get_search_results(only_zt, "Sonarr/4.0", imdb_id="tt0409591", season="1",
+                                            episode="1", priority=PRIORITY_INTERACTIVE)
+        leader.join(5)
+
+        assert results == [{"details": {"hostname": "zt", "title": "priorité %d" % PRIORITY_INTERACTIVE}}]
+
+
+class TestSingleFlight:
+    def test_error_is_shared_and_key_released(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def failing():
+            started.set()
+            release.wait(2)
+            raise RuntimeError("boom")
+
+        errors = []
+
+        def leader():
+            try:
+                flight.do("k", failing)
+            except RuntimeError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=leader)
+        thread.start()
+        started.wait(2)
+
+        def follower():
+            try:
+                flight.do("k", lambda: ["jamais appelé"])
+            except RuntimeError as e:
+                errors.append(e)
+
+        other = threading.Thread(target=follower)
+        other.start()
+        while flight.stats()["coalesced"] == 0:
+            time.sleep(0.01)
+        release.set()
+        thread.join(2)
+        other.join(2)
+
+        assert len(errors) == 2
+        assert flight.in_flight() == 0
+        assert flight.do("k", lambda: [1]) == [1]
+
+    def test_joining_caller_receives_the_leader_context(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        contexts = []
+
+        def slow():
+            started.set()
+            release.wait(2)
+            return [1]
+
+        thread = threading.Thread(target=flight.do, args=("k", slow), kwargs={"context": "groupe 7"})
+        thread.start()
+        started.wait(2)
+        follower = threading.Thread(target=flight.do, args=("k", lambda: ["jamais appelé"]),
+                                    kwargs={"context": "groupe 8", "on_join": contexts.append})
+        follower.start()
+        while flight.stats()["coalesced"] == 0:
+            time.sleep(0.01)
+        release.set()
+        thread.join(2)
+        follower.join(2)
+
+        assert contexts == ["groupe 7"]
+
+    def test_callers_get_their_own_list(self):
+        flight = SingleFlight()
+        first = flight.do("k", lambda: [1])
+        first.append(2)
+        assert flight.do("k", lambda: [1]) == [1]
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""Mémo de saison : les recherches épisode par épisode de Sonarr ne
+re-téléchargent ni les pages listing / détail de zt, ni les dossiers et le slug
+d'anime-sama."""
+
+from unittest.mock import MagicMock, patch
+
+import requests
+from bs4 import BeautifulSoup
+
+from quasarr.search.sources import am, zt
+from tests.conftest import MockSharedState, load_fixture
+
+BASE_URL = "https://www.zone-telechargement.test/"
+HEADERS = {"User-Agent": "Mozilla/5.0 (test)"}
+ZT_HOST = "www.zone-telechargement.test"
+DETAIL_PAGES = {
+    "id=78001": "detail_series_breakingbad_s1",
+    "id=78002": "detail_series_breakingbad_s2",
+}
+
+
+def _response(html, url):
+    resp = MagicMock()
+    resp.text = html
+    resp.url = url
+    resp.raise_for_status = MagicMock()
+    return resp
+
+
+class _Router:
+    def __init__(self):
+        self.urls = []
+
+    def __call__(self, url, **kwargs):
+        self.urls.append(url)
+        for key, fixture in DETAIL_PAGES.items():
+            if key in url:
+                return _response(load_fixture(fixture), url)
+        return _response("<html></html>", url)
+
+
+def _parse(episode, metadata_cache, router):
+    soup = BeautifulSoup(load_fixture("search_series_breakingbad"), "html.parser")
+    with patch("quasarr.search.sources.zt.http_client.get", side_effect=router):
+        return zt._parse_results(
+            MockSharedState(zt_hostname=ZT_HOST), soup, BASE_URL,
+            request_from="Sonarr", mirror=None, headers=HEADERS, current_host=ZT_HOST,
+            search_string="Breaking Bad", season="1", episode=episode,
+            metadata_cache=metadata_cache,
+        )
+
+
+class TestZtSeasonCrawl:
+    def test_memo_is_shared_per_imdb_and_season(self):
+        first = zt._season_crawl("tt0903747", 1)
+        assert zt._season_crawl("tt0903747", "1") is first
+        assert zt._season_crawl("tt0903747", 2) is not first
+        assert zt._season_crawl("tt0903747", None) is None
+        assert zt._season_crawl(None, 1) is None
+
+    def test_memo_expires(self, monkeypatch):
+        first = zt._season_crawl("tt0903747", 1)
+        later = first.created + zt.SEASON_CRAWL_TTL_SECONDS + 1
+        monkeypatch.setattr(zt.time, "time", lambda: later)
+        assert zt._season_crawl("tt0903747", 1) is not first
+
+    def test_memo_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(zt, "SEASON_CRAWL_MAX_ENTRIES", 2)
+        oldest = zt._season_crawl("tt1", 1)
+        zt._season_crawl("tt2", 1)
+        zt._season_crawl("tt3", 1)
+        assert zt._season_crawl("tt1", 1) is not oldest
+
+    def test_listing_page_fetched_once(self, monkeypatch):
+        calls = []
+
+        def fake_get(url, headers=None, timeout=10, cancel=None, stop=None):
+            calls.append(url)
+            return _response(load_fixture("search_series_breakingbad"), url + "&final")
+
+        monkeypatch.setattr(zt, "_zt_get", fake_get)
+        crawl = zt._season_crawl("tt0903747", 1)
+        first = zt._crawl_page(crawl, "https://zt.test/?page=1", HEADERS)
+        second = zt._crawl_page(crawl, "https://zt.test/?page=1", HEADERS)
+        assert first == second
+        assert first[0] == "https://zt.test/?page=1&final"
+        assert [card.title for card in first[1]] == ["Breaking Bad - Saison 1", "Breaking Bad - Saison 2"]
+        assert calls == ["https://zt.test/?page=1"]
+
+    def test_memo_keeps_cards_not_markup(self, monkeypatch):
+        markup = load_fixture("listing_series_star_full")
+        monkeypatch.setattr(zt, "_zt_get", lambda url, **kwargs: _response(markup, url))
+        crawl = zt._season_crawl("tt0092455", 1)
+        zt._crawl_page(crawl, "https://zt.test/?p=series&search=star&page=1", HEADERS)
+
+        _final_url, cards, more = crawl.pages["https://zt.test/?p=series&search=star&page=1"]
+        assert len(cards) == 25
+        assert more
+        assert all(isinstance(card, zt._ListingCard) for card in cards)
+        assert sum(len("".join(card)) for card in cards) < len(markup) // 10
+
+    def test_next_episode_reuses_detail_pages(self):
+        crawl = zt._season_crawl("tt0903747", 1)
+        first_router = _Router()
+        episode_3 = _parse("3", crawl.metadata, first_router)
+        assert first_router.urls
+
+        second_router = _Router()
+        episode_4 = _parse("4", crawl.metadata, second_router)
+        assert second_router.urls == []
+        # Même résultat qu'une recherche à froid.
+        assert episode_4 == _parse("4", {}, _Router())
+        assert episode_3 != episode_4
+
+    def test_failed_detail_page_is_not_replayed(self):
+        crawl = zt._season_crawl("tt0903747", 1)
+        errors = []
+
+        def down(url, **kwargs):
+            raise requests.ConnectionError("zt.test unreachable")
+
+        soup = BeautifulSoup(load_fixture("search_series_breakingbad"), "html.parser")
+        with patch("quasarr.search.sources.zt.http_client.get", side_effect=down):
+            assert zt._parse_results(
+                MockSharedState(zt_hostname=ZT_HOST), soup, BASE_URL,
+                request_from="Sonarr", mirror=None, headers=HEADERS, current_host=ZT_HOST,
+                search_string="Breaking Bad", season="1", episode="3",
+                metadata_cache=crawl.metadata, errors=errors,
+            ) == []
+        assert errors
+        assert crawl.metadata == {}
+
+        router = _Router()
+        episode_4 = _parse("4", crawl.metadata, router)
+        assert router.urls  # pages de détail redemandées
+        assert episode_4
+        assert episode_4 == _parse("4", {}, _Router())
+
+
+class TestAnimeSamaSeasonCache:
+    def test_slug_resolved_once_per_series(self, monkeypatch):
+        calls = []
+
+        def fake_resolve(_state, host, names, _headers):
+            calls.append(names)
+            return "fire-force", [("Saison 1", "saison1/vostfr")], host
+
+        monkeypatch.setattr(am, "_resolve_slug", fake_resolve)
+        first = am._resolve_slug_cached(object(), "anime-sama.to", "tt9308694", ["Fire Force"], {})
+        second = am._resolve_slug_cached(object(), "anime-sama.to", "tt9308694", ["Fire Force"], {})
+        assert first == second
+        assert len(calls) == 1
+
+    def test_unresolved_slug_is_not_cached(self, monkeypatch):
+        calls = []
+
+        def fake_resolve(_state, host, names, _headers):
+            calls.append(names)
+            return None, None, host
+
+        monkeypatch.setattr(am, "_resolve_slug", fake_resolve)
+        am._resolve_slug_cached(object(), "anime-sama.to", "tt0000001", ["X"], {})
+        am._resolve_slug_cached(object(), "anime-sama.to", "tt0000001", ["X"], {})
+        assert len(calls) == 2
+
+    def test_episode_folder_fetched_once(self, monkeypatch):
+        calls = []
+        folder = ({"eps1": ["https://v/1", "https://v/2"]}, {1: 0, 2: 1}, "anime-sama.to")
+
+        def fake_fetch(_state, _host, slug, path, _headers):
+            calls.append((slug, path))
+            return folder
+
+        monkeypatch.setattr(am, "_fetch_episodes", fake_fetch)
+        for _ in range(3):
+            assert am._fetch_episodes_cached(object(), "anime-sama.to", "fire-force",
+                                             "saison1/vostfr", {}) == folder
+        assert calls == [("fire-force", "saison1/vostfr")]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Flux sf : les pages de mises à jour passent par le client HTTP partagé."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from quasarr.search.sources import sf
+
+UPDATES_PAGE = """
+<html><body>
+<div class="row" style="order: 1">
+  <a href="/serie/dune-prophecy">Dune.Prophecy.S01E03.German.1080p.WEB.h264-GRP</a>
+  <div class="datime">21:15</div>
+</div>
+</body></html>
+"""
+
+
+class TestSfFeed:
+    def test_feed_pages_are_fetched_with_headers(self, shared_state):
+        shared_state.values["config"]("Hostnames").save("sf", "sf.test")
+        response = MagicMock()
+        response.text = UPDATES_PAGE
+
+        with patch("quasarr.search.sources.sf.http_client.get", return_value=response) as get:
+            releases = sf.sf_feed(shared_state, time.time(), "Sonarr/4.0")
+
+        assert get.call_count == 2  # aujourd'hui et hier
+        url = get.call_args_list[0].args[0]
+        assert url.startswith("https://sf.test/updates/")
+        assert get.call_args_list[0].kwargs["headers"] == {"User-Agent": "Mozilla/5.0 (test)"}
+        assert len(releases) == 2
+        assert releases[0]["details"]["title"] == "Dune.Prophecy.S01E03.German.1080p.WEB.h264-GRP"
+        assert releases[0]["details"]["source"] == "https://sf.test/serie/dune-prophecy"
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Latences par source et disjoncteur.
+
+Un site instable ne doit plus tirer chaque recherche jusqu'au plafond du
+budget : après quelques échecs il est sauté pendant une pause.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+import quasarr.search as search
+from quasarr.search.health import SourceHealth, source_health
+
+
+@pytest.fixture
+def only_sf_and_zt(only_sources):
+    return only_sources("sf", "zt")
+
+
+class TestCircuitBreaker:
+    def test_failing_source_is_skipped_after_threshold(self, monkeypatch, only_sf_and_zt):
+        calls = []
+
+        def broken_sf(*args, **kwargs):
+            calls.append(1)
+            raise RuntimeError("site en panne")
+
+        monkeypatch.setattr(search, "sf_search", broken_sf)
+        monkeypatch.setattr(search, "zt_search", lambda *a, **kw: [])
+
+        for episode in range(1, 6):
+            search.get_search_results(only_sf_and_zt, "Sonarr/4", imdb_id="tt0409591",
+                                      season="1", episode=str(episode))
+
+        assert len(calls) == 3
+        assert source_health.stats()["sf"]["circuit_open"] is True
+        assert source_health.stats()["sf"]["short_circuited"] == 2
+
+    def test_source_that_catches_its_own_errors_trips_the_breaker(self, monkeypatch, only_sf_and_zt):
+        # sf attrape l'erreur réseau et rend une liste vide : ce n'est pas un succès.
+        monkeypatch.setattr(search, "zt_search", lambda *a, **kw: [])
+        outage = requests.ConnectionError("sf.test unreachable")
+
+        with patch("quasarr.search.sources.sf.http_client.get", side_effect=outage) as get:
+            for episode in range(1, 6):
+                search.get_search_results(only_sf_and_zt, "Sonarr/4", imdb_id="tt0409591",
+                                          season="1", episode=str(episode))
+
+        assert get.call_count == 3
+        assert source_health.stats()["sf"]["circuit_open"] is True
+        assert source_health.stats()["zt"]["consecutive_failures"] == 0
+
+    def test_probe_after_cool_down_closes_the_circuit(self):
+        health = SourceHealth(failure_threshold=2, cool_down_seconds=0.05)
+        health.record("sf", 1, False)
+        health.record("sf", 1, False)
+        assert not health.allow("sf")
+
+        time.sleep(0.06)
+        assert health.allow("sf")       # appel d'essai
+        assert not health.allow("sf")   # un seul à la fois
+        health.record("sf", 0.5, True)
+        assert health.allow("sf")
+
+    def test_failed_probe_doubles_the_pause(self):
+        health = SourceHealth(failure_threshold=1, cool_down_seconds=0.05)
+        health.record("sf", 1, False)
+        time.sleep(0.06)
+        assert health.allow("sf")
+        health.record("sf", 1, False)
+
+        time.sleep(0.06)
+        assert not health.allow("sf")
+        time.sleep(0.05)
+        assert health.allow("sf")
+
+
+class TestLatencyOrdering:
+    def test_slowest_sources_start_first_and_unknown_ones_before_all(self):
+        health = SourceHealth()
+        for seconds in (1, 1, 2):
+            health.record("sf", seconds, True)
+        for seconds in (10, 20, 30):
+            health.record("zt", seconds, True)
+
+        assert health.by_slowest_first(["sf", "zt", "am"]) == ["am", "zt", "sf"]
+
+    def test_percentiles_and_error_rate(self):
+        health = SourceHealth()
+        for seconds in range(1, 11):
+            health.record("zt", seconds, seconds != 10)
+
+        stats = health.stats()["zt"]
+        assert stats["p50_seconds"] == 5
+        assert stats["p95_seconds"] == 10
+        assert stats["error_rate"] == 10
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Banc d'essai de la comparaison de titres (``tests/bench_title_matching.py``).
+
+Le contrôle des seuils dépend de la machine : il ne tourne qu'avec
+``QUASARR_BENCH=1``. Le reste vérifie que le banc lui-même fonctionne.
+"""
+
+import os
+
+import pytest
+
+from tests import bench_title_matching as bench
+
+
+class TestBench:
+    def test_corpus_is_deterministic_and_uses_fixtures(self):
+        corpus = bench.build_corpus(size=50)
+        assert corpus == bench.build_corpus(size=50)
+        assert any("Inception" in title for title in corpus["titles"])
+        assert len(corpus["pairs"]) == len(corpus["titles"])
+
+    def test_every_function_is_measured(self):
+        results = bench.run(bench.build_corpus(size=50), repeat=1)
+        assert set(results) == set(bench.load_baseline())
+        assert all(ops > 0 for ops in results.values())
+
+    def test_regression_beyond_tolerance_is_reported(self):
+        baseline = {"sanitize_string": 1000, "match_in_title": 1000}
+        results = {"sanitize_string": 650, "match_in_title": 750}
+        assert bench.regressions(results, baseline, tolerance=0.3) == {"sanitize_string": (650, 1000)}
+
+
+@pytest.mark.skipif(not os.environ.get("QUASARR_BENCH"), reason="seuils dépendants de la machine : QUASARR_BENCH=1")
+def test_no_regression_against_baseline():
+    baseline = bench.load_baseline()
+    assert baseline, "bench_title_matching.json missing: run with --update-baseline"
+    assert bench.regressions(bench.run(), baseline) == {}
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Normalisation des titres : mêmes résultats que l'ancienne implémentation,
+une seule normalisation par chaîne quel que soit le nombre de comparaisons."""
+
+import pytest
+
+from quasarr.providers import title_normalization
+from quasarr.providers.shared_state import search_string_in_sanitized_title as matches
+from quasarr.providers.shared_state import title_index
+
+
+@pytest.fixture(autouse=True)
+def _cold_caches():
+    title_normalization.clear_caches()
+    yield
+    title_normalization.clear_caches()
+
+
+class TestSanitize:
+    @pytest.mark.parametrize("title, expected", [
+        ("L'Élève Ducobu", "leleve ducobu"),
+        ("Le Cœur des hommes", "le coeur des hommes"),
+        ("Straße.der.Sehnsucht", "strasse sehnsucht"),
+        ("Rocky II", "rocky 2"),
+        ("Gardiens de la Galaxie Vol. 3", "gardiens de la galaxie 3"),
+        ("Navy CIS S01E02", "ncis"),
+        # Deux articles retirés au plus (comportement historique).
+        ("The Lord of the Rings and a Ring", "lord of rings and a ring"),
+        ("呪われた聖剣", ""),
+    ])
+    def test_examples(self, title, expected):
+        assert title_normalization.sanitize(title) == expected
+
+    def test_tokens_are_an_immutable_split(self):
+        assert title_normalization.tokens("Rocky II") == ("rocky", "2")
+
+
+class TestCaching:
+    def test_query_is_normalized_once_for_every_card(self):
+        cards = [f"Gardiens de la Galaxie Vol. 3 - Film {i}" for i in range(50)]
+        for card in cards:
+            matches("Les Gardiens de la Galaxie Vol. 3", card)
+        for card in cards:
+            matches("Les Gardiens de la Galaxie Vol. 3", card)
+
+        stats = title_normalization.stats()
+        # Une normalisation par chaîne distincte : la requête, les 50 cartes et
+        # leur graphie commune sans numéro d'ordre ("... Vol. 3").
+        assert stats["sanitize"]["misses"] == 1 + 50 + 1
+        assert stats["phrase_pattern"]["misses"] == 1
+
+
+class TestTitleIndex:
+    QUERIES = [
+        "Barbie : Rock et Royales",
+        "Barbie dans cœur de princesse",
+        "Naruto Shippuden : Un funeste présage",
+        "La Légende de la pierre de Guelel",
+        "One Piece",
+        "Rocky II",
+        "Gardiens de la Galaxie Vol. 3",
+    ]
+    TITLES = [
+        "Barbie",
+        "Barbie cœur de princesse",
+        "Barbie au bal des princesses",
+        "Naruto Shippuden - Film 1 : Un Funeste Présage",
+        "Naruto - Film 2 : La Légende de la Pierre de Guelel",
+        "One Piece - Film 10 : Strong World",
+        "One Piece SP 11 : Heart of Gold",
+        "Rocky 2",
+        "Rocky Balboa",
+        "Les Gardiens de la Galaxie 3",
+        "呪われた聖剣",
+    ]
+
+    def test_candidates_include_every_match(self):
+        index = title_index((title, title) for title in self.TITLES)
+        for query in self.QUERIES:
+            candidates = index.candidates(query)
+            for title in self.TITLES:
+                if matches(query, title):
+                    assert title in candidates, (query, title)
+
+    def test_unrelated_titles_are_not_candidates(self):
+        index = title_index((title, title) for title in self.TITLES)
+        assert index.candidates("Rocky II") == {"Rocky 2"}
+        assert index.candidates("呪われた聖剣") == set()
@@ -6,7 +6,10 @@ so that any change in parsing behaviour is caught immediately.
 To add a new regression case, simply append to the relevant @parametrize list.
 """
 
+import io
+
 import pytest
+import requests
 from bs4 import BeautifulSoup
 
 from quasarr.search.sources.zt import (
@@ -34,8 +37,13 @@ from quasarr.search.sources.zt import (
     _extract_year_from_tokens,
     _fetch_detail_metadata,
     _contains_year_token,
+    _DetailIndex,
+    _parse_detail_page,
+    _listing_complete,
+    _parse_listing,
 )
 
+from quasarr.providers.http_client import HttpClient
 from tests.conftest import load_fixture, MockSharedState
 
 
@@ -729,3 +737,116 @@ class TestFetchDetailMetadataArity:
         # L'identité doit exister même sur le chemin d'erreur : la corroboration
         # d'année la lit sans vérifier au préalable.
         assert identity == {"director": "", "runtime": None}
+
+
+# ---------------------------------------------------------------------------
+# _DetailIndex / _parse_detail_page
+# ---------------------------------------------------------------------------
+NOISY_PAGE = """
+<html><head><script>var label = "Langue : script";</script></head><body>
+<ul><li><a href="/c/1">Qualités disponibles</a></li></ul>
+<div class="w"><div class="w">{core}</div></div>
+<!-- Qualité : commentaire -->
+<div class="comments"><p>Qualité : top | merci</p><strong>Titre original</strong></div>
+</body></html>
+"""
+
+
+class TestDetailIndex:
+    """Une seule passe sur l'arbre, mêmes résultats que les recherches d'origine."""
+
+    @pytest.mark.parametrize("fixture", [
+        "detail_film_inception",
+        "detail_film_mixed_hosts",
+        "detail_film_size_variants",
+        "detail_series_breakingbad_s1",
+        "detail_series_onepiece_s1",
+    ])
+    @pytest.mark.parametrize("noisy", [False, True])
+    def test_index_matches_full_tree_searches(self, fixture, noisy):
+        html = load_fixture(fixture)
+        if noisy:
+            html = NOISY_PAGE.format(core=html)
+        soup = BeautifulSoup(html, "html.parser")
+        index = _DetailIndex(soup)
+
+        assert index.text == soup.get_text(" ", strip=True)
+        assert index.postinfo_blocks == soup.select("div.postinfo")
+        assert index.red_fonts == soup.find_all("font", {"color": "red"})
+        assert _extract_detail_title(soup, index) == _extract_detail_title(soup)
+        assert _extract_original_title(soup, index) == _extract_original_title(soup)
+        assert (_extract_quality_language_tokens(soup, index)
+                == _extract_quality_language_tokens(soup))
+        assert (_collect_download_entries(soup, "https://zt.test/", index)
+                == _collect_download_entries(soup, "https://zt.test/"))
+
+    def test_quality_prefers_the_outer_container_like_find_all(self):
+        soup = BeautifulSoup(
+            "<div><strong>Qualité :</strong> WEB-DL 1080p | MULTI</div>", "html.parser"
+        )
+        assert _extract_quality_language_tokens(soup) == ["WEB-DL.1080p", "MULTI"]
+
+    def test_parse_detail_page_reads_every_field(self):
+        fields = _parse_detail_page(
+            MockSharedState(), load_fixture("detail_series_breakingbad_s1"), "https://zt.test/x",
+        )
+        (year, size_mb, title, quality, episodes, entries,
+         original_title, filename_year, identity) = fields
+        assert (year, size_mb, title, original_title) == ("2008", 350, "Breaking Bad - Saison 1", "Breaking Bad")
+        assert quality == ["720p", "VF.HD"]
+        assert episodes == {1, 2, 3, 4, 5, 6, 7}
+        assert len(entries) == 14
+        assert identity == {"director": "", "runtime": None}
+
+
+
+class TestListingComplete:
+    """Fin de lecture d'une page listing : toutes les cartes reçues."""
+
+    def test_waits_for_an_end_marker_after_the_cards(self):
+        body = bytearray(b'<div class="navigation">menu</div><div class="cover_global">a</div>')
+        assert not _listing_complete(body, 0)
+        start = len(body)
+        body += b'<div class="cover_global">b</div><div class="navigation">2</div>'
+        assert _listing_complete(body, start)
+
+    def test_marker_split_across_chunks(self):
+        body = bytearray(b'<div class="cover_global">a</div><foo')
+        start = len(body)
+        body += b'ter>'
+        assert _listing_complete(body, start)
+
+    def test_page_without_cards_is_read_entirely(self):
+        assert not _listing_complete(bytearray("<p>Aucun résultat</p><footer>".encode()), 0)
+
+    def test_fixture_listing_keeps_every_card(self):
+        markup = load_fixture("search_films_inception").encode() + b"<footer>fin</footer>"
+        cut = markup.index(b"<footer") + len(b"<footer")
+        assert _listing_complete(bytearray(markup[:cut]), 0)
+        assert len(_parse_listing(markup[:cut].decode())) == 3
+
+    def test_full_listing_page_is_cut_after_its_last_card(self, monkeypatch):
+        # Page entière (en-tête, cartes, pagination, colonne latérale, scripts)
+        # lue comme en production, par morceaux via ``HttpClient.get_until``.
+        markup = load_fixture("listing_series_star_full").encode()
+        client = HttpClient()
+        session = client.session_for("https://zt.test/").session
+
+        def serve(method, url, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response.raw = io.BytesIO(markup)
+            response.headers["Content-Length"] = str(len(markup))
+            response.url = url
+            response.encoding = "utf-8"
+            return response
+
+        monkeypatch.setattr(session, "request", serve)
+        response = client.get("https://zt.test/?p=series&search=star&page=1", stop=_listing_complete)
+
+        assert response.truncated
+        assert len(response.content) < len(markup)
+        assert b"<footer" not in response.content  # scripts et pied de page jamais lus
+        full = _parse_listing(markup.decode())
+        assert len(full) == 25
+        assert _parse_listing(response.text) == full
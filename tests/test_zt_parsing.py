@@ -42,7 +42,7 @@ def _make_mock_response(html_content: str, url: str):
 
 
 def _build_detail_router(detail_pages: dict):
-    """Return a side_effect function for requests.get that serves stored fixtures.
+    """Return a side_effect function for http_client.get that serves stored fixtures.
 
     ``detail_pages`` maps a URL substring to a fixture name, e.g.:
         {"id=45231": "detail_film_inception"}
@@ -84,7 +84,7 @@ class TestParseFilmInception:
         search_html = load_fixture("search_films_inception")
         soup = BeautifulSoup(search_html, "html.parser")
 
-        with patch("quasarr.search.sources.zt.requests.get",
+        with patch("quasarr.search.sources.zt.http_client.get",
                     side_effect=_build_detail_router(self.DETAIL_PAGES)):
             return _parse_results(
                 ss, soup, BASE_URL,
@@ -187,7 +187,7 @@ class TestParseFilmIntouchables:
         search_html = load_fixture("search_films_intouchables")
         soup = BeautifulSoup(search_html, "html.parser")
 
-        with patch("quasarr.search.sources.zt.requests.get",
+        with patch("quasarr.search.sources.zt.http_client.get",
                     side_effect=_build_detail_router(self.DETAIL_PAGES)):
             return _parse_results(
                 ss, soup, BASE_URL,
@@ -238,7 +238,7 @@ class TestParseSeriesBreakingBad:
         search_html = load_fixture("search_series_breakingbad")
         soup = BeautifulSoup(search_html, "html.parser")
 
-        with patch("quasarr.search.sources.zt.requests.get",
+        with patch("quasarr.search.sources.zt.http_client.get",
                     side_effect=_build_detail_router(self.DETAIL_PAGES)):
             return _parse_results(
                 ss, soup, BASE_URL,
@@ -259,7 +259,7 @@ class TestParseSeriesBreakingBad:
         search_html = load_fixture("search_series_breakingbad")
         soup = BeautifulSoup(search_html, "html.parser")
 
-        with patch("quasarr.search.sources.zt.requests.get",
+        with patch("quasarr.search.sources.zt.http_client.get",
                     side_effect=_build_detail_router(self.DETAIL_PAGES)):
             return _parse_results(
                 ss, soup, BASE_URL,
@@ -326,7 +326,7 @@ class TestParseSeriesOnePiece:
         search_html = load_fixture("search_series_onepiece")
         soup = BeautifulSoup(search_html, "html.parser")
 
-        with patch("quasarr.search.sources.zt.requests.get",
+        with patch("quasarr.search.sources.zt.http_client.get",
                     side_effect=_build_detail_router(self.DETAIL_PAGES)):
             return _parse_results(
                 ss, soup, BASE_URL,
@@ -347,7 +347,7 @@ class TestParseSeriesOnePiece:
         search_html = load_fixture("search_series_onepiece")
         soup = BeautifulSoup(search_html, "html.parser")
 
-        with patch("quasarr.search.sources.zt.requests.get",
+        with patch("quasarr.search.sources.zt.http_client.get",
                     side_effect=_build_detail_router(self.DETAIL_PAGES)):
             return _parse_results(
                 ss, soup, BASE_URL,
@@ -401,7 +401,7 @@ class TestParseFilmNoLinks:
         """
         soup = BeautifulSoup(search_html, "html.parser")
 
-        with patch("quasarr.search.sources.zt.requests.get",
+        with patch("quasarr.search.sources.zt.http_client.get",
                     side_effect=_build_detail_router({"id=88888": "detail_film_no_links"})):
             return _parse_results(
                 ss, soup, BASE_URL,
@@ -440,7 +440,7 @@ class TestParseFilmMixedHosts:
         """
         soup = BeautifulSoup(search_html, "html.parser")
 
-        with patch("quasarr.search.sources.zt.requests.get",
+        with patch("quasarr.search.sources.zt.http_client.get",
                     side_effect=_build_detail_router({"id=77777": "detail_film_mixed_hosts"})):
             return _parse_results(
                 ss, soup, BASE_URL,
@@ -492,7 +492,7 @@ class TestMirrorFiltering:
         """
         soup = BeautifulSoup(search_html, "html.parser")
 
-        with patch("quasarr.search.sources.zt.requests.get",
+        with patch("quasarr.search.sources.zt.http_client.get",
                     side_effect=_build_detail_router(self.DETAIL_PAGES)):
             return _parse_results(
                 ss, soup, BASE_URL,
@@ -555,7 +555,7 @@ class TestMalformedCards:
         """
         soup = BeautifulSoup(search_html, "html.parser")
 
-        with patch("quasarr.search.sources.zt.requests.get",
+        with patch("quasarr.search.sources.zt.http_client.get",
                     side_effect=_build_detail_router({"id=45231": "detail_film_inception"})):
             return _parse_results(
                 ss, soup, BASE_URL,
@@ -634,7 +634,7 @@ class TestDateParsing:
         """
         soup = BeautifulSoup(search_html, "html.parser")
 
-        with patch("quasarr.search.sources.zt.requests.get",
+        with patch("quasarr.search.sources.zt.http_client.get",
                     side_effect=_build_detail_router({"id=45231": "detail_film_inception"})):
             return _parse_results(
                 ss, soup, BASE_URL,
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Enchaînement des requêtes zt : la page listing suivante et les pages de
+détail partent sans attendre la fin de l'analyse de la page courante, sans
+changer ni l'ordre ni la déduplication des résultats."""
+
+import threading
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import pytest
+
+from quasarr.search import detail_store
+from quasarr.search.sources import zt
+from tests.conftest import MockSharedState, load_fixture
+
+HOST = "zt.test"
+
+
+class SearchState(MockSharedState):
+    def __init__(self):
+        super().__init__(zt_hostname=HOST)
+
+    @staticmethod
+    def sanitize_string(text):
+        from quasarr.providers.shared_state import sanitize_string
+        return sanitize_string(text)
+
+    @staticmethod
+    def has_non_latin_letters(text):
+        from quasarr.providers.shared_state import has_non_latin_letters
+        return has_non_latin_letters(text)
+
+
+def _response(html, url):
+    response = MagicMock()
+    response.text = html
+    response.url = url
+    response.raise_for_status = MagicMock()
+    return response
+
+
+PAGINATION = '<div class="navigation"><span>1</span> <a href="/?p=films&amp;search=inception&amp;page=2">2</a></div>'
+
+
+class _Site:
+    """Page 1 : trois cartes Inception (et un lien vers la page 2) ; page 2 : vide."""
+
+    def __init__(self, hold_details_until_page_2=False, paginated=True):
+        self.urls = []
+        self.paginated = paginated
+        self.page_2_requested = threading.Event()
+        self.hold = hold_details_until_page_2
+        self.page_2_seen_during_details = False
+
+    def __call__(self, url, **kwargs):
+        self.urls.append(url)
+        if "&search=" in url:
+            if url.endswith("page=1"):
+                return _response(load_fixture("search_films_inception")
+                                 + (PAGINATION if self.paginated else ""), url)
+            self.page_2_requested.set()
+            return _response("<html></html>", url)
+        if self.hold and self.page_2_requested.wait(2):
+            self.page_2_seen_during_details = True
+        return _response(load_fixture("detail_film_inception"), url)
+
+
+@pytest.fixture
+def movie(monkeypatch):
+    monkeypatch.setattr(zt, "get_type", lambda *args: [])
+    monkeypatch.setattr(zt, "get_localized_title",
+                        lambda *args, **kwargs: ("Inception", "Inception"))
+    monkeypatch.setattr(zt, "get_french_alternative_titles", lambda *args: [])
+    monkeypatch.setattr(zt, "_get_category", lambda *args: ["films"])
+
+
+def _search(monkeypatch, site):
+    monkeypatch.setattr(zt.http_client, "get", site)
+    return zt.zt_search(SearchState(), 0, "Radarr", "tt1375666")
+
+
+def _run_now(source, func, *args, **kwargs):
+    """``submit`` exécuté sur place : l'ancien déroulé strictement séquentiel."""
+    future = Future()
+    try:
+        future.set_result(func(*args))
+    except BaseException as e:
+        future.set_exception(e)
+    return future
+
+
+class TestZtPipeline:
+    def test_next_listing_page_is_fetched_while_details_load(self, monkeypatch, movie):
+        site = _Site(hold_details_until_page_2=True)
+        _search(monkeypatch, site)
+        assert site.page_2_seen_during_details
+
+    def test_short_last_page_ends_the_stream(self, monkeypatch, movie):
+        site = _Site(paginated=False)
+        assert _search(monkeypatch, site)
+        assert not site.page_2_requested.is_set()
+        assert [url for url in site.urls if "&search=" in url] == ["https://zt.test/?p=films&search=Inception&page=1"]
+
+    def test_results_match_the_sequential_order(self, monkeypatch, movie):
+        pipelined = _search(monkeypatch, _Site())
+        titles = [release["details"]["title"] for release in pipelined]
+        links = [release["details"]["link"] for release in pipelined]
+
+        assert titles
+        assert len(links) == len(set(links))
+
+        zt.clear_season_crawls()
+        detail_store.invalidate_cache()
+        monkeypatch.setattr(zt.search_scheduler, "submit", _run_now)
+        sequential = _search(monkeypatch, _Site())
+        assert [release["details"]["title"] for release in sequential] == titles
+
+    def test_each_detail_page_is_fetched_once(self, monkeypatch, movie):
+        site = _Site()
+        _search(monkeypatch, site)
+        details = [url for url in site.urls if "&id=" in url]
+        assert len(details) == len(set(details))
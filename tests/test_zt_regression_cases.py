@@ -59,7 +59,7 @@ def _make_mock_response(html: str, url: str):
 
 
 def _build_detail_router(case_dir: Path, detail_pages: dict):
-    """Construit un side_effect pour requests.get à partir du manifest."""
+    """Construit un side_effect pour http_client.get à partir du manifest."""
     def router(url, **kwargs):
         for route_key, info in detail_pages.items():
             if route_key in url:
@@ -91,7 +91,7 @@ def _run_case(manifest: dict, case_dir: Path) -> tuple[list[dict], set[str]]:
 
     soup = BeautifulSoup(combined_html, "html.parser")
 
-    with patch("quasarr.search.sources.zt.requests.get",
+    with patch("quasarr.search.sources.zt.http_client.get",
                side_effect=_build_detail_router(case_dir, manifest["detail_pages"])):
         releases = _parse_results(
             ss, soup, base_url,